@@ -0,0 +1,113 @@
+"""
+REST calls per check session: reaction flow vs. button board.
+
+The reaction flow is modeled from the calls the old command made; the
+button flow drives ``TaskBoard`` with fake interactions and counts the
+responses it sends. Only the task board part of the session is counted,
+selecting the checklist is the same in both flows.
+
+Usage: python -m bench.check_rest_calls
+"""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from lib.cogs.check import TaskBoard
+from utils.render import RenderCache
+from utils.storage import MemoryStorage
+
+TASKS_PER_PAGE = 10
+
+# (task count, actions) where an action is a task index on the current
+# page, "next", "previous" or "submit"
+SCENARIOS = {
+    "1 page, 3 toggles": (8, [0, 3, 5, "submit"]),
+    "3 pages, 6 toggles": (25, [0, 1, 2, "next", 4, 9, "next", 1, "previous", "submit"]),
+    "5 pages, browse only": (50, ["next", "next", "next", "next", "submit"]),
+}
+
+
+class BenchStorage(MemoryStorage):
+    """
+    In-memory storage without persistence
+    """
+    def _persist(self, record: dict) -> None:
+        pass
+
+
+def reaction_calls(task_count: int, actions: list) -> int:
+    """
+    REST calls the reaction flow made for a session
+    """
+    page_count = -(-task_count // TASKS_PER_PAGE)
+    page_index = 0
+
+    def update_reactions() -> int:
+        # clear_reactions, one add_reaction per task, arrows and submit
+        on_page = min(TASKS_PER_PAGE, task_count - page_index * TASKS_PER_PAGE)
+        arrows = (page_index > 0) + (page_index < page_count - 1) if page_count > 1 else 0
+        return 1 + on_page + arrows + 1
+
+    # Send the task message and add its reactions
+    calls = 1 + update_reactions()
+    for action in actions:
+        if action == "next":
+            page_index += 1
+            calls += 1 + update_reactions()
+        elif action == "previous":
+            page_index -= 1
+            calls += 1 + update_reactions()
+        elif action == "submit":
+            # Confirmation message, deleting it and the command, deleting both board messages
+            calls += 1 + 2 + 2
+        else:
+            # Edit the embed and remove the user's reaction
+            calls += 2
+    return calls
+
+
+async def button_calls(task_count: int, actions: list) -> int:
+    """
+    REST calls the button board makes for a session
+    """
+    calls = 0
+
+    async def edit_message(**kwargs) -> None:
+        nonlocal calls
+        calls += 1
+
+    storage = BenchStorage(logging.getLogger("bench"))
+    storage.create_list("1", "bench")
+    storage.add_tasks("1", "bench", [f"task {i}" for i in range(task_count)])
+    bot = SimpleNamespace(storage=storage, renders=RenderCache())
+    storage.on_change = lambda op, list_id, index: bot.renders.changed(op, list_id, index, storage.revisions[list_id])
+    author = SimpleNamespace(id=1)
+    board = TaskBoard(bot, author, "1", "bench", storage.get_tasks("1", "bench"), TASKS_PER_PAGE)
+    interaction = SimpleNamespace(user=author, response=SimpleNamespace(edit_message=edit_message))
+
+    # Send the task message with its components
+    calls += 1
+    for action in actions:
+        if action == "next":
+            await board.next_page.callback(interaction)
+        elif action == "previous":
+            await board.previous_page.callback(interaction)
+        elif action == "submit":
+            await board.submit.callback(interaction)
+            # Deleting the command, the checklist prompt and the board
+            calls += 3
+        else:
+            await board.toggles[action].callback(interaction)
+    return calls
+
+
+async def main() -> None:
+    print(f"{'scenario':<24}{'reactions':>10}{'buttons':>10}")
+    for name, (task_count, actions) in SCENARIOS.items():
+        before = reaction_calls(task_count, actions)
+        after = await button_calls(task_count, actions)
+        print(f"{name:<24}{before:>10}{after:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,287 @@
+"""
+End-to-end command benchmark with fake Discord objects.
+
+Runs the create, add, view, check, clear and share cogs, both inline and
+interactive, against a storage backend holding a synthetic dataset. The
+benchmark user's main checklist holds all the tasks of the dataset, so
+every command works on the largest checklist. A scripted user answers the
+prompts through the router the way the gateway would.
+
+Each case records the command latency, the REST calls the fakes received
+(including the deletes the scheduler issues once the messages expire) and
+the bytes the persistence layer wrote (SQLite commits report none).
+Results are printed as JSON; with ``--baseline`` a previous result file
+is compared and the script exits with status 1 when a latency, REST call
+count or byte count grew by more than ``--tolerance``.
+
+Usage: python -m bench.e2e [--sizes 1000 10000 100000 1000000] [--storage json|sqlite|sharded]
+                           [--repeat 20] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from bench.fakes import CountingRouter, FakeContext, FakeGuild, FakeUser, Session, snowflake
+from lib.cogs.add import Add
+from lib.cogs.check import Check
+from lib.cogs.clear import Clear
+from lib.cogs.create import Create
+from lib.cogs.share import Share
+from lib.cogs.view import View
+from utils.deleter import DeletionScheduler
+from utils.metrics import Metrics
+from utils.names import PrefixIndex
+from utils.persistence import Persistence
+from utils.render import RenderCache
+from utils.search import SearchIndex
+from utils.storage import load_storage
+
+SIZES = (1_000, 10_000, 100_000)
+# Checklists of the benchmark user besides the main one, shown in the reaction menus
+OTHER_LISTS = ("scratch", "errands", "work")
+
+
+class BenchBot(SimpleNamespace):
+    """
+    The bot attributes the cogs use, wired like ``lib.bot.Bot``
+    """
+    def __init__(self, directory: str, backend: str, guild: FakeGuild) -> None:
+        logger = logging.getLogger("bench")
+        storage = load_storage(backend, os.path.join(directory, "checklists.json"), logger)
+        super().__init__(
+            logger=logger, storage=storage, router=CountingRouter(),
+            renders=RenderCache(), names=PrefixIndex(storage), guild=guild
+        )
+        self.metrics = Metrics(self)
+        self.search = SearchIndex(storage)
+        # Writes only happen when a case flushes them
+        self.persistence = Persistence(storage.prepare_write, logger, window=3600, write_failed=storage.write_failed)
+        self.deleter = DeletionScheduler(self, os.path.join(directory, "deletions.json"), logger)
+        storage.on_commit = self.persistence.mark_dirty
+        storage.on_change = self.tasks_changed
+        storage.on_list_added = self.list_added
+
+    def tasks_changed(self, op: str, list_id: str, index: int = None) -> None:
+        self.renders.changed(op, list_id, index, self.storage.revisions[list_id])
+        self.search.changed(op, list_id, index)
+
+    def list_added(self, user_id: str, list_name: str) -> None:
+        self.names.added(user_id, list_name)
+        self.search.added(user_id, list_name)
+
+    def get_channel(self, channel_id: int):
+        return self.guild.get_channel(channel_id)
+
+    def get_partial_messageable(self, channel_id: int):
+        return self.guild.get_channel(channel_id)
+
+
+class Bench(object):
+    """
+    One dataset loaded into one storage backend
+    """
+    def __init__(self, directory: str, backend: str, size: int) -> None:
+        self.rest = Counter()
+        self.guild = FakeGuild(self.rest)
+        self.channel = self.guild.channel
+        self.bot = BenchBot(directory, backend, self.guild)
+        self.user = FakeUser(snowflake())
+        self.user_id = str(self.user.id)
+        self.cogs = {cog.__name__: cog(self.bot) for cog in (Create, Add, View, Check, Clear, Share)}
+        self.size = size
+        self.runs = 0
+        # Seconds the deletion clock is ahead of real time
+        self.skew = 0
+
+    async def populate(self) -> None:
+        """
+        Create the dataset and write it out before anything is measured
+        """
+        storage = self.bot.storage
+        storage.create_list(self.user_id, "main")
+        for start in range(0, self.size, 10_000):
+            storage.add_tasks(self.user_id, "main", [f"task {index} of the main list" for index in range(start, min(start + 10_000, self.size))])
+        for list_name in OTHER_LISTS:
+            storage.create_list(self.user_id, list_name)
+            storage.add_tasks(self.user_id, list_name, [f"{list_name} task {index}" for index in range(10)])
+        await self.bot.persistence.flush()
+
+    def cases(self) -> dict:
+        """
+        Case name -> function building (setup coroutine or None, command coroutine, session steps) for run ``n``
+        """
+        cogs, user_id = self.cogs, self.user_id
+        storage = self.bot.storage
+
+        def refill(n: int):
+            async def setup() -> None:
+                # Give the scratch checklist something to clear
+                storage.add_tasks(user_id, "scratch", [f"scratch task {n}.{index}" for index in range(10)])
+            return setup()
+
+        return {
+            "create_inline": lambda n, ctx: (None, cogs["Create"].create_list.callback(cogs["Create"], ctx, list_name=f"new {n}"), []),
+            "create_interactive": lambda n, ctx: (None, cogs["Create"].create_list.callback(cogs["Create"], ctx), [("reply", f"prompted {n}")]),
+            "add_inline": lambda n, ctx: (None, cogs["Add"].add_task_interactively.callback(cogs["Add"], ctx, args="main: wash the car, water plants"), []),
+            "add_interactive": lambda n, ctx: (
+                None, cogs["Add"].add_task_interactively.callback(cogs["Add"], ctx),
+                [("react", "1️⃣"), ("reply", "walk the dog, buy milk")]
+            ),
+            "view": lambda n, ctx: (None, cogs["View"].view_tasks.callback(cogs["View"], ctx), [("react", "1️⃣")]),
+            "check_inline": lambda n, ctx: (None, cogs["Check"].check_task.callback(cogs["Check"], ctx, args="main 1-5,8"), []),
+            "check_board": lambda n, ctx: (
+                None, cogs["Check"].check_task.callback(cogs["Check"], ctx),
+                [("react", "1️⃣"), ("press", 0), ("press", "next_page"), ("press", 3), ("press", "submit")]
+            ),
+            "clear_inline": lambda n, ctx: (refill(n), cogs["Clear"].clear_tasks.callback(cogs["Clear"], ctx, list_name="scratch"), []),
+            "clear_interactive": lambda n, ctx: (
+                refill(n), cogs["Clear"].clear_tasks.callback(cogs["Clear"], ctx),
+                [("react", "2️⃣"), ("react", "✅")]
+            ),
+            "share_inline": lambda n, ctx: (None, cogs["Share"].share_checklist.callback(cogs["Share"], ctx, args=f"main <@{snowflake()}>"), []),
+            "share_interactive": lambda n, ctx: (
+                None, cogs["Share"].share_checklist.callback(cogs["Share"], ctx),
+                [("react", "1️⃣"), ("reply", f"<@{snowflake()}>")]
+            ),
+        }
+
+    async def run(self, name: str, build, repeat: int) -> dict:
+        """
+        Run a case ``repeat`` times and summarize it
+        """
+        latencies, rest, written = [], Counter(), 0
+        for _ in range(repeat):
+            self.runs += 1
+            # Creating checklists goes to a fresh user so the reaction menus stay within 10 lists
+            author = FakeUser(snowflake()) if name.startswith("create") else self.user
+            ctx = FakeContext(author, self.channel, name)
+            setup, command, steps = build(self.runs, ctx)
+            if setup is not None:
+                await setup
+            await self.bot.persistence.flush()
+            self.rest.clear()
+            writes = self.bot.persistence.writes
+
+            start = time.perf_counter()
+            await Session(self.bot.router, author, self.channel).play(command, steps)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+            # Jump the deletion clock past every deadline the command scheduled
+            self.skew += 3600
+            for channel_id, message_ids in self.bot.deleter.expire(time.time() + self.skew).items():
+                await self.bot.deleter.delete(channel_id, message_ids)
+            await self.bot.persistence.flush()
+            if self.bot.persistence.writes > writes:
+                written += self.bot.persistence.last_write_bytes
+            rest.update(self.rest)
+            self.channel.messages.clear()
+
+        latencies.sort()
+        return {
+            "size": self.size,
+            "case": name,
+            "runs": repeat,
+            "latency_ms": {
+                "median": round(statistics.median(latencies), 3),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                "max": round(latencies[-1], 3),
+            },
+            "rest_calls": round(sum(rest.values()) / repeat, 2),
+            "rest": {route: round(count / repeat, 2) for route, count in sorted(rest.items())},
+            "persist_bytes": round(written / repeat),
+        }
+
+    async def close(self) -> None:
+        await self.bot.deleter.close()
+        self.bot.storage.close()
+
+
+async def bench(sizes: list, backend: str, repeat: int, cases: list) -> list:
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            run = Bench(directory, backend, size)
+            start = time.perf_counter()
+            await run.populate()
+            print(f"{size} tasks loaded in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+            for name, build in run.cases().items():
+                if cases and name not in cases:
+                    continue
+                result = await run.run(name, build, repeat)
+                print(f"  {name:<20}{result['latency_ms']['median']:>10.2f} ms{result['rest_calls']:>8} calls"
+                      f"{result['persist_bytes']:>10} B", file=sys.stderr)
+                results.append(result)
+            await run.close()
+    return results
+
+
+def regressions(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    Descriptions of the metrics that grew past the tolerance since the baseline
+    """
+    previous = {(result["size"], result["case"]): result for result in baseline["results"]}
+    found = []
+    for result in results:
+        before = previous.get((result["size"], result["case"]))
+        if before is None:
+            continue
+        metrics = {
+            "median latency": (before["latency_ms"]["median"], result["latency_ms"]["median"]),
+            "REST calls": (before["rest_calls"], result["rest_calls"]),
+            "persisted bytes": (before["persist_bytes"], result["persist_bytes"]),
+        }
+        for metric, (old, new) in metrics.items():
+            if new > old * (1 + tolerance) and new - old > 1e-9:
+                found.append(f"{result['case']} @ {result['size']}: {metric} {old} -> {new}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end command benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="tasks in the dataset")
+    parser.add_argument("--storage", default="json", choices=("json", "sqlite", "sharded"))
+    parser.add_argument("--repeat", type=int, default=20, help="runs per case")
+    parser.add_argument("--cases", nargs="*", default=None, help="only run these cases")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--baseline", help="previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed growth over the baseline")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = asyncio.run(bench(args.sizes, args.storage, args.repeat, args.cases))
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": args.storage,
+            "repeat": args.repeat,
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            found = regressions(results, json.load(file), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,622 @@
+"""
+Local stand-in for the Discord REST API and gateway, for load tests.
+
+The server speaks enough of API v10 for ``lib.bot.Bot`` to log in,
+identify, load its cogs and run commands: a guild with one text channel
+and one member per simulated user, messages, reactions, bulk deletes and
+component interactions. Every REST request is recorded by route and
+attributed to the command of the session whose channel it touched, so
+the report shows which cogs burn the rate-limit budget.
+
+Rate limits follow Discord's shape: per-route buckets keyed by channel
+(5 sends per 5 s, 1 reaction per 0.25 s, ...) plus a global limit, with
+``X-RateLimit-*`` headers on every response and 429s with ``retry_after``
+once a bucket is empty.
+
+Once the bot has synced its commands and identified, ``--sessions``
+simulated users run a scripted session each, concurrently: create a
+checklist, add tasks inline and interactively, view it, check tasks with
+the button board and inline, share it and clear it. User actions are sent as gateway events
+(MESSAGE_CREATE, MESSAGE_REACTION_ADD, INTERACTION_CREATE). The report
+is printed as JSON after the deletion scheduler had ``--drain`` seconds
+to remove the messages left behind. Latencies run from a user action to
+the bot's answer; a prompt answered before the bot waited for it is
+answered again, so they include that retry.
+
+With ``--spam N`` every user first opens the interactive ``check`` menu N
+times without answering it. Each one supersedes the previous session in
+the channel, whose prompts the bot deletes; ``messages_left`` in the
+report counts the bot's messages still in the channels after the drain.
+
+Usage:
+    python -m bench.fake_discord [--port 8080] [--sessions 200] [--spam 0] [--drain 65] [--output report.json]
+    TODOBOT_DISCORD_URL=http://127.0.0.1:8080 DISCORD_BOT_TOKEN=fake python main.py
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from aiohttp import WSMsgType, web
+
+# (limit, seconds) of the per-channel bucket of each route
+ROUTE_LIMITS = {
+    "send": (5, 5.0),
+    "edit": (5, 5.0),
+    "delete": (5, 1.0),
+    "bulk_delete": (1, 1.0),
+    "add_reaction": (1, 0.25),
+    "remove_reaction": (1, 0.25),
+    "clear_reactions": (1, 0.25),
+}
+# Requests per second across all routes
+GLOBAL_LIMIT = 50
+# Administrator, so the bot may manage messages
+PERMISSIONS = "8"
+# Gateway opcodes
+DISPATCH, HEARTBEAT, IDENTIFY, RESUME, REQUEST_MEMBERS, HELLO, HEARTBEAT_ACK = 0, 1, 2, 6, 8, 10, 11
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def json_response(data, status: int = 200, headers: dict = None) -> web.Response:
+    """
+    JSON response without a charset, discord.py only decodes an exact ``application/json``
+    """
+    return web.Response(body=json.dumps(data).encode("utf-8"), status=status, headers=headers, content_type="application/json")
+
+
+class Bucket(object):
+    """
+    Fixed-window rate limit: ``limit`` requests every ``per`` seconds
+    """
+    def __init__(self, limit: int, per: float) -> None:
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset = 0.0
+
+    def take(self, now: float) -> float:
+        """
+        Use one request; returns 0 when allowed, else the seconds to wait
+        """
+        if now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.per
+        if self.remaining == 0:
+            return self.reset - now
+        self.remaining -= 1
+        return 0.0
+
+    def headers(self, name: str, now: float) -> dict:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": f"{time.time() + self.reset - now:.3f}",
+            "X-RateLimit-Reset-After": f"{self.reset - now:.3f}",
+            "X-RateLimit-Bucket": f"fake-{name}",
+        }
+
+
+class FakeDiscord(object):
+    """
+    REST routes, gateway connection and the recorded traffic
+    """
+    def __init__(self, sessions: int, global_limit: int = GLOBAL_LIMIT, rate_limits: bool = True) -> None:
+        self._ids = itertools.count(1 << 40)
+        self.bot_user = self.user(self.snowflake(), "ToDoBot", bot=True)
+        self.owner = self.user(self.snowflake(), "owner")
+        self.application_id = self.snowflake()
+        self.guild_id = self.snowflake()
+        self.users = [self.user(self.snowflake(), f"user{number}") for number in range(sessions)]
+        self.channels = [self.snowflake() for _ in range(sessions)]
+        self.rate_limits = rate_limits
+        self.global_bucket = Bucket(global_limit, 1.0)
+        # (route, channel id) -> Bucket
+        self.buckets = {}
+        # message id -> message payload
+        self.messages = {}
+        # Recorded traffic
+        self.requests = Counter()
+        self.limited = Counter()
+        self.by_command = defaultdict(Counter)
+        # channel id -> Session, set by the driver
+        self.sessions = {}
+        self.url = None
+        self.ws = None
+        self.sequence = 0
+        # Set once the bot registered its slash commands
+        self.synced = asyncio.Event()
+        # Set once the bot identified on the gateway
+        self.identified = asyncio.Event()
+
+    def snowflake(self) -> str:
+        return str(next(self._ids))
+
+    @staticmethod
+    def user(user_id: str, name: str, bot: bool = False) -> dict:
+        return {"id": user_id, "username": name, "global_name": name, "discriminator": "0", "avatar": None, "bot": bot, "public_flags": 0}
+
+    @staticmethod
+    def member(user: dict) -> dict:
+        return {"user": user, "roles": [], "joined_at": now_iso(), "deaf": False, "mute": False, "flags": 0, "nick": None, "pending": False}
+
+    def message(self, channel_id: str, author: dict, content: str = "", embeds: list = None, components: list = None) -> dict:
+        message = {
+            "id": self.snowflake(), "channel_id": channel_id, "guild_id": self.guild_id, "author": author,
+            "member": {key: value for key, value in self.member(author).items() if key != "user"},
+            "content": content or "", "timestamp": now_iso(), "edited_timestamp": None, "tts": False,
+            "mention_everyone": False, "mentions": [self.bot_user] if self.bot_user["id"] in (content or "") else [],
+            "mention_roles": [], "attachments": [], "embeds": embeds or [], "pinned": False, "type": 0, "flags": 0,
+            "components": components or [],
+        }
+        return message
+
+    """ ------------------------------------------ Gateway ------------------------------------------------ """
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        self.ws = ws
+        await ws.send_json({"op": HELLO, "d": {"heartbeat_interval": 41250}})
+        async for frame in ws:
+            if frame.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(frame.data)
+            op = payload.get("op")
+            if op == HEARTBEAT:
+                await ws.send_json({"op": HEARTBEAT_ACK, "d": None})
+            elif op == IDENTIFY:
+                self.identified.set()
+                await self.dispatch("READY", {
+                    "v": 10, "user": {**self.bot_user, "verified": True, "mfa_enabled": False, "flags": 0},
+                    "guilds": [{"id": self.guild_id, "unavailable": True}], "session_id": "fake-session",
+                    "resume_gateway_url": self.url.replace("http", "ws", 1) + "/gateway",
+                    "application": {"id": self.application_id, "flags": 0},
+                    "private_channels": [], "relationships": [], "shard": [0, 1],
+                })
+                await self.dispatch("GUILD_CREATE", self.guild())
+            elif op == RESUME:
+                await self.dispatch("RESUMED", {})
+            elif op == REQUEST_MEMBERS:
+                members = [self.member(user) for user in [self.bot_user] + self.users]
+                await self.dispatch("GUILD_MEMBERS_CHUNK", {
+                    "guild_id": self.guild_id, "members": members, "chunk_index": 0, "chunk_count": 1,
+                    "nonce": payload["d"].get("nonce"),
+                })
+        self.ws = None
+        return ws
+
+    async def dispatch(self, event: str, data: dict) -> None:
+        """
+        Send a gateway event to the bot
+        """
+        if self.ws is None or self.ws.closed:
+            return
+        self.sequence += 1
+        await self.ws.send_json({"op": DISPATCH, "t": event, "s": self.sequence, "d": data})
+
+    def guild(self) -> dict:
+        members = [self.member(user) for user in [self.bot_user] + self.users]
+        channels = [
+            {"id": channel_id, "type": 0, "guild_id": self.guild_id, "name": f"session-{number}", "position": number,
+             "permission_overwrites": [], "nsfw": False, "parent_id": None, "topic": None, "last_message_id": None,
+             "rate_limit_per_user": 0, "flags": 0}
+            for number, channel_id in enumerate(self.channels)
+        ]
+        everyone = {"id": self.guild_id, "name": "@everyone", "permissions": PERMISSIONS, "position": 0, "color": 0,
+                    "hoist": False, "managed": False, "mentionable": False, "flags": 0}
+        return {
+            "id": self.guild_id, "name": "Load Test", "icon": None, "owner_id": self.owner["id"], "roles": [everyone],
+            "channels": channels, "members": members, "member_count": len(members), "large": False,
+            "unavailable": False, "emojis": [], "stickers": [], "features": [], "voice_states": [], "presences": [],
+            "threads": [], "stage_instances": [], "guild_scheduled_events": [], "premium_tier": 0,
+            "preferred_locale": "en-US", "verification_level": 0, "default_message_notifications": 0,
+            "explicit_content_filter": 0, "mfa_level": 0, "nsfw_level": 0, "system_channel_flags": 0,
+            "afk_timeout": 300, "joined_at": now_iso(), "premium_subscription_count": 0,
+        }
+
+    """ ------------------------------------------ REST ------------------------------------------------ """
+    def routes(self) -> list:
+        base = "/api/v10"
+        channel_message = base + "/channels/{channel_id}/messages/{message_id}"
+        return [
+            web.get(base + "/users/@me", self.get_me),
+            web.get(base + "/oauth2/applications/@me", self.get_application),
+            web.get(base + "/gateway", self.get_gateway),
+            web.get(base + "/gateway/bot", self.get_gateway),
+            web.put(base + "/applications/{application_id}/commands", self.sync_commands),
+            web.post(base + "/channels/{channel_id}/messages", self.send_message),
+            web.post(base + "/channels/{channel_id}/messages/bulk-delete", self.bulk_delete),
+            web.patch(channel_message, self.edit_message),
+            web.delete(channel_message, self.delete_message),
+            web.put(channel_message + "/reactions/{emoji}/@me", self.add_reaction),
+            web.delete(channel_message + "/reactions/{emoji}/{user_id}", self.remove_reaction),
+            web.delete(channel_message + "/reactions", self.clear_reactions),
+            web.post(base + "/interactions/{interaction_id}/{token}/callback", self.interaction_callback),
+            web.route("*", base + "/{tail:.*}", self.unknown),
+        ]
+
+    @web.middleware
+    async def record(self, request: web.Request, handler):
+        """
+        Count the request, apply the rate limits and attach their headers
+        """
+        name = getattr(handler, "__name__", "unknown")
+        if name == "gateway":
+            return await handler(request)
+        route = {
+            "send_message": "send", "edit_message": "edit", "delete_message": "delete",
+            "interaction_callback": "interaction_response",
+        }.get(name, name)
+        # Interaction tokens name the channel of the session
+        channel_id = request.match_info.get("channel_id") or request.match_info.get("token", "").rpartition("-")[2]
+        session = self.sessions.get(channel_id)
+        command = session.command if session is not None else "setup"
+        now = time.monotonic()
+
+        headers = {"Via": "1.1 fake-discord"}
+        if self.rate_limits and route in ROUTE_LIMITS:
+            bucket = self.buckets.get((route, channel_id))
+            if bucket is None:
+                bucket = self.buckets[(route, channel_id)] = Bucket(*ROUTE_LIMITS[route])
+            is_global, retry_after = True, self.global_bucket.take(now)
+            if not retry_after:
+                is_global, retry_after = False, bucket.take(now)
+            headers.update(bucket.headers(route, now))
+            if retry_after:
+                self.limited[route] += 1
+                self.by_command[command][f"429 {route}"] += 1
+                headers.update({"Retry-After": f"{retry_after:.3f}", "X-RateLimit-Scope": "global" if is_global else "user"})
+                if is_global:
+                    headers["X-RateLimit-Global"] = "true"
+                body = {"message": "You are being rate limited.", "retry_after": round(retry_after, 3), "global": is_global}
+                return json_response(body, status=429, headers=headers)
+
+        self.requests[route] += 1
+        self.by_command[command][route] += 1
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return json_response({**self.bot_user, "verified": True, "mfa_enabled": False, "flags": 0})
+
+    async def get_application(self, request: web.Request) -> web.Response:
+        return json_response({
+            "id": self.application_id, "name": "ToDoBot", "icon": None, "description": "", "rpc_origins": [],
+            "bot_public": True, "bot_require_code_grant": False, "owner": self.owner, "summary": "",
+            "verify_key": "0" * 64, "team": None, "flags": 0, "tags": [], "redirect_uris": [],
+        })
+
+    async def get_gateway(self, request: web.Request) -> web.Response:
+        return json_response({
+            "url": self.url.replace("http", "ws", 1) + "/gateway", "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+        })
+
+    async def sync_commands(self, request: web.Request) -> web.Response:
+        commands = await request.json()
+        for command in commands:
+            command.update(id=self.snowflake(), application_id=self.application_id, version=self.snowflake())
+        self.synced.set()
+        return json_response(commands)
+
+    async def send_message(self, request: web.Request) -> web.Response:
+        channel_id = request.match_info["channel_id"]
+        if request.content_type.startswith("multipart/"):
+            # Messages with files carry their JSON in a form field
+            payload = json.loads((await request.post())["payload_json"])
+        else:
+            payload = await request.json()
+        message = self.message(channel_id, self.bot_user, payload.get("content"), payload.get("embeds"), payload.get("components"))
+        self.messages[message["id"]] = message
+        # Discord echoes the bot's own messages, which puts them in its cache
+        await self.dispatch("MESSAGE_CREATE", message)
+        self.notify(channel_id, "send", message)
+        return json_response(message)
+
+    async def edit_message(self, request: web.Request) -> web.Response:
+        message = self.messages.get(request.match_info["message_id"])
+        if message is None:
+            return self.not_found()
+        payload = await request.json()
+        for key in ("content", "embeds", "components"):
+            if key in payload:
+                message[key] = payload[key] or ([] if key != "content" else "")
+        message["edited_timestamp"] = now_iso()
+        self.notify(message["channel_id"], "edit", message)
+        return json_response(message)
+
+    async def delete_message(self, request: web.Request) -> web.Response:
+        message = self.messages.pop(request.match_info["message_id"], None)
+        if message is not None:
+            await self.dispatch("MESSAGE_DELETE", {"id": message["id"], "channel_id": message["channel_id"], "guild_id": self.guild_id})
+        return web.Response(status=204)
+
+    async def bulk_delete(self, request: web.Request) -> web.Response:
+        ids = (await request.json())["messages"]
+        for message_id in ids:
+            self.messages.pop(message_id, None)
+        await self.dispatch("MESSAGE_DELETE_BULK", {"ids": ids, "channel_id": request.match_info["channel_id"], "guild_id": self.guild_id})
+        return web.Response(status=204)
+
+    async def add_reaction(self, request: web.Request) -> web.Response:
+        channel_id, message_id = request.match_info["channel_id"], request.match_info["message_id"]
+        emoji = request.match_info["emoji"]
+        await self.dispatch("MESSAGE_REACTION_ADD", self.reaction(self.bot_user, channel_id, message_id, emoji))
+        self.notify(channel_id, "reaction", message_id)
+        return web.Response(status=204)
+
+    async def remove_reaction(self, request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    async def clear_reactions(self, request: web.Request) -> web.Response:
+        return web.Response(status=204)
+
+    async def interaction_callback(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        session = self.sessions.get(request.match_info["token"].rpartition("-")[2])
+        # 7 = update the message the component is on
+        if payload.get("type") == 7 and session is not None and session.pressed is not None:
+            message = self.messages.get(session.pressed)
+            if message is not None:
+                for key in ("content", "embeds", "components"):
+                    if key in payload.get("data", {}):
+                        message[key] = payload["data"][key] or ([] if key != "content" else "")
+        if session is not None:
+            session.inbox.put_nowait(("callback", payload))
+        return web.Response(status=204)
+
+    async def unknown(self, request: web.Request) -> web.Response:
+        return self.not_found()
+
+    @staticmethod
+    def not_found() -> web.Response:
+        return json_response({"message": "Unknown", "code": 10008}, status=404)
+
+    """ ------------------------------------------ Users ------------------------------------------------ """
+    def reaction(self, user: dict, channel_id: str, message_id: str, emoji: str) -> dict:
+        return {
+            "user_id": user["id"], "channel_id": channel_id, "message_id": message_id, "guild_id": self.guild_id,
+            "member": self.member(user), "emoji": {"id": None, "name": emoji}, "burst": False, "type": 0,
+            "burst_colors": [],
+        }
+
+    def notify(self, channel_id: str, kind: str, data) -> None:
+        session = self.sessions.get(channel_id)
+        if session is not None:
+            session.inbox.put_nowait((kind, data))
+
+
+class Session(object):
+    """
+    One simulated user running a scripted session in their own channel
+    """
+    # Seconds to wait for the bot before the session gives up
+    TIMEOUT = 30.0
+    # Seconds before answering a prompt again when the bot didn't react
+    ANSWER_AGAIN = 0.1
+    # Same for buttons, long enough for a slow callback so a toggle isn't clicked twice
+    PRESS_AGAIN = 1.0
+
+    def __init__(self, server: FakeDiscord, number: int, spam: int = 0) -> None:
+        self.server = server
+        self.number = number
+        # Interactive menus opened and abandoned before the script
+        self.spam = spam
+        self.user = server.users[number]
+        self.channel_id = server.channels[number]
+        # Another simulated user to share with
+        self.friend = server.users[(number + 1) % len(server.users)]
+        self.inbox = asyncio.Queue()
+        self.command = "idle"
+        self.pressed = None
+        # command -> [seconds]
+        self.latencies = defaultdict(list)
+        self.failed = None
+
+    async def run(self) -> None:
+        list_name = f"Groceries {self.number}"
+        bot = f"<@{self.server.bot_user['id']}>"
+        try:
+            await self.say("create", f"{bot} create {list_name}", sends=1)
+            await self.say("add_inline", f"{bot} add {list_name}: milk, eggs, bread, butter, flour", sends=1)
+            # An impatient user asking for the menu again and again
+            for _ in range(self.spam):
+                await self.say("spam", f"{bot} check", sends=1)
+            # Interactive add: pick the checklist, then reply with the tasks
+            menu = await self.say("add", f"{bot} add", sends=1)
+            await self.react(menu, "1️⃣", sends=2)
+            await self.reply("apples, pears, plums", sends=1)
+            menu = await self.say("view", f"{bot} view", sends=1)
+            await self.react(menu, "1️⃣", sends=1)
+            menu = await self.say("check", f"{bot} check", sends=1)
+            board = await self.react(menu, "1️⃣", sends=1)
+            await self.press(board, "1")
+            await self.press(board, "Submit")
+            await self.say("check_inline", f"{bot} check {list_name} 2-3", sends=1)
+            await self.say("share", f"{bot} share {list_name} <@{self.friend['id']}>", sends=1)
+            menu = await self.say("clear", f"{bot} clear", sends=1)
+            confirm = await self.react(menu, "1️⃣", sends=1)
+            await self.react(confirm, "✅", sends=1, reactions=2)
+            self.command = "idle"
+        except (asyncio.TimeoutError, LookupError, ValueError) as e:
+            # A missing reply or an unexpected one ends the session
+            self.failed = f"{self.command}: {type(e).__name__}"
+
+    async def say(self, command: str, content: str, sends: int) -> list:
+        """
+        Send a command message and wait for the bot's replies
+        """
+        self.command = command
+        self.start = time.perf_counter()
+        message = self.server.message(self.channel_id, self.user, content)
+        await self.server.dispatch("MESSAGE_CREATE", message)
+        return await self.expect("send", sends)
+
+    async def reply(self, content: str, sends: int) -> list:
+        self.start = time.perf_counter()
+        return await self.answer("MESSAGE_CREATE", self.server.message(self.channel_id, self.user, content), sends)
+
+    async def react(self, messages: list, emoji: str, sends: int, reactions: int = None) -> list:
+        """
+        React to the last message once the bot added its own reactions
+
+        Menus get one reaction per checklist listed, which includes the one
+        the previous user shares once it got that far.
+        """
+        message = messages[-1]
+        if reactions is None:
+            reactions = sum(" - " in line for line in message["embeds"][0]["description"].splitlines())
+        for _ in range(reactions):
+            await self.next("reaction")
+        self.start = time.perf_counter()
+        payload = self.server.reaction(self.user, self.channel_id, message["id"], emoji)
+        return await self.answer("MESSAGE_REACTION_ADD", payload, sends)
+
+    async def answer(self, event: str, payload: dict, count: int, kind: str = "send", again: float = ANSWER_AGAIN) -> list:
+        """
+        Answer a prompt and wait for ``count`` replies of this kind
+
+        The bot only starts waiting (or registers the buttons) once its own
+        calls before the prompt returned, which an empty bucket can hold back
+        for seconds after the prompt was echoed. Like an impatient user,
+        answer again until the bot reacts to it.
+        """
+        deadline = self.start + self.TIMEOUT
+        while True:
+            await self.server.dispatch(event, payload)
+            try:
+                first = await asyncio.wait_for(self.next(kind), again)
+                break
+            except asyncio.TimeoutError:
+                if time.perf_counter() > deadline:
+                    raise
+        return [first] + await self.expect(kind, count - 1)
+
+    async def press(self, messages: list, label: str) -> None:
+        """
+        Click the button with this label on the last message
+        """
+        message = self.server.messages[messages[-1]["id"]]
+        custom_id = next(
+            button["custom_id"] for row in message["components"] for button in row["components"]
+            if button.get("label") == label
+        )
+        self.pressed = message["id"]
+        self.start = time.perf_counter()
+        await self.answer("INTERACTION_CREATE", {
+            "id": self.server.snowflake(), "application_id": self.server.application_id, "type": 3,
+            "data": {"custom_id": custom_id, "component_type": 2}, "guild_id": self.server.guild_id,
+            "channel_id": self.channel_id, "member": {**self.server.member(self.user), "permissions": PERMISSIONS},
+            "token": f"token-{self.channel_id}", "version": 1, "message": message, "app_permissions": PERMISSIONS,
+            "locale": "en-US", "guild_locale": "en-US", "entitlements": [],
+        }, 1, kind="callback", again=self.PRESS_AGAIN)
+
+    async def expect(self, kind: str, count: int) -> list:
+        items = [await self.next(kind) for _ in range(count)]
+        self.latencies[self.command].append(time.perf_counter() - self.start)
+        return items
+
+    async def next(self, kind: str):
+        # Skip other traffic of the channel, such as edits and reactions
+        while True:
+            got, data = await asyncio.wait_for(self.inbox.get(), self.TIMEOUT)
+            if got == kind:
+                return data
+
+
+async def wait_ready(server: FakeDiscord) -> None:
+    """
+    Ask for the checklists until the bot stops answering that it isn't ready
+    """
+    probe = Session(server, 0)
+    server.sessions[probe.channel_id] = probe
+    while True:
+        (reply,) = await probe.say("probe", f"<@{server.bot_user['id']}> lists", sends=1)
+        if reply["embeds"]:
+            return
+        await asyncio.sleep(0.5)
+
+
+async def drive(server: FakeDiscord, drain: float, spam: int = 0) -> dict:
+    """
+    Run every session concurrently once the bot is ready and summarize them
+    """
+    await server.synced.wait()
+    await server.identified.wait()
+    await wait_ready(server)
+    sessions = [Session(server, number, spam) for number in range(len(server.users))]
+    for session in sessions:
+        server.sessions[session.channel_id] = session
+    start = time.perf_counter()
+    await asyncio.gather(*(session.run() for session in sessions))
+    duration = time.perf_counter() - start
+    # Scheduled deletions come in after the sessions end
+    for session in sessions:
+        session.command = "cleanup"
+    await asyncio.sleep(drain)
+
+    latencies = defaultdict(list)
+    for session in sessions:
+        for command, samples in session.latencies.items():
+            latencies[command].extend(samples)
+    return {
+        "sessions": len(sessions),
+        "completed": sum(session.failed is None for session in sessions),
+        "failed": Counter(session.failed for session in sessions if session.failed is not None),
+        "duration_s": round(duration, 2),
+        "messages_left": len(server.messages),
+        "requests": dict(server.requests),
+        "rate_limited": dict(server.limited),
+        "by_command": {command: dict(counts) for command, counts in sorted(server.by_command.items())},
+        "latency_ms": {
+            command: {
+                "median": round(statistics.median(samples) * 1000, 1),
+                "max": round(max(samples) * 1000, 1),
+            }
+            for command, samples in sorted(latencies.items())
+        },
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Discord API and gateway for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--sessions", type=int, default=200, help="simulated users running a session each")
+    parser.add_argument("--spam", type=int, default=0, help="abandoned check menus each user opens first")
+    parser.add_argument("--drain", type=float, default=65, help="seconds to wait for scheduled deletions")
+    parser.add_argument("--global-limit", type=int, default=GLOBAL_LIMIT, help="requests per second across routes")
+    parser.add_argument("--no-rate-limits", action="store_true", help="never answer 429")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    server = FakeDiscord(args.sessions, args.global_limit, rate_limits=not args.no_rate_limits)
+    server.url = f"http://{args.host}:{args.port}"
+    app = web.Application(middlewares=[server.record])
+    app.router.add_get("/gateway", server.gateway)
+    app.router.add_routes(server.routes())
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"Fake Discord listening on {server.url}, start the bot with TODOBOT_DISCORD_URL={server.url}", file=sys.stderr)
+
+    report = await drive(server, args.drain, args.spam)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,206 @@
+"""
+Stand-ins for the Discord objects the cogs touch, for offline benchmarks.
+
+Every REST call the real objects would make (send, edit, reactions,
+deletes, interaction responses) is counted in a shared ``Counter``
+instead of going over the network. Message ids are real snowflakes so
+the deletion scheduler treats them as recent messages.
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import discord
+
+from utils.router import Router
+
+# Bot and guild permissions seen by delete_messages
+PERMISSIONS = SimpleNamespace(manage_messages=True)
+# Keeps snowflakes unique within one millisecond
+_sequence = itertools.count()
+
+
+def snowflake() -> int:
+    """
+    Unique snowflake for the current time
+    """
+    return (int(time.time() * 1000) - discord.utils.DISCORD_EPOCH) << 22 | next(_sequence) & 0x3FFFFF
+
+
+class FakeUser(object):
+    """
+    Member with an id and a mention
+    """
+    def __init__(self, user_id: int, name: str = "user") -> None:
+        self.id = user_id
+        self.name = name
+        self.mention = f"<@{user_id}>"
+        self.guild_permissions = PERMISSIONS
+
+
+class FakeMessage(object):
+    """
+    Message whose REST methods only count calls
+    """
+    def __init__(self, channel: "FakeChannel", author: FakeUser, content: str = None, embed=None, view=None) -> None:
+        self.id = snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.embed = embed
+        self.view = view
+        self.attachments = []
+
+    async def add_reaction(self, emoji) -> None:
+        self.channel.rest["add_reaction"] += 1
+
+    async def remove_reaction(self, emoji, member) -> None:
+        self.channel.rest["remove_reaction"] += 1
+
+    async def clear_reactions(self) -> None:
+        self.channel.rest["clear_reactions"] += 1
+
+    async def edit(self, **fields) -> "FakeMessage":
+        self.channel.rest["edit"] += 1
+        self.embed = fields.get("embed", self.embed)
+        self.view = fields.get("view", self.view)
+        return self
+
+    async def delete(self) -> None:
+        self.channel.rest["delete"] += 1
+
+
+class FakeChannel(object):
+    """
+    Text channel keeping the messages sent to it
+    """
+    def __init__(self, guild, rest: Counter) -> None:
+        self.id = snowflake()
+        self.guild = guild
+        self.rest = rest
+        self.messages = []
+
+    async def send(self, content: str = None, *, embed=None, view=None, file=None) -> FakeMessage:
+        self.rest["send"] += 1
+        message = FakeMessage(self, self.guild.me, content, embed, view)
+        self.messages.append(message)
+        return message
+
+    async def delete_messages(self, messages: list) -> None:
+        self.rest["bulk_delete"] += 1
+
+    def get_partial_message(self, message_id: int) -> SimpleNamespace:
+        return SimpleNamespace(id=message_id, delete=self._delete_one)
+
+    async def _delete_one(self) -> None:
+        self.rest["delete"] += 1
+
+
+class FakeInteraction(object):
+    """
+    Component interaction whose response edits the message it came from
+    """
+    def __init__(self, user: FakeUser, message: FakeMessage) -> None:
+        self.user = user
+        self.message = message
+        self.response = SimpleNamespace(edit_message=self._edit_message, send_message=self._send_message)
+
+    async def _edit_message(self, **fields) -> None:
+        self.message.channel.rest["interaction_response"] += 1
+        self.message.embed = fields.get("embed", self.message.embed)
+        self.message.view = fields.get("view", self.message.view)
+
+    async def _send_message(self, *args, **kwargs) -> None:
+        self.message.channel.rest["interaction_response"] += 1
+
+
+class FakeGuild(object):
+    """
+    Guild with one text channel, resolved by id like ``bot.get_channel``
+    """
+    def __init__(self, rest: Counter) -> None:
+        self.id = snowflake()
+        self.me = FakeUser(snowflake(), "ToDoBot")
+        self.channel = FakeChannel(self, rest)
+
+    def get_channel(self, channel_id: int) -> FakeChannel:
+        return self.channel if channel_id == self.channel.id else None
+
+
+class FakeContext(object):
+    """
+    Command context for one invocation: author, channel and command message
+    """
+    def __init__(self, author: FakeUser, channel: FakeChannel, content: str) -> None:
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.message = FakeMessage(channel, author, content)
+
+    async def send(self, content: str = None, **fields) -> FakeMessage:
+        return await self.channel.send(content, **fields)
+
+
+class CountingRouter(Router):
+    """
+    Router counting the waits it was asked for, so a scripted user knows
+    when the next prompt is waiting
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits = 0
+
+    async def reaction(self, message, user, emojis: list, timeout: float = 60.0):
+        self.waits += 1
+        return await super().reaction(message, user, emojis, timeout)
+
+    async def message(self, channel, user, timeout: float = 60.0):
+        self.waits += 1
+        return await super().message(channel, user, timeout)
+
+
+class Session(object):
+    """
+    Plays a user's side of an interactive command as the cog waits for it.
+
+    Steps are ``("react", emoji)`` on the latest message, ``("reply", text)``
+    or ``("press", name)`` for a button of the latest message's view, where
+    ``name`` is a view attribute or a toggle slot number.
+    """
+    def __init__(self, router: CountingRouter, user: FakeUser, channel: FakeChannel) -> None:
+        self.router = router
+        self.user = user
+        self.channel = channel
+
+    async def play(self, command, steps: list) -> None:
+        """
+        Run a command coroutine and answer its prompts
+        """
+        task = asyncio.ensure_future(command)
+        answered = self.router.waits
+        for kind, value in steps:
+            if kind == "press":
+                await self._until(task, lambda: self.channel.messages and self.channel.messages[-1].view is not None)
+                message = self.channel.messages[-1]
+                view = message.view
+                button = view.toggles[value] if isinstance(value, int) else getattr(view, value)
+                await button.callback(FakeInteraction(self.user, message))
+                continue
+            # Answer the next prompt once the cog waits for it
+            await self._until(task, lambda: self.router.waits > answered)
+            answered += 1
+            if kind == "react":
+                message = self.channel.messages[-1]
+                self.router.dispatch_reaction(SimpleNamespace(message=message, emoji=value), self.user)
+            else:
+                self.router.dispatch_message(FakeMessage(self.channel, self.user, value))
+        await task
+
+    @staticmethod
+    async def _until(task: asyncio.Future, condition) -> None:
+        # Yield to the command until it waits for input or finishes
+        while not condition() and not task.done():
+            await asyncio.sleep(0)
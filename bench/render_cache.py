@@ -0,0 +1,73 @@
+"""
+Render cost of checklist embeds with and without the render cache.
+
+For each checklist size it times the full list (view command and check
+confirmation) and one 10-task page (check board), each after toggling a
+task. "rebuild" formats every line like the cogs used to; "cached" goes
+through ``RenderCache`` with the storage invalidation of a toggle.
+
+Usage: python -m bench.render_cache
+"""
+import timeit
+
+from utils.checklist import Checklist
+from utils.render import RenderCache, render_task
+
+SIZES = (10, 1_000, 10_000)
+TASKS_PER_PAGE = 10
+# Storage revision of the benchmark checklist, bumped by every toggle
+revisions = {"bench": 0}
+
+
+def rebuild(tasks: Checklist, start: int, stop: int) -> str:
+    """
+    Description built from scratch, as before the cache
+    """
+    return "\n".join(render_task(index, text, completed) for index, (text, completed) in enumerate(tasks[start:stop], start=start))
+
+
+def toggle(tasks: Checklist, cache: RenderCache, index: int) -> None:
+    tasks.set_completed(index, not tasks.is_completed(index))
+    if cache is not None:
+        revisions["bench"] += 1
+        cache.changed("set", "bench", index, revisions["bench"])
+
+
+def measure(statement, repeat: int) -> float:
+    """
+    Best time of one call, in microseconds
+    """
+    number = max(1, repeat)
+    return min(timeit.repeat(statement, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    print(f"{'tasks':>7}  {'case':<20}{'rebuild us':>12}{'cached us':>12}")
+    for size in SIZES:
+        tasks = Checklist.from_rows((f"task number {i}", i % 3 == 0) for i in range(size))
+        cache = RenderCache()
+        # Warm the cache like an open session would
+        cache.page("bench", tasks, revision=revisions["bench"])
+        cache.page("bench", tasks, 0, TASKS_PER_PAGE, revisions["bench"])
+        repeat = max(1, 20_000 // size)
+        last = size - 1
+        cases = {
+            "full list": (
+                lambda: rebuild(tasks, 0, size),
+                lambda: cache.page("bench", tasks, revision=revisions["bench"]),
+            ),
+            "toggle + full list": (
+                lambda: (toggle(tasks, None, last), rebuild(tasks, 0, size)),
+                lambda: (toggle(tasks, cache, last), cache.page("bench", tasks, revision=revisions["bench"])),
+            ),
+            "toggle + page": (
+                lambda: (toggle(tasks, None, 0), rebuild(tasks, 0, TASKS_PER_PAGE)),
+                lambda: (toggle(tasks, cache, 0), cache.page("bench", tasks, 0, TASKS_PER_PAGE, revisions["bench"])),
+            ),
+        }
+        for name, (before, after) in cases.items():
+            print(f"{size:>7}  {name:<20}{measure(before, repeat):>12.1f}{measure(after, repeat):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
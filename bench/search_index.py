@@ -0,0 +1,171 @@
+"""
+Query latency of the search index for a user with 100k tasks.
+
+The user owns 80 checklists and has 20 more shared with them, 1,000
+tasks each. Task texts are 3-8 words drawn from a 5,000-word vocabulary
+with Zipf-like frequencies, so common words match tens of thousands of
+tasks and rare ones only a few. "scan" tokenizes every task the user
+can access like a search without an index would; "indexed" goes through
+``SearchIndex`` with the 25-match limit of the search command. Times are
+the median and worst of the query set, in microseconds, and the run fails
+if any indexed query takes a millisecond or more.
+
+Building the index happens in ``SearchIndex.prepare``, which yields to
+the event loop between chunks; the longest stretch it holds the loop is
+reported next to the total build time. Full garbage collections during
+the build account for most of it.
+
+Usage: python -m bench.search_index
+"""
+import asyncio
+import gc
+import logging
+import random
+import statistics
+import time
+
+from utils.search import SearchIndex, tokenize
+from utils.storage import MemoryStorage
+
+OWNED_LISTS = 80
+SHARED_LISTS = 20
+TASKS_PER_LIST = 1_000
+VOCABULARY = 5_000
+LIMIT = 25
+QUERIES = 200
+# Runs of each query, the fastest is its latency
+REPEATS = 3
+# Latency target for an indexed query, in microseconds
+TARGET = 1_000
+
+
+class BenchStorage(MemoryStorage):
+    """
+    In-memory storage that never persists
+    """
+    def _persist(self, record: dict) -> None:
+        pass
+
+
+def populate(storage: MemoryStorage, rng: random.Random) -> list:
+    """
+    Fill the checklists and return the vocabulary, most frequent word first
+    """
+    words = [f"w{rank}" for rank in range(VOCABULARY)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    for number in range(OWNED_LISTS + SHARED_LISTS):
+        owner = "user" if number < OWNED_LISTS else "friend"
+        list_name = f"list {number}"
+        storage.create_list(owner, list_name)
+        tasks = [" ".join(rng.choices(words, weights, k=rng.randint(3, 8))) for _ in range(TASKS_PER_LIST)]
+        storage.add_tasks(owner, list_name, tasks)
+        if owner == "friend":
+            storage.share_list(owner, list_name, ["user"])
+    return words
+
+
+def scan(storage: MemoryStorage, user_id: str, query: str) -> tuple:
+    """
+    Search without an index, as a linear pass over every task
+    """
+    tokens = tokenize(query)
+    matches, total = [], 0
+    for list_name in storage.list_names(user_id):
+        for position, (text, _) in enumerate(storage.get_tasks(user_id, list_name)):
+            if tokens <= tokenize(text):
+                total += 1
+                if len(matches) < LIMIT:
+                    matches.append((list_name, position, text))
+    return matches, total
+
+
+def timings(search, queries: list) -> tuple:
+    """
+    Median and worst latency of the queries, in microseconds
+
+    Each query is its best of ``REPEATS`` runs, so a scheduler hiccup is
+    not mistaken for a slow query.
+    """
+    samples = []
+    # Collections are not part of the query, keep them out of the samples
+    gc.collect()
+    gc.disable()
+    try:
+        for query in queries:
+            runs = []
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                search(query)
+                runs.append(time.perf_counter() - start)
+            samples.append(min(runs) * 1e6)
+    finally:
+        gc.enable()
+    return statistics.median(samples), max(samples)
+
+
+async def build(index: SearchIndex, user_id: str) -> tuple:
+    """
+    Total time of ``prepare`` and the longest it held the event loop, in milliseconds
+    """
+    stalls = []
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await index.prepare(user_id)
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    return elapsed * 1e3, max(stalls) * 1e3
+
+
+def main() -> None:
+    rng = random.Random(16)
+    storage = BenchStorage(logging.getLogger("bench"))
+    words = populate(storage, rng)
+    index = SearchIndex(storage)
+    storage.on_change = index.changed
+    storage.on_list_added = index.added
+    total_tasks = sum(len(storage.get_tasks("user", name)) for name in storage.list_names("user"))
+    print(f"{total_tasks} tasks in {len(storage.list_names('user'))} checklists")
+
+    elapsed, stall = asyncio.run(build(index, "user"))
+    print(f"index build: {elapsed:.1f} ms, longest event loop stall {stall:.1f} ms")
+
+    query_sets = {
+        "rare word": [rng.choice(words[2000:]) for _ in range(QUERIES)],
+        "mid word": [rng.choice(words[100:1000]) for _ in range(QUERIES)],
+        "common word": [rng.choice(words[:10]) for _ in range(QUERIES)],
+        "two words": [f"{rng.choice(words[:50])} {rng.choice(words[50:2000])}" for _ in range(QUERIES)],
+        "no match": [f"missing{number}" for number in range(QUERIES)],
+    }
+    print(f"{'query':<14}{'scan med us':>13}{'indexed med us':>16}{'indexed max us':>16}")
+    slow = []
+    for name, queries in query_sets.items():
+        for query in queries[:5]:
+            assert scan(storage, "user", query) == index.search("user", query, LIMIT), query
+        scan_median, _ = timings(lambda query: scan(storage, "user", query), queries[:5])
+        median, worst = timings(lambda query: index.search("user", query, LIMIT), queries)
+        print(f"{name:<14}{scan_median:>13.0f}{median:>16.1f}{worst:>16.1f}")
+        if worst >= TARGET:
+            slow.append(name)
+
+    # Added tasks are indexed by the storage hook, as they are added
+    start = time.perf_counter()
+    storage.add_tasks("user", "list 0", ["freshly added task"])
+    added = time.perf_counter() - start
+    matches, _ = index.search("user", "freshly added", LIMIT)
+    print(f"adding a task: {added * 1e6:.1f} us, found {matches}")
+
+    assert not slow, f"indexed queries over {TARGET} us: {', '.join(slow)}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Encode and decode time and file size of the checklist serializers.
+
+Datasets are version 2 snapshots like ``JsonStorage`` writes: users with
+1-8 checklists of 5-60 tasks (3-12 words from a 5,000-word vocabulary,
+about a third completed), 10% of the checklists shared with 1-3 other
+users. "indent" is the previous ``json.dump(..., indent=4)``; the others
+are the backends of ``utils.serializer`` with the format header, "json"
+decoded by the stdlib as on an install without orjson.
+Backends whose package isn't installed are skipped. Times are the median
+of ``--repeat`` runs, in milliseconds.
+
+Usage: python -m bench.serializers [--tasks 10000 100000 1000000] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from utils.checklist import Checklist, encode_lists, new_list_id
+from utils.serializer import decode, load_serializer
+from utils.storage import encode_acl
+
+VOCABULARY = 5_000
+
+
+def snapshot(tasks: int, rng: random.Random) -> dict:
+    """
+    Snapshot data with about ``tasks`` tasks
+    """
+    words = [f"word{rank}" for rank in range(VOCABULARY)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    users, lists, acl = {}, {}, {}
+    total = 0
+    while total < tasks:
+        user_id = str(rng.randrange(10 ** 17, 10 ** 18))
+        users[user_id] = {}
+        for number in range(rng.randint(1, 8)):
+            list_id = new_list_id()
+            count = rng.randint(5, 60)
+            checklist = Checklist()
+            checklist.extend([" ".join(rng.choices(words, weights, k=rng.randint(3, 12))) for _ in range(count)])
+            for index in range(count):
+                if rng.random() < 0.33:
+                    checklist.set_completed(index, True)
+            users[user_id][f"list {number}"] = list_id
+            lists[list_id] = checklist
+            acl[list_id] = {"owner": user_id, "members": []}
+            total += count
+    # Share some checklists with existing users
+    user_ids = list(users)
+    for list_id in rng.sample(list(lists), len(lists) // 10):
+        for member in rng.sample(user_ids, rng.randint(1, 3)):
+            if member != acl[list_id]["owner"]:
+                users[member][f"shared {list_id[:6]}"] = list_id
+                acl[list_id]["members"].append(member)
+    return {
+        "version": 2,
+        "users": users,
+        "lists": encode_lists(lists),
+        "acl": encode_acl(acl),
+    }
+
+
+def median_ms(function, repeat: int) -> tuple:
+    """
+    Median milliseconds of ``repeat`` calls and the last result
+    """
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serializer benchmark")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Format -> (encode, decode); "json" decodes with the stdlib like an install without orjson
+    formats = {
+        "indent": (lambda data: json.dumps(data, indent=4).encode(), json.loads),
+        "json": (load_serializer("json").encode, lambda raw: json.loads(raw.partition(b"\n")[2])),
+    }
+    for name in ("orjson", "msgpack"):
+        try:
+            formats[name] = (load_serializer(name).encode, decode)
+        except ValueError:
+            print(f"{name} is not installed, skipped")
+
+    for tasks in args.tasks:
+        data = snapshot(tasks, random.Random(23))
+        print(f"\n{tasks} tasks, {len(data['users'])} users, {len(data['lists'])} checklists")
+        print(f"{'format':<10}{'encode ms':>12}{'decode ms':>12}{'size KiB':>12}{'vs indent':>12}")
+        baseline = None
+        for name, (encode, loads) in formats.items():
+            encode_ms, raw = median_ms(lambda: encode(data), args.repeat)
+            decode_ms, decoded = median_ms(lambda: loads(raw), args.repeat)
+            assert decoded == data, name
+            baseline = baseline or len(raw)
+            print(f"{name:<10}{encode_ms:>12.1f}{decode_ms:>12.1f}{len(raw) / 1024:>12.0f}{len(raw) / baseline:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Stress test of concurrent sessions on one shared checklist.
+
+An owner shares a checklist with ``--users - 1`` members and every user
+runs a session against it at the same time, interleaved at every await:
+
+- toggles: each user has the check board open and presses random toggles
+  and page buttons while others add tasks. Every toggle is counted per
+  task, so the final completion state must be the parity of its presses;
+  a lost or misdirected toggle fails the run.
+- clears: the same with ``clear`` running in between. Boards must follow
+  the checklist (or end when it is emptied) without raising.
+- parallel: transactions that await inside the lock, once all on the
+  shared checklist and once each user on their own. The first is
+  serialized, the second must take about as long as a single user.
+
+After each scenario the pending writes are flushed and the storage is
+reloaded from disk; it must hold exactly what was in memory.
+
+Usage: python -m bench.shared_list [--users 20] [--presses 200] [--storage json|sqlite|sharded]
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from bench.e2e import BenchBot
+from bench.fakes import FakeContext, FakeGuild, FakeInteraction, FakeMessage, FakeUser, snowflake
+from lib.cogs.add import Add
+from lib.cogs.check import TaskBoard
+from lib.cogs.clear import Clear
+from utils.storage import load_storage
+
+LIST_NAME = "shared"
+
+
+class Stress(object):
+    """
+    A shared checklist and the users running sessions on it
+    """
+    def __init__(self, directory: str, backend: str, users: int, seed: int) -> None:
+        self.directory = directory
+        self.backend = backend
+        self.guild = FakeGuild(Counter())
+        self.bot = BenchBot(directory, backend, self.guild)
+        self.users = [FakeUser(snowflake()) for _ in range(users)]
+        self.add = Add(self.bot)
+        self.clear = Clear(self.bot)
+        self.rng = random.Random(seed)
+        # Task text -> toggles that landed on it
+        self.presses = Counter()
+
+    async def populate(self, tasks: int) -> None:
+        owner = str(self.users[0].id)
+        storage = self.bot.storage
+        storage.create_list(owner, LIST_NAME)
+        storage.add_tasks(owner, LIST_NAME, [f"initial task {index}" for index in range(tasks)])
+        storage.share_list(owner, LIST_NAME, [str(user.id) for user in self.users[1:]])
+        await self.bot.persistence.flush()
+
+    async def board_session(self, user: FakeUser, presses: int) -> None:
+        """
+        Press random buttons of a check board, recording which task each toggle hit
+        """
+        user_id = str(user.id)
+        board = TaskBoard(self.bot, user, user_id, LIST_NAME, self.bot.storage.get_tasks(user_id, LIST_NAME))
+        message = FakeMessage(self.guild.channel, user, view=board)
+        for _ in range(presses):
+            await asyncio.sleep(0)
+            if board.is_finished():
+                # The checklist was emptied: open a new board like the user would
+                if not self.bot.storage.get_tasks(user_id, LIST_NAME):
+                    continue
+                board = TaskBoard(self.bot, user, user_id, LIST_NAME, self.bot.storage.get_tasks(user_id, LIST_NAME))
+                message = FakeMessage(self.guild.channel, user, view=board)
+            roll = self.rng.random()
+            if roll < 0.8:
+                before = set(board.toggled)
+                await board.toggle(FakeInteraction(user, message), self.rng.randrange(board.tasks_per_page))
+                # After a clear the board also forgets toggles, only parity without clears is checked
+                for index in before ^ board.toggled:
+                    if index < len(board.tasks):
+                        self.presses[board.tasks.texts[index]] += 1
+            else:
+                await board.turn_page(FakeInteraction(user, message), 1 if roll < 0.9 else -1)
+
+    async def add_session(self, user: FakeUser, adds: int) -> None:
+        """
+        Add tasks through the inline add command
+        """
+        for number in range(adds):
+            await asyncio.sleep(0)
+            ctx = FakeContext(user, self.guild.channel, "add")
+            await self.add.add_inline(ctx, str(user.id), LIST_NAME, [f"task {number} from {user.id}"])
+
+    async def clear_session(self, user: FakeUser, clears: int, presses: int) -> None:
+        """
+        Clear the checklist now and then through the inline clear command
+        """
+        for _ in range(clears):
+            for _ in range(presses // clears):
+                await asyncio.sleep(0)
+            ctx = FakeContext(user, self.guild.channel, "clear")
+            await self.clear.clear_inline(ctx, str(user.id), LIST_NAME)
+
+    async def toggles(self, presses: int) -> list:
+        """
+        Boards and adds; returns the tasks whose state doesn't match their presses
+        """
+        self.presses.clear()
+        sessions = [self.board_session(user, presses) for user in self.users]
+        sessions += [self.add_session(user, presses // 10) for user in self.users[:3]]
+        await asyncio.gather(*sessions)
+        tasks = self.bot.storage.get_tasks(str(self.users[0].id), LIST_NAME)
+        return [text for text, completed in tasks if completed != bool(self.presses[text] % 2)]
+
+    async def clears(self, presses: int) -> None:
+        sessions = [self.board_session(user, presses) for user in self.users]
+        sessions += [self.add_session(user, presses // 5) for user in self.users[:3]]
+        sessions.append(self.clear_session(self.users[-1], 5, presses))
+        await asyncio.gather(*sessions)
+
+    async def parallel(self, transactions: int, hold: float) -> tuple:
+        """
+        Seconds for every user to run transactions on the shared checklist, then each on their own
+        """
+        async def run(user_id: str, list_name: str) -> None:
+            for _ in range(transactions):
+                async with self.bot.storage.transaction(user_id, list_name) as transaction:
+                    # Stand-in for a backend that awaits its reads
+                    await asyncio.sleep(hold)
+                    transaction.add_tasks([f"transaction task {len(transaction.tasks)}"])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run(str(user.id), LIST_NAME) for user in self.users))
+        shared = time.perf_counter() - start
+
+        for user in self.users:
+            self.bot.storage.create_list(str(user.id), "own")
+        start = time.perf_counter()
+        await asyncio.gather(*(run(str(user.id), "own") for user in self.users))
+        separate = time.perf_counter() - start
+        return shared, separate
+
+    async def reloaded(self) -> bool:
+        """
+        Whether the storage reloaded from disk matches the memory state
+        """
+        await self.bot.persistence.flush()
+        # Load a copy, so the running backend keeps its files to itself
+        with tempfile.TemporaryDirectory() as directory:
+            copy = os.path.join(directory, "data")
+            shutil.copytree(self.directory, copy)
+            storage = load_storage(self.backend, os.path.join(copy, "checklists.json"), self.bot.logger)
+            matches = self.snapshot(storage) == self.snapshot(self.bot.storage)
+            storage.close()
+        return matches
+
+    def snapshot(self, storage) -> dict:
+        return {
+            (str(user.id), list_name): list(storage.get_tasks(str(user.id), list_name))
+            for user in self.users for list_name in storage.list_names(str(user.id))
+        }
+
+    async def close(self) -> None:
+        await self.bot.deleter.close()
+        self.bot.storage.close()
+
+
+async def stress(args) -> bool:
+    with tempfile.TemporaryDirectory() as directory:
+        run = Stress(directory, args.storage, args.users, args.seed)
+        await run.populate(args.tasks)
+        storage = run.bot.storage
+        ok = True
+
+        start = time.perf_counter()
+        wrong = await run.toggles(args.presses)
+        reloaded = await run.reloaded()
+        print(f"toggles   {time.perf_counter() - start:>7.2f} s  {sum(run.presses.values())} toggles, "
+              f"{len(wrong)} tasks in the wrong state, reload {'matches' if reloaded else 'DIFFERS'}")
+        ok &= not wrong and reloaded
+
+        start = time.perf_counter()
+        await run.clears(args.presses)
+        reloaded = await run.reloaded()
+        print(f"clears    {time.perf_counter() - start:>7.2f} s  reload {'matches' if reloaded else 'DIFFERS'}")
+        ok &= reloaded
+
+        shared, separate = await run.parallel(args.transactions, args.hold)
+        reloaded = await run.reloaded()
+        serial = args.users * args.transactions * args.hold
+        print(f"parallel  shared list {shared:.2f} s (serialized: {serial:.2f} s), one list each {separate:.2f} s "
+              f"(one user: {args.transactions * args.hold:.2f} s), reload {'matches' if reloaded else 'DIFFERS'}")
+        ok &= reloaded and shared >= serial * 0.9 and separate < serial / 2
+        print(f"lock waits {storage.locks.contended}, locks left {len(storage.locks)}")
+        ok &= not len(storage.locks)
+        await run.close()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent sessions on one shared checklist")
+    parser.add_argument("--users", type=int, default=20, help="the owner and the members")
+    parser.add_argument("--tasks", type=int, default=50, help="tasks in the checklist at the start")
+    parser.add_argument("--presses", type=int, default=200, help="button presses per board session")
+    parser.add_argument("--transactions", type=int, default=20, help="transactions per user in the parallel scenario")
+    parser.add_argument("--hold", type=float, default=0.005, help="seconds each of them awaits under the lock")
+    parser.add_argument("--storage", choices=["json", "sqlite", "sharded"], default="json")
+    parser.add_argument("--seed", type=int, default=24)
+    args = parser.parse_args()
+    if not asyncio.run(stress(args)):
+        print("FAILED", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
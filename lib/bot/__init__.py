@@ -1,12 +1,27 @@
-from asyncio import sleep
+import asyncio
+import time
 from glob import glob
 
 import coloredlogs
-from discord import Intents, Message
+import yarl
+from discord import HTTPException, Intents, Interaction, InteractionType, Message
+from discord.app_commands import CheckFailure, CommandTree
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Context, when_mentioned_or
+from discord.gateway import DiscordWebSocket
+from discord.http import Route
 
+from utils.deleter import DeletionScheduler
 from utils.funcs import *
+from utils.metrics import Metrics, current_cog
+from utils.names import PrefixIndex
+from utils.persistence import Persistence
+from utils.profiler import Profiler
+from utils.render import RenderCache
+from utils.router import Router
+from utils.search import SearchIndex
+from utils.sessions import SessionManager, current_session, sessions_full, superseded
+from utils.storage import load_storage
 
 # Enable intents
 INTENTS = Intents.default()
@@ -26,28 +41,70 @@ def get_prefix(bot: BotBase, message: Message) -> list:
     return when_mentioned_or(prefix)(bot, message)
 
 
-class Ready(object):
+def use_discord_url(url: str) -> None:
     """
-    Used to prepare elements that have async aspects
+    Point the REST client and the gateway at another Discord API, such as the local fake server
     """
-    def __init__(self, itr: list, name: str) -> None:
-        # List var or iterate element
-        self.itr = itr
-        # Name of the type: example a list of cogs would be cog
-        self.name = name
-        # Create attributes
-        for element in self.itr:
-            setattr(self, element, False)
-
-    def ready_up(self, element: str) -> None:
-        # Set specific element to true
-        setattr(self, element, True)
-        # Log readiness
-        bot.logger.info(f"{element} {self.name} ready")
-
-    def all_ready(self) -> list:
-        # If all elements in list are true
-        return all([getattr(self, element) for element in self.itr])
+    url = url.rstrip("/")
+    Route.BASE = f"{url}/api/v10"
+    DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(url.replace("http", "ws", 1) + "/gateway")
+
+
+class Tree(CommandTree):
+    """
+    Slash command tree that starts the latency clock of each command
+    and registers the interactive ones as sessions
+    """
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        command = interaction.command
+        if command is not None:
+            # Waits of the command are attributed to its cog
+            current_cog.set(getattr(command.binding, "qualified_name", "none"))
+        interaction.extras["started"] = time.perf_counter()
+        # Autocomplete runs this check on every keystroke, only the command itself is a session
+        if interaction.type is InteractionType.autocomplete:
+            return True
+        if command is not None and command.extras.get("session"):
+            sessions = interaction.client.sessions
+            session = sessions.start(interaction.user.id, interaction.channel_id, f"/{command.qualified_name}")
+            if session is None:
+                await interaction.response.send_message(embed=sessions_full(), ephemeral=True)
+                return False
+            session.interaction = interaction
+            current_session.set(session)
+            # The command runs in this task, the session ends with it
+            session.task.add_done_callback(lambda task: sessions.end(session))
+        return True
+
+    async def on_error(self, interaction: Interaction, error) -> None:
+        # Refused sessions were already answered
+        if isinstance(error, CheckFailure):
+            return
+        await super().on_error(interaction, error)
+
+
+class SessionContext(Context):
+    """
+    Command context that records what an interactive session sends, so a
+    superseded session can be cleaned up
+    """
+    session = None
+
+    async def send(self, *args, **kwargs) -> Message:
+        message = await super().send(*args, **kwargs)
+        if self.session is None:
+            return message
+        view = kwargs.get("view")
+        if self.session.closed:
+            # Superseded while this was being sent
+            if view is not None:
+                view.stop()
+            self.bot.deleter.schedule(message)
+            return message
+        self.session.messages.append(message)
+        if view is not None:
+            self.session.views.append(view)
+        return message
 
 
 class Bot(BotBase):
@@ -55,49 +112,114 @@ class Bot(BotBase):
     Bot instance used to interact with client
     """
     def __init__(self: BotBase) -> None:
+        # Start of the startup clock
+        self.started = time.perf_counter()
+        # Startup phase -> seconds since the bot was created
+        self.startup = {}
         # Name of bot
         self.name = 'ToDoBot'
-        # Bot ready and cogs ready
-        self.ready = False
-        # Confirmation for cog init
-        self.cogs_ready = Ready(COGS, 'cog')
+        # Set once the gateway session is up, commands are refused before
+        self.ready = asyncio.Event()
         # Bot logger
         self.logger = load_logger()
         # Token used to run bot
         self.TOKEN = load_token(self.logger)
+        # Alternative Discord API, e.g. bench/fake_discord.py for load tests
+        discord_url = load_setting("discord_url", "")
+        if discord_url:
+            use_discord_url(discord_url)
+            self.logger.info(f"Using the Discord API at {discord_url}")
         # Bot data dir and checklist name
         self.checklist_file_name = "data/checklists.json"
-        self.checklists = load_json(self.checklist_file_name)
+        # Checklist storage backend (json or sqlite)
+        self.storage = load_storage(load_setting("storage", "json"), self.checklist_file_name, self.logger)
+        # Background writer that coalesces storage writes off the event loop
+        self.persistence = Persistence(
+            self.storage.prepare_write, self.logger,
+            window=load_setting("save_window", 1.0, float),
+            write_failed=self.storage.write_failed
+        )
+        self.storage.on_commit = self.persistence.mark_dirty
+        # Rendered checklist pages, invalidated by storage mutations
+        self.renders = RenderCache()
+        # Inverted token index over task texts for the search command
+        self.search = SearchIndex(self.storage)
+        self.storage.on_change = self.tasks_changed
+        # Checklist names by prefix for slash command autocomplete
+        self.names = PrefixIndex(self.storage)
+        self.storage.on_list_added = self.list_added
+        # Sessions waiting for reactions and replies
+        self.router = Router()
+        # Live interactive sessions per user and channel, with caps
+        self.sessions = SessionManager(
+            max_sessions=load_setting("max_sessions", 1000, int),
+            max_per_user=load_setting("max_user_sessions", 3, int)
+        )
+        self.sessions.on_superseded = self.session_superseded
+        # Deletes prompts and replies once they expire
+        self.deleter = DeletionScheduler(self, "data/deletions.json", self.logger)
+        # Command latencies, timeouts, REST calls and writes, served for Prometheus
+        self.metrics = Metrics(self)
+        self.router.on_timeout = self.metrics.timed_out
+        self.persistence.on_write = self.metrics.written
+        # Profiles chosen commands on the owner's request
+        self.profiler = Profiler("data/profiles", self.logger)
 
         # Call parent object init
-        super().__init__(intents=INTENTS, command_prefix=get_prefix)
+        super().__init__(
+            intents=INTENTS, command_prefix=get_prefix, tree_cls=Tree,
+            http_trace=self.metrics.trace_config()
+        )
+        self._sync_task = None
+        self.phase("init")
 
-    async def setup(self: BotBase) -> None:
+    async def setup_hook(self: BotBase) -> None:
         """
-        Initiates cogs before bot is ready
+        Initiates cogs once after login, before the gateway connects
         """
+        self.phase("login")
         # remove default help cog
         self.remove_command("help")
-        # Init cogs
-        for cog in COGS:
-            # Load cog
-            await self.load_extension(f"lib.cogs.{cog}")
-            # Log cog loading
-            self.logger.info(f"{cog} cog loaded")
-        # Log setup completion
-        self.logger.info("Setup complete")
+        # Start expiring scheduled deletions, including those restored from disk
+        self.deleter.start()
+        # Serve metrics on a local port (0 disables the endpoint)
+        metrics_port = load_setting("metrics_port", 9108, int)
+        if metrics_port:
+            metrics_host = load_setting("metrics_host", "127.0.0.1")
+            try:
+                await self.metrics.start(metrics_host, metrics_port)
+                self.logger.info(f"Serving metrics on http://{metrics_host}:{metrics_port}/metrics")
+            except OSError as e:
+                self.logger.error(f"Failed to serve metrics on port {metrics_port}: {e}")
+        # Load the cogs concurrently
+        await asyncio.gather(*(self.load_extension(f"lib.cogs.{cog}") for cog in COGS))
+        self.logger.info(f"{len(COGS)} cogs loaded: {', '.join(sorted(COGS))}")
+        self.phase("cogs")
+        # Register the slash commands while the gateway connects
+        self._sync_task = asyncio.create_task(self.sync_commands())
+
+    async def sync_commands(self: BotBase) -> None:
+        """
+        Registers the slash commands with Discord
+        """
+        try:
+            synced = await self.tree.sync()
+            self.logger.info(f"{len(synced)} slash commands synced")
+            self.phase("slash_sync")
+        except HTTPException as e:
+            self.logger.error(f"Failed to sync slash commands: {e}")
 
     """ ------------------------------------------ Events ------------------------------------------------ """
     async def on_connect(self: BotBase) -> None:
         """
         Actions to perform on connect
         """
-        # Log setup start
-        self.logger.info("Running setup...")
-        # Attempt setup
-        await self.setup()
         # Log connection
         self.logger.info("Bot connected")
+        if not self.ready.is_set():
+            # Cogs were loaded in setup_hook, accept commands as soon as the gateway session is up
+            self.ready.set()
+            self.phase("gateway")
 
     async def on_disconnect(self: BotBase) -> None:
         """
@@ -118,16 +240,36 @@ class Bot(BotBase):
         self.logger.error("An error occurred", exc_info=True)
         raise
 
+    async def on_message(self: BotBase, message: Message) -> None:
+        """
+        Actions to perform on every message
+        """
+        # Hand replies to waiting sessions
+        self.router.dispatch_message(message)
+        await self.process_commands(message)
+
+    async def on_reaction_add(self: BotBase, reaction, user) -> None:
+        """
+        Actions to perform on every reaction
+        """
+        # Hand reactions to waiting sessions
+        self.router.dispatch_reaction(reaction, user)
+
+    async def on_app_command_completion(self: BotBase, interaction: Interaction, command) -> None:
+        """
+        Records the latency of a slash command that completed
+        """
+        started = interaction.extras.get("started")
+        if started is not None:
+            self.metrics.command_done(f"/{command.qualified_name}", time.perf_counter() - started)
+
     async def on_ready(self: BotBase) -> None:
         """
         Actions to perform once the bot is ready
         """
-        if not self.ready:
-            # Confirm all cogs are ready
-            while not self.cogs_ready.all_ready():
-                await sleep(0.5)
-
-            self.ready = True
+        if "ready" not in self.startup:
+            # Guilds are cached, commands were already accepted since on_connect
+            self.phase("ready")
             # Log readiness
             self.logger.info("Bot ready")
         else:
@@ -146,16 +288,101 @@ class Bot(BotBase):
         # Run bot
         super().run(self.TOKEN, reconnect=True)
 
+    def phase(self: BotBase, name: str) -> None:
+        """
+        Records and logs the time a startup phase completed at
+        """
+        self.startup[name] = time.perf_counter() - self.started
+        self.logger.info(f"Startup: {name} after {self.startup[name] * 1000:.0f} ms")
+
+    def tasks_changed(self: BotBase, op: str, list_id: str, index: int = None) -> None:
+        """
+        Hands task mutations to the render cache and the search index
+        """
+        self.renders.changed(op, list_id, index, self.storage.revisions[list_id])
+        self.search.changed(op, list_id, index)
+
+    def list_added(self: BotBase, user_id: str, list_name: str) -> None:
+        """
+        Hands checklists a user gained to the name index and the search index
+        """
+        self.names.added(user_id, list_name)
+        self.search.added(user_id, list_name)
+
+    def session_superseded(self: BotBase, session) -> None:
+        """
+        Cleans up after an interactive session closed by a newer one
+        """
+        self.logger.info(f"Session {session.command} of user {session.user_id} superseded")
+        if session.interaction is not None:
+            # Ephemeral prompts can only be edited through their interaction
+            self.loop.create_task(self._close_interaction(session.interaction))
+        else:
+            self.deleter.schedule(session.message, *session.messages)
+
+    async def _close_interaction(self: BotBase, interaction: Interaction) -> None:
+        try:
+            await interaction.edit_original_response(embed=superseded(), view=None)
+        except HTTPException:
+            # The command hadn't answered yet
+            pass
+
+    async def close(self: BotBase) -> None:
+        """
+        Flushes pending checklist writes before shutting down
+        """
+        if self._sync_task is not None and not self._sync_task.done():
+            self._sync_task.cancel()
+        await self.persistence.flush()
+        self.storage.close()
+        await self.deleter.close()
+        await self.metrics.close()
+        await super().close()
+
+    async def invoke(self: BotBase, ctx: Context) -> None:
+        """
+        Invokes a command, recording its latency and the cog its waits belong to,
+        as a session when it is interactive and under the profiler when the
+        owner armed it for this command
+        """
+        if ctx.command is None:
+            await super().invoke(ctx)
+            return
+        current_cog.set(ctx.cog.qualified_name if ctx.cog is not None else "none")
+        # Interactive commands are sessions when run without arguments
+        session = None
+        if ctx.command.extras.get("session") and not ctx.view.buffer[ctx.view.index:].strip():
+            session = self.sessions.start(ctx.author.id, ctx.channel.id, ctx.command.qualified_name)
+            if session is None:
+                await send_basic_message(self, ctx, embed=sessions_full())
+                return
+            session.message = ctx.message
+            ctx.session = session
+            current_session.set(session)
+        start = time.perf_counter()
+        try:
+            if self.profiler.command == ctx.command.qualified_name:
+                await self.profiler.run(super().invoke(ctx))
+            else:
+                await super().invoke(ctx)
+        finally:
+            self.metrics.command_done(ctx.command.qualified_name, time.perf_counter() - start)
+            if session is not None:
+                self.sessions.end(session)
+
     async def process_commands(self: BotBase, message: Message) -> None:
         """
         Actions to perform when a message doesn't have a proper channel
         """
-        ctx = await self.get_context(message, cls=Context)
+        ctx = await self.get_context(message, cls=SessionContext)
 
         if ctx.command is not None and ctx.guild is not None:
-            if not self.ready:
+            if not self.ready.is_set():
                 await ctx.send("I'm not ready to receive commands. Please wait a few seconds.")
             else:
+                # Cold start measured up to the first command
+                if "first_command" not in self.startup:
+                    self.phase("first_command")
                 await self.invoke(ctx)
 
 # Bot instance
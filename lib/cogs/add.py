@@ -2,10 +2,13 @@ import asyncio
 import os
 
 import discord
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
-from utils.funcs import delete_messages, save_checklists, send_basic_message
+from utils.funcs import delete_messages, send_basic_message
+from utils.inline import parse_add
+from utils.names import checklist_autocomplete, checklist_not_found
 
 
 class Add(Cog):
@@ -16,27 +19,34 @@ class Add(Cog):
         self.bot = bot
 
     # Command: Add tasks interactively to a checklist with reaction-based selection
-    @command(name="add", help="Add one or more tasks interactively to a checklist.")
-    async def add_task_interactively(self, ctx):
+    @command(name="add", help="Add tasks to a checklist: `add <list>: task, task`, or interactively.", extras={"session": True})
+    async def add_task_interactively(self, ctx, *, args: str = None):
+        # Inline form: add the tasks in one pass
+        if args:
+            parsed = parse_add(args)
+            if parsed is None:
+                await self.usage_error(ctx)
+            else:
+                await self.add_inline(ctx, str(ctx.author.id), *parsed)
+            return
+
         try:
             # Initialize user ID and their checklists
             user_id = str(ctx.author.id)
-            if user_id not in self.bot.checklists:
-                self.bot.checklists[user_id] = {}
+            checklist_names = self.bot.storage.list_names(user_id)
 
             # Check if user has any checklists to select from
-            if not self.bot.checklists[user_id]:
+            if not checklist_names:
                 embed = discord.Embed(
                     title="No Checklists Saved 🛑",
                     description="You don't have any checklists. Please create one first using `@ToDoBot create`.",
                     color=discord.Color.red()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=embed)
+                await send_basic_message(self.bot, ctx, embed=embed)
                 self.bot.logger.info(f"User {user_id} doesn't have any checklists saved.")
                 return
 
-            # Prepare the checklist names and corresponding reactions
-            checklist_names = list(self.bot.checklists[user_id].keys())
+            # Prepare the corresponding reactions
             reactions = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣']  # Max 5 checklists can be selected
 
             # Create an embed with the list of checklists
@@ -53,13 +63,9 @@ class Add(Cog):
             for i in range(len(checklist_names)):
                 await init_message.add_reaction(reactions[i])
 
-            # Reaction check function
-            def reaction_check(reaction, user):
-                return user == ctx.author and reaction.message.id == init_message.id and reaction.emoji in reactions[:len(checklist_names)]
-
             try:
                 # Wait for the user to react
-                reaction, _ = await self.bot.wait_for('reaction_add', check=reaction_check, timeout=60.0)
+                reaction = await self.bot.router.reaction(init_message, ctx.author, reactions[:len(checklist_names)], timeout=60.0)
                 
                 # Find the checklist selected based on the reaction
                 selected_index = reactions.index(reaction.emoji)
@@ -84,13 +90,9 @@ class Add(Cog):
                     prompt_embed.set_footer(text="You have 60 seconds to respond.")
                     tasks_message = await ctx.send(embed=prompt_embed)
 
-                    # Message check function for task input
-                    def message_check(message):
-                        return message.author == ctx.author and message.channel == ctx.channel
-
                     try:
                         # Wait for user input (tasks)
-                        response = await self.bot.wait_for('message', check=message_check, timeout=60.0)
+                        response = await self.bot.router.message(ctx.channel, ctx.author, timeout=60.0)
                         task_input = response.content.strip()
 
                         # Delete any previous error message (if still lingering)
@@ -108,8 +110,8 @@ class Add(Cog):
                                 description="You canceled the task addition process.",
                                 color=discord.Color.orange()
                             )
-                            await send_basic_message(self.bot.logger, ctx, embed=cancel_embed)
-                            await delete_messages(self.bot.logger, init_message, confirmation_message, tasks_message, response)
+                            await send_basic_message(self.bot, ctx, embed=cancel_embed)
+                            await delete_messages(self.bot, init_message, confirmation_message, tasks_message, response)
                             return
 
                         # Edge case handling for empty responses
@@ -120,7 +122,7 @@ class Add(Cog):
                                 color=discord.Color.red()
                             )
                             prev_error_msg = await ctx.send(embed=error_embed)
-                            await delete_messages(self.bot.logger, tasks_message, response)
+                            await delete_messages(self.bot, tasks_message, response)
                             continue  # Retry the process if no tasks were provided
 
                         # Split tasks by commas and clean up
@@ -132,14 +134,12 @@ class Add(Cog):
                                 color=discord.Color.red()
                             )
                             prev_error_msg = await ctx.send(embed=error_embed)
-                            await delete_messages(self.bot.logger, tasks_message, response)
+                            await delete_messages(self.bot, tasks_message, response)
                             continue  # Retry if no tasks are valid
 
                         # Add tasks to the checklist
-                        for task in task_list:
-                            self.bot.checklists[user_id][list_name].append({"task": task, "completed": False})
-
-                        save_checklists(self.bot.checklist_file_name, self.bot.checklists)
+                        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+                            transaction.add_tasks(task_list)
 
                         # Send success message with added tasks
                         added_tasks = "\n".join([f"- {task}" for task in task_list])
@@ -148,8 +148,8 @@ class Add(Cog):
                             description=f"Successfully added the following tasks to **{list_name}**:\n{added_tasks}",
                             color=discord.Color.green()
                         )
-                        await send_basic_message(self.bot.logger, ctx, embed=success_embed)
-                        await delete_messages(self.bot.logger, init_message, confirmation_message, tasks_message, response)
+                        await send_basic_message(self.bot, ctx, embed=success_embed)
+                        await delete_messages(self.bot, init_message, confirmation_message, tasks_message, response)
                         # Clean up any previous error message.
                         if prev_error_msg is not None:
                             try:
@@ -165,8 +165,8 @@ class Add(Cog):
                             description="You took too long to respond. Task addition canceled.",
                             color=discord.Color.orange()
                         )
-                        await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                        await delete_messages(self.bot.logger, init_message, confirmation_message, tasks_message)
+                        await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                        await delete_messages(self.bot, init_message, confirmation_message, tasks_message)
                         return
 
             except asyncio.TimeoutError:
@@ -175,19 +175,92 @@ class Add(Cog):
                     description="You took too long to select a checklist. Task addition canceled.",
                     color=discord.Color.orange()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                await delete_messages(self.bot.logger, init_message)
+                await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                await delete_messages(self.bot, init_message)
                 return
 
         except Exception as e:
-            await send_basic_message(self.bot.logger, ctx, f"An error occurred while adding tasks: {e}")
+            await send_basic_message(self.bot, ctx, f"An error occurred while adding tasks: {e}")
             self.bot.logger.error(f"An error occurred in the 'add' command: {e}")
 
-    @Cog.listener()
-    async def on_ready(self: Cog) -> None:
-        # Ready up the cog when the bot is ready.
-        if not self.bot.ready:
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+    async def usage_error(self, ctx) -> None:
+        """
+        Reply with the inline syntax when the arguments can't be parsed
+        """
+        embed = discord.Embed(
+            title="Invalid Input ⚠️",
+            description="Usage: `@ToDoBot add <list>: task, task`, or `@ToDoBot add` alone to be guided step by step.",
+            color=discord.Color.orange()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def list_not_found(self, ctx, list_name: str) -> None:
+        """
+        Reply that an inline command named a checklist the user doesn't have
+        """
+        embed = discord.Embed(
+            title="Checklist Not Found 🛑",
+            description=f"You don't have a checklist named **{list_name}**.",
+            color=discord.Color.red()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def add_inline(self, ctx, user_id: str, list_name: str, task_list: list) -> None:
+        """
+        Add the tasks given in the command
+        """
+        if not self.bot.storage.has_list(user_id, list_name):
+            await self.list_not_found(ctx, list_name)
+            return
+        if not task_list:
+            error_embed = discord.Embed(
+                title="No Valid Tasks ⚠️",
+                description="No valid tasks were provided. Please try again.",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=error_embed)
+            return
+
+        # All tasks go into a single journal record
+        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+            transaction.add_tasks(task_list)
+        added_tasks = "\n".join([f"- {task}" for task in task_list])
+        success_embed = discord.Embed(
+            title="Tasks Added ✅",
+            description=f"Successfully added the following tasks to **{list_name}**:\n{added_tasks}",
+            color=discord.Color.green()
+        )
+        await send_basic_message(self.bot, ctx, embed=success_embed)
+
+    @app_commands.command(name="add", description="Add tasks to a checklist.")
+    @app_commands.describe(checklist="Checklist to add to", tasks="Tasks to add, separated by commas")
+    @app_commands.autocomplete(checklist=checklist_autocomplete)
+    @app_commands.guild_only()
+    async def add_tasks_slash(self, interaction: discord.Interaction, checklist: str, tasks: str) -> None:
+        user_id = str(interaction.user.id)
+        if not self.bot.storage.has_list(user_id, checklist):
+            await interaction.response.send_message(embed=checklist_not_found(checklist), ephemeral=True)
+            return
+
+        # Split tasks by commas and clean up
+        task_list = [task.strip() for task in tasks.split(",") if task.strip()]
+        if not task_list:
+            embed = discord.Embed(
+                title="No Valid Tasks ⚠️",
+                description="No valid tasks were provided. Please try again.",
+                color=discord.Color.red()
+            )
+        else:
+            async with self.bot.storage.transaction(user_id, checklist) as transaction:
+                transaction.add_tasks(task_list)
+            added_tasks = "\n".join([f"- {task}" for task in task_list])
+            embed = discord.Embed(
+                title="Tasks Added ✅",
+                description=f"Successfully added the following tasks to **{checklist}**:\n{added_tasks}",
+                color=discord.Color.green()
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 
 async def setup(bot: BotBase) -> None:
     """
@@ -2,10 +2,208 @@ import asyncio
 import os
 
 import discord
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
 from utils.funcs import *
+from utils.inline import parse_check
+from utils.names import checklist_autocomplete, checklist_not_found
+from utils.paginator import MAX_DESCRIPTION, Paginator
+from utils.render import render_task, task_size
+
+
+class TaskToggle(discord.ui.Button):
+    """
+    Button toggling one task slot on the current page
+    """
+    def __init__(self, board: "TaskBoard", slot: int) -> None:
+        super().__init__(row=slot // 5)
+        self.board = board
+        self.slot = slot
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await self.board.toggle(interaction, self.slot)
+
+
+class TaskBoard(discord.ui.View):
+    """
+    Component board for the check command: task toggles, page buttons and submit.
+
+    Rendering a page is one message edit answering the interaction, instead
+    of clearing and re-adding up to 13 reactions.
+    """
+    def __init__(self, bot: BotBase, author, user_id: str, list_name: str, tasks, tasks_per_page: int = 10, timeout: float = 60.0) -> None:
+        super().__init__(timeout=timeout)
+        self.bot = bot
+        self.author = author
+        self.user_id = user_id
+        self.list_name = list_name
+        # Rendered pages are cached under the checklist id
+        self.list_id = bot.storage.list_id(user_id, list_name)
+        self.tasks_per_page = tasks_per_page
+        self.tasks = None
+        # Revision of the checklist the local copy matches
+        self.revision = bot.storage.revisions.get(self.list_id, 0)
+        self.page_index = 0
+        # Tasks toggled during the session, for the confirmation
+        self.toggled = set()
+        self.load(tasks)
+        # Buttons are created once and re-labelled on every page
+        self.toggles = [TaskToggle(self, slot) for slot in range(tasks_per_page)]
+        self.previous_page = discord.ui.Button(emoji="⬅️", style=discord.ButtonStyle.primary, row=2)
+        self.next_page = discord.ui.Button(emoji="➡️", style=discord.ButtonStyle.primary, row=2)
+        self.submit = discord.ui.Button(emoji="✅", label="Submit", style=discord.ButtonStyle.success, row=2)
+        self.previous_page.callback = lambda interaction: self.turn_page(interaction, -1)
+        self.next_page.callback = lambda interaction: self.turn_page(interaction, 1)
+        self.submit.callback = self.confirm
+        self.refresh()
+
+    def load(self, tasks) -> None:
+        """
+        Show the current tasks; the checklist may have been cleared or extended by another session
+        """
+        # In-memory backends extend the same object, so the length tells an add apart
+        if tasks is self.tasks and len(tasks) == self.count:
+            return
+        if self.tasks is not None:
+            # Positions toggled before a clear no longer name the same tasks
+            self.toggled = {
+                index for index in self.toggled if index < len(tasks) and tasks.texts[index] == self.tasks.texts[index]
+            }
+        self.tasks = tasks
+        # Pages hold task indices, cut by rendered size and by the number of toggle buttons
+        self.paginator = Paginator(
+            range(len(tasks)), size=lambda index: task_size(index, tasks[index][0]), max_items=self.tasks_per_page
+        )
+        # Tasks the pages were cut from
+        self.count = len(tasks)
+        while self.page_index > 0 and not self.paginator.has_page(self.page_index):
+            self.page_index -= 1
+
+    def sync(self) -> None:
+        """
+        Reload the tasks if another session changed the checklist since the last read
+        """
+        revision = self.bot.storage.revisions.get(self.list_id, 0)
+        if revision != self.revision:
+            self.load(self.bot.storage.get_tasks(self.user_id, self.list_name))
+            self.revision = revision
+
+    @property
+    def page(self) -> range:
+        indices = self.paginator.page(self.page_index)
+        return range(indices[0], indices[-1] + 1)
+
+    def refresh(self) -> None:
+        """
+        Rebuild the components for the current page
+        """
+        self.clear_items()
+        for slot, index in enumerate(self.page):
+            toggle = self.toggles[slot]
+            completed = self.tasks.is_completed(index)
+            toggle.label = str(index + 1)
+            toggle.style = discord.ButtonStyle.success if completed else discord.ButtonStyle.secondary
+            self.add_item(toggle)
+        has_next = self.paginator.has_page(self.page_index + 1)
+        if self.page_index > 0 or has_next:
+            self.previous_page.disabled = self.page_index == 0
+            self.next_page.disabled = not has_next
+            self.add_item(self.previous_page)
+            self.add_item(self.next_page)
+        self.add_item(self.submit)
+
+    def render(self) -> discord.Embed:
+        """
+        Embed for the current page
+        """
+        page = self.page
+        embed = discord.Embed(
+            title=f"Tasks in **{self.list_name}**",
+            description=self.bot.renders.page(self.list_id, self.tasks, page.start, page.stop, self.revision),
+            color=discord.Color.blue()
+        )
+        footer = "Use the buttons to toggle tasks. ✅ to confirm."
+        if self.page_index > 0 or self.paginator.has_page(1):
+            footer = f"{self.paginator.label(self.page_index)} · {footer}"
+        embed.set_footer(text=footer)
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Only the user who ran the command can use the board
+        return interaction.user.id == self.author.id
+
+    async def on_timeout(self) -> None:
+        self.bot.metrics.timed_out("Check")
+
+    async def toggle(self, interaction: discord.Interaction, slot: int) -> None:
+        """
+        Toggle the completion status of the task in a slot of the current page
+        """
+        async with self.bot.storage.transaction(self.user_id, self.list_name) as transaction:
+            # Toggle what the list holds now, not what it held when the page was drawn
+            transaction.reuse(self.tasks, self.revision)
+            self.load(transaction.tasks)
+            page = self.page if self.tasks else range(0)
+            if slot < len(page):
+                index = page[slot]
+                transaction.set_completed(index, not self.tasks.is_completed(index))
+                self.toggled ^= {index}
+            self.revision = transaction.revision
+        # The reply is sent after the lock is released
+        if not self.tasks:
+            await self.emptied(interaction)
+            return
+        self.refresh()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    async def turn_page(self, interaction: discord.Interaction, step: int) -> None:
+        """
+        Move to the previous or next page
+        """
+        self.sync()
+        if not self.tasks:
+            await self.emptied(interaction)
+            return
+        if self.paginator.has_page(self.page_index + step):
+            self.page_index += step
+        self.refresh()
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    async def emptied(self, interaction: discord.Interaction) -> None:
+        """
+        End the session because the checklist was cleared while the board was open
+        """
+        self.stop()
+        embed = discord.Embed(
+            title="Task List Empty ⚠️",
+            description=f"**{self.list_name}** was cleared in the meantime.",
+            color=discord.Color.orange()
+        )
+        await interaction.response.edit_message(embed=embed, view=None)
+
+    async def confirm(self, interaction: discord.Interaction) -> None:
+        """
+        Replace the board with the confirmation and end the session
+        """
+        self.stop()
+        self.sync()
+        header = "The following tasks have been updated:\n"
+        # List the toggled tasks, as many as fit in one embed
+        lines = Paginator(
+            (render_task(index, *self.tasks[index]) for index in sorted(self.toggled)),
+            max_size=MAX_DESCRIPTION - len(header) - 32
+        )
+        shown = list(lines.page(0)) if lines.has_page(0) else ["No tasks were changed."]
+        if len(shown) < len(self.toggled):
+            shown.append(f"…and {len(self.toggled) - len(shown)} more")
+        confirmation_embed = discord.Embed(
+            title="Tasks Updated",
+            description=header + "\n".join(shown),
+            color=discord.Color.green()
+        )
+        await interaction.response.edit_message(embed=confirmation_embed, view=None)
 
 
 class Check(Cog):
@@ -15,27 +213,37 @@ class Check(Cog):
     def __init__(self, bot: BotBase) -> None:
         self.bot = bot
 
-    @command(name="check", help="Mark one or more tasks as complete.")
-    async def check_task(self, ctx):
+    @command(name="check", help="Mark tasks as complete: `check <list> 1-5,8`, or interactively.", extras={"session": True})
+    async def check_task(self, ctx, *, args: str = None):
         user_id = str(ctx.author.id)
+
+        # Inline form: mark the numbered tasks complete in one pass
+        if args:
+            parsed = parse_check(args)
+            if parsed is None:
+                await self.usage_error(ctx)
+            else:
+                await self.check_inline(ctx, user_id, *parsed)
+            return
+
         # Track the previous error message
         prev_error_msg = None  
 
         # Main loop to allow retries
         while True:
             # Check if the user has any checklists
-            if user_id not in self.bot.checklists or not self.bot.checklists[user_id]:
+            checklist_names = self.bot.storage.list_names(user_id)
+            if not checklist_names:
                 embed = discord.Embed(
                     title="No Checklists Saved 🛑",
                     description="You don't have any checklists. Please create one first using `@ToDoBot create`.",
                     color=discord.Color.red()
                 )
                 self.bot.logger.info(f"User {user_id} has no checklists saved.")
-                await send_basic_message(self.bot.logger, ctx, embed=embed)
+                await send_basic_message(self.bot, ctx, embed=embed)
                 return
 
-            # List the checklists to choose from
-            checklist_names = list(self.bot.checklists[user_id].keys())
+            # Reactions for the checklists to choose from
             reactions = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']
 
             init_embed = discord.Embed(
@@ -50,11 +258,8 @@ class Check(Cog):
             for i in range(len(checklist_names)):
                 await checklist_message.add_reaction(reactions[i])
 
-            def checklist_check(reaction, user):
-                return user == ctx.author and reaction.message.id == checklist_message.id and reaction.emoji in reactions[:len(checklist_names)]
-
             try:
-                reaction, _ = await self.bot.wait_for('reaction_add', check=checklist_check, timeout=60.0)
+                reaction = await self.bot.router.reaction(checklist_message, ctx.author, reactions[:len(checklist_names)], timeout=60.0)
 
                 # Delete any previous error message (if still lingering)
                 if prev_error_msg is not None:
@@ -66,14 +271,7 @@ class Check(Cog):
 
                 selected_index = reactions.index(reaction.emoji)
                 list_name = checklist_names[selected_index]
-                tasks = self.bot.checklists[user_id][list_name]
-
-                # Paginate tasks
-                tasks_per_page = 10
-                task_pages = [
-                    tasks[i:i + tasks_per_page] for i in range(0, len(tasks), tasks_per_page)
-                ]
-                page_index = 0
+                tasks = self.bot.storage.get_tasks(user_id, list_name)
 
                 # Check if tasks are empty
                 if not tasks:
@@ -83,87 +281,27 @@ class Check(Cog):
                         color=discord.Color.red()
                     )
                     prev_error_msg = await ctx.send(embed=error_embed)
-                    await delete_messages(self.bot.logger, checklist_message)
+                    await delete_messages(self.bot, checklist_message)
                     continue  # Restart the loop to allow the user to select a different checklist
 
-                # Embed for task selection
-                def update_embed():
-                    task_descriptions = [
-                        f"{i + 1 + page_index * tasks_per_page}. {'✅' if task['completed'] else '❌'} {task['task']}"
-                        for i, task in enumerate(task_pages[page_index])
-                    ]
-                    embed = discord.Embed(
-                        title=f"Tasks in **{list_name}**",
-                        description="\n".join(task_descriptions),
-                        color=discord.Color.blue()
+                # One message with buttons: every toggle or page change is a single edit
+                board = TaskBoard(self.bot, ctx.author, user_id, list_name, tasks)
+                task_message = await ctx.send(embed=board.render(), view=board)
+                timed_out = await board.wait()
+
+                if timed_out:
+                    timeout_embed = discord.Embed(
+                        title="Timeout ⚠️",
+                        description="You took too long to respond. Task completion canceled.",
+                        color=discord.Color.orange()
                     )
-                    embed.set_footer(text="Use reactions to navigate and toggle tasks. ✅ to confirm.")
-                    return embed
-
-                async def update_reactions():
-                    """Updates reactions on the task message based on the current page."""
-                    await task_message.clear_reactions()
-                    for i in range(len(task_pages[page_index])):
-                        await task_message.add_reaction(reactions[i])
-                    if len(task_pages) > 1:
-                        if page_index > 0:
-                            await task_message.add_reaction('⬅️')  # Left arrow
-                        if page_index < len(task_pages) - 1:
-                            await task_message.add_reaction('➡️')  # Right arrow
-                    await task_message.add_reaction('✅')  # Submit button
-
-                task_message = await ctx.send(embed=update_embed())
-                await update_reactions()
-
-                def task_check(reaction, user):
-                    valid_reactions = reactions[:len(task_pages[page_index])] + ['⬅️', '➡️', '✅']
-                    return user == ctx.author and reaction.message.id == task_message.id and reaction.emoji in valid_reactions
-
-                while True:
-                    try:
-                        reaction, _ = await self.bot.wait_for('reaction_add', check=task_check, timeout=60.0)
-
-                        if reaction.emoji == '➡️' and page_index < len(task_pages) - 1:  # Next page
-                            page_index += 1
-                            await task_message.edit(embed=update_embed())
-                            await update_reactions()
-
-                        elif reaction.emoji == '⬅️' and page_index > 0:  # Previous page
-                            page_index -= 1
-                            await task_message.edit(embed=update_embed())
-                            await update_reactions()
-
-                        elif reaction.emoji == '✅':  # Submit selected tasks
-                            save_checklists(self.bot.checklist_file_name, self.bot.checklists)
-                            confirmation_embed = discord.Embed(
-                                title="Tasks Updated",
-                                description="The following tasks have been updated:\n" +
-                                            "\n".join([f"{'✅' if task['completed'] else '❌'} {task['task']}" for task in tasks]),
-                                color=discord.Color.green()
-                            )
-                            await send_basic_message(self.bot.logger, ctx, embed=confirmation_embed)
-                            await delete_messages(self.bot.logger, checklist_message, task_message, prev_error_msg)
-                            return  
-
-                        else:
-                            # Toggle the completion status of the task
-                            task_index = reactions.index(reaction.emoji) + page_index * tasks_per_page
-                            if task_index < len(tasks):
-                                tasks[task_index]['completed'] = not tasks[task_index]['completed']
-
-                                # Update the embed to reflect the toggled status
-                                await task_message.edit(embed=update_embed())
-                                await reaction.remove(ctx.author)
-
-                    except asyncio.TimeoutError:
-                        timeout_embed = discord.Embed(
-                            title="Timeout ⚠️",
-                            description="You took too long to respond. Task completion canceled.",
-                            color=discord.Color.orange()
-                        )
-                        await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                        await delete_messages(self.bot.logger, checklist_message, task_message, prev_error_msg)
-                        return  
+                    await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                    await delete_messages(self.bot, checklist_message, task_message, prev_error_msg)
+                    return
+
+                # The board was replaced by the confirmation when it was submitted
+                await delete_messages(self.bot, ctx.message, checklist_message, task_message, prev_error_msg, wait=15)
+                return
 
             except asyncio.TimeoutError:
                 timeout_embed = discord.Embed(
@@ -171,17 +309,107 @@ class Check(Cog):
                     description="You took too long to select a checklist. Task completion canceled.",
                     color=discord.Color.orange()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                await delete_messages(self.bot.logger, checklist_message, prev_error_msg)
+                await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                await delete_messages(self.bot, checklist_message, prev_error_msg)
                 return  
 
 
-    @Cog.listener()
-    async def on_ready(self: Cog) -> None:
-        # if bot is ready 
-        if not self.bot.ready:
-            # ready up cog
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+    async def usage_error(self, ctx) -> None:
+        """
+        Reply with the inline syntax when the arguments can't be parsed
+        """
+        embed = discord.Embed(
+            title="Invalid Input ⚠️",
+            description="Usage: `@ToDoBot check <list> 1-5,8`, or `@ToDoBot check` alone to be guided step by step.",
+            color=discord.Color.orange()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def list_not_found(self, ctx, list_name: str) -> None:
+        """
+        Reply that an inline command named a checklist the user doesn't have
+        """
+        embed = discord.Embed(
+            title="Checklist Not Found 🛑",
+            description=f"You don't have a checklist named **{list_name}**.",
+            color=discord.Color.red()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def check_inline(self, ctx, user_id: str, list_name: str, ranges: list) -> None:
+        """
+        Mark the tasks numbered in the command as complete
+        """
+        if not self.bot.storage.has_list(user_id, list_name):
+            await self.list_not_found(ctx, list_name)
+            return
+
+        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+            tasks = transaction.tasks
+            # Ends past the checklist are reported, so ranges only expand up to its length
+            missing = [last + 1 for first, last in ranges if not 0 <= last < len(tasks)]
+            indices = sorted({
+                index for first, last in ranges for index in range(first, min(last + 1, len(tasks)))
+            })
+            if not missing:
+                # Every change lands in the same coalesced write
+                for index in indices:
+                    if not tasks.is_completed(index):
+                        transaction.set_completed(index, True)
+
+        if missing:
+            error_embed = discord.Embed(
+                title="Invalid Input ⚠️",
+                description=f"**{list_name}** has {len(tasks)} task(s), there is no task {', '.join(map(str, missing))}.",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=error_embed)
+            return
+
+        lines = Paginator(
+            (render_task(index, *tasks[index]) for index in indices),
+            max_size=MAX_DESCRIPTION - 64
+        )
+        shown = list(lines.page(0))
+        if len(shown) < len(indices):
+            shown.append(f"…and {len(indices) - len(shown)} more")
+        confirmation_embed = discord.Embed(
+            title="Tasks Updated",
+            description="The following tasks have been updated:\n" + "\n".join(shown),
+            color=discord.Color.green()
+        )
+        await send_basic_message(self.bot, ctx, embed=confirmation_embed)
+
+    @app_commands.command(name="check", description="Mark tasks in a checklist as complete.", extras={"session": True})
+    @app_commands.describe(checklist="Checklist to update")
+    @app_commands.autocomplete(checklist=checklist_autocomplete)
+    @app_commands.guild_only()
+    async def check_task_slash(self, interaction: discord.Interaction, checklist: str) -> None:
+        user_id = str(interaction.user.id)
+        if not self.bot.storage.has_list(user_id, checklist):
+            await interaction.response.send_message(embed=checklist_not_found(checklist), ephemeral=True)
+            return
+
+        tasks = self.bot.storage.get_tasks(user_id, checklist)
+        if not tasks:
+            error_embed = discord.Embed(
+                title="Task List Empty ⚠️",
+                description="No tasks in checklist. Please try again.",
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=error_embed, ephemeral=True)
+            return
+
+        # The board is only visible to the user, so nothing needs deleting afterwards
+        board = TaskBoard(self.bot, interaction.user, user_id, checklist, tasks)
+        await interaction.response.send_message(embed=board.render(), view=board, ephemeral=True)
+        if await board.wait():
+            timeout_embed = discord.Embed(
+                title="Timeout ⚠️",
+                description="You took too long to respond. Task completion canceled.",
+                color=discord.Color.orange()
+            )
+            await interaction.edit_original_response(embed=timeout_embed, view=None)
 
 
 async def setup(bot: BotBase) -> None:
@@ -2,11 +2,53 @@ import asyncio
 import os
 
 import discord
-from discord import FFmpegPCMAudio
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
 from utils.funcs import *
+from utils.names import checklist_autocomplete, checklist_not_found
+
+
+class ConfirmClear(discord.ui.View):
+    """
+    Confirm and cancel buttons for clearing a checklist from the slash command
+    """
+    def __init__(self, bot: BotBase, author, user_id: str, list_name: str, timeout: float = 60.0) -> None:
+        super().__init__(timeout=timeout)
+        self.bot = bot
+        self.author = author
+        self.user_id = user_id
+        self.list_name = list_name
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    async def on_timeout(self) -> None:
+        self.bot.metrics.timed_out("Clear")
+
+    @discord.ui.button(emoji="✅", label="Clear", style=discord.ButtonStyle.danger)
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        self.stop()
+        # Clear the selected checklist.
+        async with self.bot.storage.transaction(self.user_id, self.list_name) as transaction:
+            transaction.clear()
+        cleared_embed = discord.Embed(
+            title="Tasks Cleared 🗑️",
+            description=f"All tasks in **{self.list_name}** have been cleared!",
+            color=discord.Color.green()
+        )
+        await interaction.response.edit_message(embed=cleared_embed, view=None)
+
+    @discord.ui.button(emoji="❌", label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        self.stop()
+        cancel_embed = discord.Embed(
+            title="Action Canceled",
+            description="The task clearing has been canceled.",
+            color=discord.Color.red()
+        )
+        await interaction.response.edit_message(embed=cancel_embed, view=None)
 
 
 class Clear(Cog):
@@ -16,24 +58,29 @@ class Clear(Cog):
     def __init__(self, bot: BotBase) -> None:
         self.bot = bot
 
-    @command(name="clear", help="Clear all tasks in a checklist.")
-    async def clear_tasks(self, ctx):
+    @command(name="clear", help="Clear all tasks in a checklist: `clear <list>`, or interactively.", extras={"session": True})
+    async def clear_tasks(self, ctx, *, list_name: str = None):
         user_id = str(ctx.author.id)
         prev_error_msg = None  # Track the previous error message
 
+        # Inline form: naming the checklist is the confirmation
+        if list_name:
+            await self.clear_inline(ctx, user_id, list_name.strip())
+            return
+
         # Check if the user has any checklists.
-        if user_id not in self.bot.checklists or not self.bot.checklists[user_id]:
+        checklist_names = self.bot.storage.list_names(user_id)
+        if not checklist_names:
             embed = discord.Embed(
                 title="No Checklists Found 🛑",
                 description="You don't have any checklists. Please create one first.",
                 color=discord.Color.red()
             )
             # This is a final message so we allow it to be auto-deleted after the default wait.
-            await send_basic_message(self.bot.logger, ctx, embed=embed, wait=30)
+            await send_basic_message(self.bot, ctx, embed=embed, wait=30)
             return
 
-        # List the user's checklists
-        checklist_names = list(self.bot.checklists[user_id].keys())
+        # Reactions for the user's checklists
         reactions = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']  # 1-10 reactions
 
         embed = discord.Embed(
@@ -57,16 +104,9 @@ class Clear(Cog):
             except Exception as e:
                 self.bot.logger.error(f"Error adding reaction {reactions[i]}: {e}")
 
-        def checklist_check(reaction, user):
-            return (
-                user == ctx.author and 
-                reaction.message.id == checklist_message.id and 
-                reaction.emoji in reactions[:len(checklist_names)]
-            )
-
         try:
             # Wait for the user to select a checklist by reacting.
-            reaction, _ = await self.bot.wait_for('reaction_add', check=checklist_check, timeout=60.0)
+            reaction = await self.bot.router.reaction(checklist_message, ctx.author, reactions[:len(checklist_names)], timeout=60.0)
             selected_index = reactions.index(reaction.emoji)
             list_name = checklist_names[selected_index]
 
@@ -90,27 +130,20 @@ class Clear(Cog):
                 self.bot.logger.error(f"Error adding confirmation reactions: {e}")
                 return
 
-            def confirm_check(reaction, user):
-                return (
-                    user == ctx.author and 
-                    reaction.message.id == confirm_message.id and 
-                    reaction.emoji in ['✅', '❌']
-                )
-
             try:
-                reaction, _ = await self.bot.wait_for('reaction_add', check=confirm_check, timeout=60.0)
+                reaction = await self.bot.router.reaction(confirm_message, ctx.author, ['✅', '❌'], timeout=60.0)
                 if reaction.emoji == '✅':
                     # Clear the selected checklist.
-                    self.bot.checklists[user_id][list_name] = []
-                    save_checklists(self.bot.checklist_file_name, self.bot.checklists)
+                    async with self.bot.storage.transaction(user_id, list_name) as transaction:
+                        transaction.clear()
 
                     cleared_embed = discord.Embed(
                         title="Tasks Cleared 🗑️",
                         description=f"All tasks in **{list_name}** have been cleared!",
                         color=discord.Color.green()
                     )
-                    await send_basic_message(self.bot.logger, ctx, embed=cleared_embed)
-                    await delete_messages(self.bot.logger, confirm_message, checklist_message)
+                    await send_basic_message(self.bot, ctx, embed=cleared_embed)
+                    await delete_messages(self.bot, confirm_message, checklist_message)
                     
                     
                 elif reaction.emoji == '❌':
@@ -119,8 +152,8 @@ class Clear(Cog):
                         description="The task clearing has been canceled.",
                         color=discord.Color.red()
                     )
-                    await send_basic_message(self.bot.logger, ctx, embed=cancel_embed)
-                    await delete_messages(self.bot.logger, confirm_message, checklist_message)
+                    await send_basic_message(self.bot, ctx, embed=cancel_embed)
+                    await delete_messages(self.bot, confirm_message, checklist_message)
                     
                     
             except asyncio.TimeoutError:
@@ -129,8 +162,8 @@ class Clear(Cog):
                     description="You took too long to respond. The task clearing has been canceled.",
                     color=discord.Color.orange()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                await delete_messages(self.bot.logger, confirm_message, checklist_message)
+                await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                await delete_messages(self.bot, confirm_message, checklist_message)
                 self.bot.logger.error("Timeout waiting for confirmation reaction.")
                 
         except asyncio.TimeoutError:
@@ -139,15 +172,63 @@ class Clear(Cog):
                 description="You took too long to select a checklist. Task clearing canceled.",
                 color=discord.Color.orange()
             )
-            await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-            await delete_messages(self.bot.logger, checklist_message)
+            await send_basic_message(self.bot, ctx, embed=timeout_embed)
+            await delete_messages(self.bot, checklist_message)
             self.bot.logger.error("Timeout waiting for checklist selection reaction.")
 
-    @Cog.listener()
-    async def on_ready(self) -> None:
-        # Mark this cog as ready once the bot is up.
-        if not self.bot.ready:
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+    async def list_not_found(self, ctx, list_name: str) -> None:
+        """
+        Reply that an inline command named a checklist the user doesn't have
+        """
+        embed = discord.Embed(
+            title="Checklist Not Found 🛑",
+            description=f"You don't have a checklist named **{list_name}**.",
+            color=discord.Color.red()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def clear_inline(self, ctx, user_id: str, list_name: str) -> None:
+        """
+        Clear the checklist named in the command
+        """
+        if not self.bot.storage.has_list(user_id, list_name):
+            await self.list_not_found(ctx, list_name)
+            return
+
+        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+            transaction.clear()
+        cleared_embed = discord.Embed(
+            title="Tasks Cleared 🗑️",
+            description=f"All tasks in **{list_name}** have been cleared!",
+            color=discord.Color.green()
+        )
+        await send_basic_message(self.bot, ctx, embed=cleared_embed)
+
+    @app_commands.command(name="clear", description="Clear all tasks in a checklist.", extras={"session": True})
+    @app_commands.describe(checklist="Checklist to clear")
+    @app_commands.autocomplete(checklist=checklist_autocomplete)
+    @app_commands.guild_only()
+    async def clear_tasks_slash(self, interaction: discord.Interaction, checklist: str) -> None:
+        user_id = str(interaction.user.id)
+        if not self.bot.storage.has_list(user_id, checklist):
+            await interaction.response.send_message(embed=checklist_not_found(checklist), ephemeral=True)
+            return
+
+        # Ask for confirmation before clearing tasks.
+        confirm_embed = discord.Embed(
+            title=f"Clear All Tasks in **{checklist}**",
+            description="Are you sure you want to clear all tasks in this checklist?",
+            color=discord.Color.orange()
+        )
+        view = ConfirmClear(self.bot, interaction.user, user_id, checklist)
+        await interaction.response.send_message(embed=confirm_embed, view=view, ephemeral=True)
+        if await view.wait():
+            timeout_embed = discord.Embed(
+                title="Timeout ⚠️",
+                description="You took too long to respond. The task clearing has been canceled.",
+                color=discord.Color.orange()
+            )
+            await interaction.edit_original_response(embed=timeout_embed, view=None)
 
 
 async def setup(bot: BotBase) -> None:
@@ -2,10 +2,11 @@ import asyncio
 import os
 
 import discord
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
-from utils.funcs import delete_messages, save_checklists, send_basic_message
+from utils.funcs import delete_messages, send_basic_message
 
 
 class Create(Cog):
@@ -15,11 +16,14 @@ class Create(Cog):
     def __init__(self, bot: BotBase) -> None:
         self.bot = bot
 
-    @command(name="create", help="Create a new checklist interactively.")
-    async def create_list(self, ctx):
+    @command(name="create", help="Create a new checklist: `create <name>`, or interactively.", extras={"session": True})
+    async def create_list(self, ctx, *, list_name: str = None):
         user_id = str(ctx.author.id)
-        if user_id not in self.bot.checklists:
-            self.bot.checklists[user_id] = {}
+
+        # Inline form: create the checklist in one pass
+        if list_name:
+            await self.create_inline(ctx, user_id, list_name.strip())
+            return
 
         # Variable to store the last error message (if any)
         prev_error_msg = None
@@ -37,12 +41,9 @@ class Create(Cog):
                 self.bot.logger.error("Failed to send the checklist creation prompt.")
                 return
 
-            # Check that the response comes from the same author and channel.
-            def check(message):
-                return message.author == ctx.author and message.channel == ctx.channel
-
             try:
-                response = await self.bot.wait_for('message', check=check, timeout=60.0)
+                # Wait for the response from the same author and channel.
+                response = await self.bot.router.message(ctx.channel, ctx.author, timeout=60.0)
                 list_name = response.content.strip()
 
                 # Delete any lingering error message immediately.
@@ -61,7 +62,7 @@ class Create(Cog):
                         color=discord.Color.orange()
                     )
                     prev_error_msg = await ctx.send(embed=invalid_embed)
-                    await delete_messages(self.bot.logger, prompt_message, response, wait=0)
+                    await delete_messages(self.bot, prompt_message, response, wait=0)
                     continue
 
                 # Handle cancellation
@@ -71,32 +72,31 @@ class Create(Cog):
                         description="You canceled the checklist creation process.",
                         color=discord.Color.orange()
                     )
-                    await send_basic_message(self.bot.logger, ctx, embed=cancel_embed)
-                    await delete_messages(self.bot.logger, prompt_message, response, wait=0)
+                    await send_basic_message(self.bot, ctx, embed=cancel_embed)
+                    await delete_messages(self.bot, prompt_message, response, wait=0)
                     return
 
                 # Check if the checklist already exists
-                if list_name in self.bot.checklists[user_id]:
+                if self.bot.storage.has_list(user_id, list_name):
                     exists_embed = discord.Embed(
                         title="Checklist Already Exists 🛑",
                         description=f"The checklist **{list_name}** already exists! Please try a different name.",
                         color=discord.Color.red()
                     )
                     prev_error_msg = await ctx.send(embed=exists_embed)
-                    await delete_messages(self.bot.logger, prompt_message, response, wait=0)
+                    await delete_messages(self.bot, prompt_message, response, wait=0)
                     continue
 
                 # Create the new checklist if all validations pass.
-                self.bot.checklists[user_id][list_name] = []
-                save_checklists(self.bot.checklist_file_name, self.bot.checklists)
+                self.bot.storage.create_list(user_id, list_name)
 
                 success_embed = discord.Embed(
                     title="Checklist Created ✅",
                     description=f"Successfully created a new checklist: **{list_name}**",
                     color=discord.Color.green()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=success_embed, wait=30)
-                await delete_messages(self.bot.logger, prompt_message, response, wait=0)
+                await send_basic_message(self.bot, ctx, embed=success_embed, wait=30)
+                await delete_messages(self.bot, prompt_message, response, wait=0)
                 # Clean up any previous error message.
                 if prev_error_msg is not None:
                     try:
@@ -112,16 +112,60 @@ class Create(Cog):
                     description="You took too long to respond. Checklist Creation Canceled ⚠️",
                     color=discord.Color.orange()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=timeout_embed, wait=30)
-                await delete_messages(self.bot.logger, prompt_message, wait=0)
+                await send_basic_message(self.bot, ctx, embed=timeout_embed, wait=30)
+                await delete_messages(self.bot, prompt_message, wait=0)
                 self.bot.logger.error("Timeout waiting for checklist name response.")
                 return
 
-    @Cog.listener()
-    async def on_ready(self) -> None:
-        # Ready up the cog when the bot is ready.
-        if not self.bot.ready:
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+    async def create_inline(self, ctx, user_id: str, list_name: str) -> None:
+        """
+        Create a checklist named in the command
+        """
+        if self.bot.storage.has_list(user_id, list_name):
+            embed = discord.Embed(
+                title="Checklist Already Exists 🛑",
+                description=f"The checklist **{list_name}** already exists! Please try a different name.",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        self.bot.storage.create_list(user_id, list_name)
+        success_embed = discord.Embed(
+            title="Checklist Created ✅",
+            description=f"Successfully created a new checklist: **{list_name}**",
+            color=discord.Color.green()
+        )
+        await send_basic_message(self.bot, ctx, embed=success_embed, wait=30)
+
+    @app_commands.command(name="create", description="Create a new checklist.")
+    @app_commands.describe(name="Name of the new checklist")
+    @app_commands.guild_only()
+    async def create_list_slash(self, interaction: discord.Interaction, name: app_commands.Range[str, 1, 100]) -> None:
+        user_id = str(interaction.user.id)
+        list_name = name.strip()
+
+        if not list_name:
+            embed = discord.Embed(
+                title="Invalid Input ⚠️",
+                description="You didn't provide a name for the checklist. Please try again.",
+                color=discord.Color.orange()
+            )
+        elif self.bot.storage.has_list(user_id, list_name):
+            embed = discord.Embed(
+                title="Checklist Already Exists 🛑",
+                description=f"The checklist **{list_name}** already exists! Please try a different name.",
+                color=discord.Color.red()
+            )
+        else:
+            self.bot.storage.create_list(user_id, list_name)
+            embed = discord.Embed(
+                title="Checklist Created ✅",
+                description=f"Successfully created a new checklist: **{list_name}**",
+                color=discord.Color.green()
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 
 async def setup(bot: BotBase) -> None:
     """
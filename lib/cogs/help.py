@@ -20,17 +20,20 @@ class Help(Cog):
         if command_name is None:
             help_message = "📜 **Available Commands:**\n"
             for command in self.bot.commands:
+                # Skip owner-only commands
+                if command.hidden:
+                    continue
                 # Omit usage details in the general help.
                 help_message += f"**{command.name}** - {command.help}\n"
             # add final prompt
             help_message += "\nType `@ToDoBot help <command>` for more details on a specific command."
             
-            await send_basic_message(self.bot.logger, ctx, help_message, wait=30)
+            await send_basic_message(self.bot, ctx, help_message, wait=30)
         else:
             # Try to retrieve the command by its name (case-insensitive).
             command = self.bot.get_command(command_name.lower())
             if command is None:
-                await send_basic_message(self.bot.logger, ctx, f"Command `{command_name}` not found.", wait=30)
+                await send_basic_message(self.bot, ctx, f"Command `{command_name}` not found.", wait=30)
             else:
                 # Build the help message for this command.
                 help_message = f"📜 **{command.name}**\n\n**Description:** {command.help}\n"
@@ -39,15 +42,9 @@ class Help(Cog):
                     help_message += "    *Usage*: @ToDoBot play <directory> <track_number> or @AudioBot play <track_name>\n"
                 elif command.name.lower() == "list":
                     help_message += "    *Usage*: @ToDoBot list <expand>\n"
-                await send_basic_message(self.bot.logger, ctx, help_message, wait=30)
+                await send_basic_message(self.bot, ctx, help_message, wait=30)
 
             
-    @Cog.listener()
-    async def on_ready(self: Cog) -> None:
-        # if bot is ready 
-        if not self.bot.ready:
-            # ready up cog
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
 
 
 async def setup(bot: BotBase) -> None:
@@ -1,9 +1,14 @@
 import os
 import discord
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
 from utils.funcs import *  # This imports send_basic_message and delete_messages among others
+from utils.paginator import MAX_EMBED, MAX_FIELDS, PageView, Paginator
+
+# Value shown under every checklist name
+FIELD_VALUE = "Use `@ToDoBot view` to see tasks."
 
 
 class List(Cog):
@@ -13,31 +18,51 @@ class List(Cog):
     def __init__(self, bot: BotBase) -> None:
         self.bot = bot
 
+    def list_pages(self, author, checklist_names: list) -> tuple:
+        """
+        First page embed of the user's checklists and the buttons for the others (None for a single page)
+        """
+        # One field per checklist, at most 25 fields and 6000 characters per embed
+        paginator = Paginator(
+            checklist_names, size=lambda list_name: len(list_name) + len(FIELD_VALUE),
+            max_size=MAX_EMBED - 100, max_items=MAX_FIELDS, separator=0
+        )
+
+        def render(page_index: int) -> discord.Embed:
+            embed = discord.Embed(
+                title="Your Checklists",
+                description="Here are all your checklists:",
+                color=discord.Color.green(),
+            )
+            for list_name in paginator.page(page_index):
+                embed.add_field(
+                    name=list_name, 
+                    value=FIELD_VALUE, 
+                    inline=False
+                )
+            if page_index > 0 or paginator.has_page(1):
+                embed.set_footer(text=paginator.label(page_index))
+            return embed
+
+        view = PageView(self, author, paginator, render) if paginator.has_page(1) else None
+        return render(0), view
+
     @command(name="lists", help="View all your checklists.")
     async def view_lists(self, ctx):
         logger = self.bot.logger
         try:
             user_id = str(ctx.author.id)
-            if user_id in self.bot.checklists and self.bot.checklists[user_id]:
-                embed = discord.Embed(
-                    title="Your Checklists",
-                    description="Here are all your checklists:",
-                    color=discord.Color.green(),
-                )
-                for list_name in self.bot.checklists[user_id].keys():
-                    embed.add_field(
-                        name=list_name, 
-                        value="Use `@ToDoBot view` to see tasks.", 
-                        inline=False
-                    )
-                await send_basic_message(logger, ctx, embed=embed, wait=60)
+            checklist_names = self.bot.storage.list_names(user_id)
+            if checklist_names:
+                embed, view = self.list_pages(ctx.author, checklist_names)
+                await send_basic_message(self.bot, ctx, embed=embed, wait=60, view=view)
             else:
                 embed = discord.Embed(
                     title="No Checklists 🛑",
                     description="You don't have any lists yet! Create one using `@ToDoBot create`.",
                     color=discord.Color.red(),
                 )
-                await send_basic_message(logger, ctx, embed=embed)
+                await send_basic_message(self.bot, ctx, embed=embed)
         except Exception as e:
             logger.error(f"Error in view_lists: {e}")
             error_embed = discord.Embed(
@@ -45,13 +70,26 @@ class List(Cog):
                 description="An error occurred while displaying your checklists.",
                 color=discord.Color.red(),
             )
-            await send_basic_message(logger, ctx, embed=error_embed)
+            await send_basic_message(self.bot, ctx, embed=error_embed)
+
+    @app_commands.command(name="lists", description="View all your checklists.")
+    @app_commands.guild_only()
+    async def view_lists_slash(self, interaction: discord.Interaction) -> None:
+        checklist_names = self.bot.storage.list_names(str(interaction.user.id))
+        if not checklist_names:
+            embed = discord.Embed(
+                title="No Checklists 🛑",
+                description="You don't have any lists yet! Create one using `/create`.",
+                color=discord.Color.red(),
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
 
-    @Cog.listener()
-    async def on_ready(self: Cog) -> None:
-        # If the bot is ready, ready up this cog.
-        if not self.bot.ready:
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+        embed, view = self.list_pages(interaction.user, checklist_names)
+        if view is None:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
 async def setup(bot: BotBase) -> None:
@@ -0,0 +1,75 @@
+import discord
+from discord.ext.commands import Bot as BotBase
+from discord.ext.commands import Cog, command
+
+from utils.funcs import send_basic_message
+
+# Most invocations one profile can aggregate
+MAX_RUNS = 100
+
+
+class Profile(Cog):
+    """
+    Cog that manages the owner-only command profiler.
+    """
+    def __init__(self, bot: BotBase) -> None:
+        self.bot = bot
+
+    # Command: Profile the next runs of a command (bot owner only)
+    @command(name="profile", hidden=True, help="Owner only: `profile <command> [runs]`, `profile off` or `profile`.")
+    async def profile_command(self, ctx, command_name: str = None, runs: int = 10):
+        if not await self.bot.is_owner(ctx.author):
+            embed = discord.Embed(
+                title="Owner Only 🛑",
+                description="Only the owner of the bot can profile commands.",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        profiler = self.bot.profiler
+        # Without arguments: report what is being profiled
+        if command_name is None:
+            if profiler.command is None:
+                description = "No command is being profiled."
+            else:
+                description = f"Profiling `{profiler.command}`: {profiler.runs} run(s) done, {profiler.remaining} to go."
+            embed = discord.Embed(title="Profiler ⏱️", description=description, color=discord.Color.blue())
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        # Stop early, keeping whatever was profiled so far
+        if command_name.lower() == "off":
+            path = await profiler.disarm()
+            description = f"Profiler disabled. Partial profile written to `{path}`." if path else "Profiler disabled."
+            embed = discord.Embed(title="Profiler ⏱️", description=description, color=discord.Color.blue())
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        target = self.bot.get_command(command_name.lower())
+        if target is None or target is ctx.command:
+            embed = discord.Embed(
+                title="Invalid Input ⚠️",
+                description=f"There is no command named `{command_name}` to profile.",
+                color=discord.Color.orange()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        runs = max(1, min(runs, MAX_RUNS))
+        profiler.arm(target.qualified_name, runs)
+        self.bot.logger.info(f"Profiling the next {runs} run(s) of {target.qualified_name}")
+        embed = discord.Embed(
+            title="Profiler ⏱️",
+            description=f"Profiling the next {runs} run(s) of `{target.qualified_name}`. "
+                        f"The profile will be written to `{profiler.directory}`.",
+            color=discord.Color.green()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+
+async def setup(bot: BotBase) -> None:
+    """
+    Adds the Profile cog to the bot.
+    """
+    await bot.add_cog(Profile(bot))
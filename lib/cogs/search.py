@@ -0,0 +1,92 @@
+import discord
+from discord import app_commands
+from discord.ext.commands import Bot as BotBase
+from discord.ext.commands import Cog, command
+
+from utils.funcs import *
+from utils.paginator import PageView, Paginator
+
+# Matches kept for paging through, the total is still reported
+MAX_RESULTS = 500
+
+
+class Search(Cog):
+    """
+    Cog that manages searching tasks across all checklists.
+    """
+    def __init__(self, bot: BotBase) -> None:
+        self.bot = bot
+
+    def result_pages(self, author, query: str, matches: list, total: int) -> tuple:
+        """
+        First page embed of the search results and the buttons for the others (None for a single page)
+        """
+        # One line per match: "**list** · N. task"
+        lines = [f"**{list_name}** · {position + 1}. {text}" for list_name, position, text in matches]
+        paginator = Paginator(lines, max_items=20)
+
+        def render(page_index: int) -> discord.Embed:
+            embed = discord.Embed(
+                title=f"Search Results for **{query[:100]}** 🔎",
+                description="\n".join(paginator.page(page_index)),
+                color=discord.Color.blue()
+            )
+            footer = f"{total} match(es)" + (f", showing the first {len(matches)}" if total > len(matches) else "")
+            if page_index > 0 or paginator.has_page(1):
+                footer = f"{paginator.label(page_index)} · {footer}"
+            embed.set_footer(text=footer)
+            return embed
+
+        view = PageView(self, author, paginator, render) if paginator.has_page(1) else None
+        return render(0), view
+
+    def no_results(self, query: str) -> discord.Embed:
+        return discord.Embed(
+            title="No Matches 🔎",
+            description=f"None of your tasks contain every word of **{query}**.",
+            color=discord.Color.orange()
+        )
+
+    @command(name="search", help="Find tasks containing every given word across your checklists: `search <words>`.")
+    async def search_tasks(self, ctx, *, query: str = None):
+        if not query or not query.strip():
+            embed = discord.Embed(
+                title="Invalid Input ⚠️",
+                description="Usage: `@ToDoBot search <words>`.",
+                color=discord.Color.orange()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        query = query.strip()
+        await self.bot.search.prepare(str(ctx.author.id))
+        matches, total = self.bot.search.search(str(ctx.author.id), query, limit=MAX_RESULTS)
+        if not matches:
+            await send_basic_message(self.bot, ctx, embed=self.no_results(query))
+            return
+
+        embed, view = self.result_pages(ctx.author, query, matches, total)
+        await send_basic_message(self.bot, ctx, embed=embed, wait=60, view=view)
+
+    @app_commands.command(name="search", description="Find tasks containing every given word across your checklists.")
+    @app_commands.describe(query="Words the tasks must contain")
+    @app_commands.guild_only()
+    async def search_tasks_slash(self, interaction: discord.Interaction, query: app_commands.Range[str, 1, 100]) -> None:
+        await self.bot.search.prepare(str(interaction.user.id))
+        matches, total = self.bot.search.search(str(interaction.user.id), query, limit=MAX_RESULTS)
+        if not matches:
+            await interaction.response.send_message(embed=self.no_results(query), ephemeral=True)
+            return
+
+        embed, view = self.result_pages(interaction.user, query, matches, total)
+        if view is None:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+
+async def setup(bot: BotBase) -> None:
+    """
+    Adds the Search cog to the bot.
+    """
+    await bot.add_cog(Search(bot))
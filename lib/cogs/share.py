@@ -2,11 +2,13 @@ import asyncio
 import os
 
 import discord
-from discord import FFmpegPCMAudio
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
 from utils.funcs import *
+from utils.inline import parse_share
+from utils.names import checklist_autocomplete, checklist_not_found
 
 
 class Share(Cog):
@@ -16,24 +18,34 @@ class Share(Cog):
     def __init__(self, bot: BotBase) -> None:
         self.bot = bot
 
-    @command(name="share", help="Share a checklist with multiple users interactively.")
-    async def share_checklist(self, ctx):
+    @command(name="share", help="Share a checklist with other users: `share <list> @user ...`, or interactively.", extras={"session": True})
+    async def share_checklist(self, ctx, *, args: str = None):
         prev_error_msg = None  # Track the previous error message
+
+        # Inline form: share with every mentioned user in one pass
+        if args:
+            parsed = parse_share(args)
+            if parsed is None:
+                await self.usage_error(ctx)
+            else:
+                await self.share_inline(ctx, str(ctx.author.id), *parsed)
+            return
+
         try:
             user_id = str(ctx.author.id)
 
             # Check if the user has any checklists
-            if user_id not in self.bot.checklists or not self.bot.checklists[user_id]:
+            checklist_names = self.bot.storage.list_names(user_id)
+            if not checklist_names:
                 embed = discord.Embed(
                     title="No Checklists Found 🛑",
                     description="You don't have any checklists. Please create one first using `@ToDoBot create`.",
                     color=discord.Color.red()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=embed)
+                await send_basic_message(self.bot, ctx, embed=embed)
                 return
 
-            # List the user's checklists and create reaction options
-            checklist_names = list(self.bot.checklists[user_id].keys())
+            # Create reaction options for the user's checklists
             reactions = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']  # Supports up to 10 checklists
 
             embed = discord.Embed(
@@ -57,14 +69,9 @@ class Share(Cog):
                 except Exception as e:
                     self.bot.logger.error(f"Error adding reaction {reactions[i]}: {e}")
 
-            def checklist_check(reaction, user):
-                return (user == ctx.author and 
-                        reaction.message.id == checklist_message.id and 
-                        reaction.emoji in reactions[:len(checklist_names)])
-
             try:
                 # Wait for the user to select a checklist
-                reaction, _ = await self.bot.wait_for('reaction_add', check=checklist_check, timeout=60.0)
+                reaction = await self.bot.router.reaction(checklist_message, ctx.author, reactions[:len(checklist_names)], timeout=60.0)
                 selected_index = reactions.index(reaction.emoji)
                 list_name = checklist_names[selected_index]
 
@@ -83,12 +90,9 @@ class Share(Cog):
                         self.bot.logger.error("Failed to send the mention prompt.")
                         return
 
-                    def mention_check(message):
-                        return message.author == ctx.author and message.channel == ctx.channel
-
                     try:
                         # Wait for the user to provide the mentions
-                        mention_response = await self.bot.wait_for('message', check=mention_check, timeout=60.0)
+                        mention_response = await self.bot.router.message(ctx.channel, ctx.author, timeout=60.0)
                         mentions = mention_response.content.split()
                         mentions = [mention for mention in mentions if mention.startswith("<@") and mention.endswith(">")]
                         
@@ -107,31 +111,19 @@ class Share(Cog):
                                 color=discord.Color.red()
                             )
                             prev_error_msg = await ctx.send(embed=error_embed)
-                            await delete_messages(self.bot.logger, mention_response, mention_message)
+                            await delete_messages(self.bot, mention_response, mention_message)
                             continue  # Restart the loop to allow the user to retry
 
-                        # Share the checklist with each mentioned user
-                        shared_with = []  # Users with whom sharing succeeded
-                        errors = []       # Users for which a conflict occurred
-
-                        for mention in mentions:
-                            # Extract the recipient's user ID from the mention format
-                            user_id_to_share = mention.strip("<@!>")
-                            recipient_id = str(user_id_to_share)
+                        # Extract the recipients' user IDs from the mention format
+                        recipient_ids = [str(mention.strip("<@!>")) for mention in mentions]
 
-                            # Initialize recipient's checklists if they don't exist
-                            if recipient_id not in self.bot.checklists:
-                                self.bot.checklists[recipient_id] = {}
+                        # Share with every recipient in a single journal record, skipping
+                        # those who already have a checklist with the same name
+                        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+                            recipients = transaction.share(recipient_ids)
 
-                            # If a checklist with the same name exists for the recipient, record an error
-                            if list_name in self.bot.checklists[recipient_id]:
-                                errors.append(mention)
-                            else:
-                                self.bot.checklists[recipient_id][list_name] = self.bot.checklists[user_id][list_name]
-                                shared_with.append(mention)
-
-                        # Save the updated checklist data
-                        save_checklists(self.bot.checklist_file_name, self.bot.checklists)
+                        shared_with = [mention for mention, recipient_id in zip(mentions, recipient_ids) if recipient_id in recipients]
+                        errors = [mention for mention, recipient_id in zip(mentions, recipient_ids) if recipient_id not in recipients]
 
                         # Provide feedback to the user
                         if shared_with:
@@ -140,8 +132,8 @@ class Share(Cog):
                                 description=f"Checklist **{list_name}** has been shared with the following users:\n{', '.join(shared_with)}",
                                 color=discord.Color.green()
                             )
-                            await send_basic_message(self.bot.logger, ctx, embed=shared_embed)
-                            await delete_messages(self.bot.logger, checklist_message, mention_message, mention_response)
+                            await send_basic_message(self.bot, ctx, embed=shared_embed)
+                            await delete_messages(self.bot, checklist_message, mention_message, mention_response)
                             
                         if errors:
                             error_embed = discord.Embed(
@@ -150,8 +142,8 @@ class Share(Cog):
                                             "{1}").format(list_name, ', '.join(errors)),
                                 color=discord.Color.red()
                             )
-                            await send_basic_message(self.bot.logger, ctx, embed=error_embed)
-                            await delete_messages(self.bot.logger, checklist_message, mention_message, mention_response)
+                            await send_basic_message(self.bot, ctx, embed=error_embed)
+                            await delete_messages(self.bot, checklist_message, mention_message, mention_response)
                             
                         return  
 
@@ -161,8 +153,8 @@ class Share(Cog):
                             description="You took too long to provide mentions.  Checklist sharing canceled..",
                             color=discord.Color.orange()
                         )
-                        await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                        await delete_messages(self.bot.logger, checklist_message, mention_message, prev_error_msg)
+                        await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                        await delete_messages(self.bot, checklist_message, mention_message, prev_error_msg)
                         self.bot.logger.error("Timeout during checklist sharing process.")
                         return 
 
@@ -172,8 +164,8 @@ class Share(Cog):
                     description="You took too long to select a checklist. Checklist sharing canceled.",
                     color=discord.Color.orange()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-                await delete_messages(self.bot.logger, checklist_message, prev_error_msg)
+                await send_basic_message(self.bot, ctx, embed=timeout_embed)
+                await delete_messages(self.bot, checklist_message, prev_error_msg)
                 self.bot.logger.error("Timeout during checklist sharing process.")
                 return
 
@@ -183,14 +175,88 @@ class Share(Cog):
                 description=f"An error occurred while sharing the checklist: {e}",
                 color=discord.Color.red()
             )
-            await send_basic_message(self.bot.logger, ctx, embed=error_embed)
+            await send_basic_message(self.bot, ctx, embed=error_embed)
             self.bot.logger.error(f"An error occurred in the 'share' command: {e}")
 
-    @Cog.listener()
-    async def on_ready(self) -> None:
-        # Ready up this cog when the bot is ready.
-        if not self.bot.ready:
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+    async def usage_error(self, ctx) -> None:
+        """
+        Reply with the inline syntax when the arguments can't be parsed
+        """
+        embed = discord.Embed(
+            title="Invalid Input ⚠️",
+            description="Usage: `@ToDoBot share <list> @user @user`, or `@ToDoBot share` alone to be guided step by step.",
+            color=discord.Color.orange()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def list_not_found(self, ctx, list_name: str) -> None:
+        """
+        Reply that an inline command named a checklist the user doesn't have
+        """
+        embed = discord.Embed(
+            title="Checklist Not Found 🛑",
+            description=f"You don't have a checklist named **{list_name}**.",
+            color=discord.Color.red()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    async def share_inline(self, ctx, user_id: str, list_name: str, recipient_ids: list) -> None:
+        """
+        Share the checklist named in the command with the mentioned users
+        """
+        if not self.bot.storage.has_list(user_id, list_name):
+            await self.list_not_found(ctx, list_name)
+            return
+
+        # Share with every recipient in a single journal record; users who
+        # already have a checklist with this name can't receive it
+        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+            recipients = transaction.share(recipient_ids)
+        conflicts = [recipient_id for recipient_id in recipient_ids if recipient_id not in recipients]
+
+        # One reply covering both outcomes
+        lines = []
+        if recipients:
+            lines.append(f"Checklist **{list_name}** has been shared with the following users:\n"
+                         + ", ".join(f"<@{recipient_id}>" for recipient_id in recipients))
+        if conflicts:
+            lines.append(f"Couldn't share **{list_name}** with the following user(s) due to a checklist name conflict:\n"
+                         + ", ".join(f"<@{recipient_id}>" for recipient_id in conflicts))
+        embed = discord.Embed(
+            title="Checklist Shared Successfully ✅" if recipients else "⚠️ Checklist Sharing Error",
+            description="\n\n".join(lines),
+            color=discord.Color.green() if recipients else discord.Color.red()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    @app_commands.command(name="share", description="Share a checklist with another user.")
+    @app_commands.describe(checklist="Checklist to share", member="User to share it with")
+    @app_commands.autocomplete(checklist=checklist_autocomplete)
+    @app_commands.guild_only()
+    async def share_checklist_slash(self, interaction: discord.Interaction, checklist: str, member: discord.Member) -> None:
+        user_id = str(interaction.user.id)
+        recipient_id = str(member.id)
+        if not self.bot.storage.has_list(user_id, checklist):
+            await interaction.response.send_message(embed=checklist_not_found(checklist), ephemeral=True)
+            return
+
+        # If a checklist with the same name exists for the recipient, report a conflict
+        async with self.bot.storage.transaction(user_id, checklist) as transaction:
+            shared = transaction.share([recipient_id])
+        if not shared:
+            embed = discord.Embed(
+                title="⚠️ Checklist Sharing Error",
+                description=f"Couldn't share **{checklist}** with {member.mention} due to a checklist name conflict.",
+                color=discord.Color.red()
+            )
+        else:
+            embed = discord.Embed(
+                title="Checklist Shared Successfully ✅",
+                description=f"Checklist **{checklist}** has been shared with {member.mention}.",
+                color=discord.Color.green()
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 
 async def setup(bot: BotBase) -> None:
     """
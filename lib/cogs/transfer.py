@@ -0,0 +1,143 @@
+import csv
+import os
+import re
+import tempfile
+
+import aiohttp
+import discord
+from discord.ext.commands import Bot as BotBase
+from discord.ext.commands import Cog, command
+
+from utils.funcs import delete_messages, send_basic_message
+from utils.transfer import EXTENSIONS, detect_format, export_lines, parse_stream
+
+# Bytes read from an attachment at a time
+CHUNK_SIZE = 64 * 1024
+# Largest attachment accepted for import
+MAX_IMPORT_BYTES = 8 * 1024 * 1024
+# Exports larger than this are spooled to disk instead of memory
+SPOOL_SIZE = 1024 * 1024
+# Format names accepted by the export command
+EXPORT_FORMATS = {"csv": "csv", "md": "markdown", "markdown": "markdown", "json": "json"}
+
+
+class Transfer(Cog):
+    """
+    Cog that manages importing and exporting tasks as file attachments.
+    """
+    def __init__(self, bot: BotBase) -> None:
+        self.bot = bot
+
+    @command(name="import", help="Import tasks from an attached CSV, Markdown or JSON file: `import [list]`.")
+    async def import_tasks(self, ctx, *, list_name: str = None):
+        user_id = str(ctx.author.id)
+
+        attachment = ctx.message.attachments[0] if ctx.message.attachments else None
+        fmt = detect_format(attachment.filename) if attachment else None
+        if fmt is None or attachment.size > MAX_IMPORT_BYTES:
+            embed = discord.Embed(
+                title="Invalid Input ⚠️",
+                description="Attach a `.csv`, `.md` or `.json` file of at most 8 MB and use `@ToDoBot import [list]`.\n"
+                            "CSV rows are `task,completed`, Markdown items are `- [x] task`, "
+                            "JSON is a list of `{\"task\": ..., \"completed\": ...}`.",
+                color=discord.Color.orange()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        # The file name names the checklist unless one is given
+        list_name = (list_name or os.path.splitext(attachment.filename)[0]).strip()
+
+        try:
+            tasks = await parse_stream(self.read_chunks(attachment), fmt)
+        except (ValueError, csv.Error, aiohttp.ClientError) as e:
+            self.bot.logger.error(f"Failed to import {attachment.filename}: {e}")
+            embed = discord.Embed(
+                title="Import Failed ⚠️",
+                description=f"Couldn't read **{attachment.filename}**: {e}",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        if not tasks:
+            embed = discord.Embed(
+                title="No Valid Tasks ⚠️",
+                description=f"No tasks were found in **{attachment.filename}**.",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        if not self.bot.storage.has_list(user_id, list_name):
+            self.bot.storage.create_list(user_id, list_name)
+        # The whole file is applied as one batched mutation
+        done = [position for position, (_, completed) in enumerate(tasks) if completed]
+        async with self.bot.storage.transaction(user_id, list_name) as transaction:
+            transaction.add_tasks([text for text, _ in tasks], done=done)
+
+        embed = discord.Embed(
+            title="Tasks Imported ✅",
+            description=f"Imported {len(tasks)} task(s) into **{list_name}** ({len(done)} completed).",
+            color=discord.Color.green()
+        )
+        await send_basic_message(self.bot, ctx, embed=embed)
+
+    @command(name="export", help="Export a checklist as a file: `export <list> [csv|md|json]`.")
+    async def export_tasks(self, ctx, *, args: str = None):
+        user_id = str(ctx.author.id)
+        if not args:
+            embed = discord.Embed(
+                title="Invalid Input ⚠️",
+                description="Usage: `@ToDoBot export <list> [csv|md|json]`.",
+                color=discord.Color.orange()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        # The format is an optional last word, CSV by default
+        list_name, _, fmt = args.strip().rpartition(" ")
+        if fmt.lower() in EXPORT_FORMATS and list_name:
+            fmt = EXPORT_FORMATS[fmt.lower()]
+        else:
+            list_name, fmt = args.strip(), "csv"
+
+        if not self.bot.storage.has_list(user_id, list_name):
+            embed = discord.Embed(
+                title="Checklist Not Found 🛑",
+                description=f"You don't have a checklist named **{list_name}**.",
+                color=discord.Color.red()
+            )
+            await send_basic_message(self.bot, ctx, embed=embed)
+            return
+
+        tasks = self.bot.storage.get_tasks(user_id, list_name)
+        # Lines are written as they are produced, large exports spill to disk
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE) as file:
+            for line in export_lines(tasks, fmt):
+                file.write(line.encode("utf-8"))
+            file.seek(0)
+            filename = (re.sub(r"[^\w\-]+", "_", list_name).strip("_") or "checklist") + EXTENSIONS[fmt]
+            await ctx.send(
+                content=f"📤 **{list_name}**: {len(tasks)} task(s)",
+                file=discord.File(file, filename=filename)
+            )
+        # Keep the file, only clean up the command
+        await delete_messages(self.bot, ctx.message, wait=15)
+
+    async def read_chunks(self, attachment: discord.Attachment):
+        """
+        Stream an attachment in chunks instead of reading it whole
+        """
+        async with aiohttp.ClientSession() as session:
+            async with session.get(attachment.url) as response:
+                response.raise_for_status()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    yield chunk
+
+
+async def setup(bot: BotBase) -> None:
+    """
+    Adds the Transfer cog to the bot.
+    """
+    await bot.add_cog(Transfer(bot))
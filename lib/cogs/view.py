@@ -2,10 +2,14 @@ import asyncio
 import os
 
 import discord
+from discord import app_commands
 from discord.ext.commands import Bot as BotBase
 from discord.ext.commands import Cog, command
 
 from utils.funcs import *
+from utils.names import checklist_autocomplete, checklist_not_found
+from utils.paginator import PageView, Paginator
+from utils.render import task_size
 
 
 class View(Cog):
@@ -15,22 +19,69 @@ class View(Cog):
     def __init__(self, bot: BotBase) -> None:
         self.bot = bot
 
-    @command(name="view", help="View tasks in a checklist interactively.")
+    def task_pages(self, author, user_id: str, list_name: str, tasks) -> tuple:
+        """
+        First page embed of a checklist and the buttons for the others (None for a single page)
+        """
+        storage = self.bot.storage
+        list_id = storage.list_id(user_id, list_name)
+        revision = storage.revisions.get(list_id, 0)
+        view = None
+
+        def paginate(tasks) -> Paginator:
+            # Pages are cut by rendered size, so long lists stay under the embed limit
+            return Paginator(range(len(tasks)), size=lambda index: task_size(index, tasks[index][0]))
+
+        paginator = paginate(tasks)
+
+        def render(page_index: int) -> discord.Embed:
+            nonlocal tasks, revision, paginator
+            # A page turn shows the checklist as it is now, not as it was when the command ran
+            if storage.revisions.get(list_id, 0) != revision:
+                tasks, revision = storage.get_tasks(user_id, list_name), storage.revisions.get(list_id, 0)
+                paginator = paginate(tasks)
+                if view is not None:
+                    view.paginator = paginator
+                    if not paginator.has_page(page_index):
+                        page_index = view.page_index = 0
+            if not tasks:
+                return discord.Embed(
+                    title=f"No Tasks in **{list_name}** 📋",
+                    description="This checklist was cleared in the meantime.",
+                    color=discord.Color.orange()
+                )
+            page = paginator.page(page_index)
+            embed = discord.Embed(
+                title=f"Tasks in **{list_name}**",
+                # Rendered lines are cached until the checklist changes
+                description=self.bot.renders.page(list_id, tasks, page[0], page[-1] + 1, revision),
+                color=discord.Color.blue()
+            )
+            footer = "✅ Task statuses displayed."
+            if page_index > 0 or paginator.has_page(1):
+                footer = f"{paginator.label(page_index)} · {footer}"
+            embed.set_footer(text=footer)
+            return embed
+
+        view = PageView(self, author, paginator, render) if paginator.has_page(1) else None
+        return render(0), view
+
+    @command(name="view", help="View tasks in a checklist interactively.", extras={"session": True})
     async def view_tasks(self, ctx):
         user_id = str(ctx.author.id)
 
         # Check if the user has any checklists
-        if user_id not in self.bot.checklists or not self.bot.checklists[user_id]:
+        checklist_names = self.bot.storage.list_names(user_id)
+        if not checklist_names:
             embed = discord.Embed(
                 title="No Checklists Found 🛑",
                 description="You don't have any checklists. Please create one first using `@ToDoBot create`.",
                 color=discord.Color.red()
             )
-            await send_basic_message(self.bot.logger, ctx, embed=embed)
+            await send_basic_message(self.bot, ctx, embed=embed)
             return
 
-        # List the checklists to choose from
-        checklist_names = list(self.bot.checklists[user_id].keys())
+        # Reactions for the checklists to choose from
         reactions = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']  # Supports up to 10 reactions
 
         embed = discord.Embed(
@@ -53,19 +104,12 @@ class View(Cog):
             except Exception as e:
                 self.bot.logger.error(f"Error adding reaction {reactions[i]}: {e}")
 
-        def checklist_check(reaction, user):
-            return (
-                user == ctx.author and 
-                reaction.message.id == checklist_message.id and 
-                reaction.emoji in reactions[:len(checklist_names)]
-            )
-
         try:
             # Wait for the user to select a checklist
-            reaction, _ = await self.bot.wait_for('reaction_add', check=checklist_check, timeout=60.0)
+            reaction = await self.bot.router.reaction(checklist_message, ctx.author, reactions[:len(checklist_names)], timeout=60.0)
             selected_index = reactions.index(reaction.emoji)
             list_name = checklist_names[selected_index]
-            tasks = self.bot.checklists[user_id][list_name]
+            tasks = self.bot.storage.get_tasks(user_id, list_name)
 
             if not tasks:
                 embed = discord.Embed(
@@ -73,24 +117,13 @@ class View(Cog):
                     description="This checklist has no tasks yet. Please add tasks using `@ToDoBot add`.",
                     color=discord.Color.orange()
                 )
-                await send_basic_message(self.bot.logger, ctx, embed=embed)
-                await delete_messages(self.bot.logger, checklist_message)
+                await send_basic_message(self.bot, ctx, embed=embed)
+                await delete_messages(self.bot, checklist_message)
                 return
 
-            # Prepare the task list for display
-            task_descriptions = [
-                f"{i + 1}. {'✅' if task['completed'] else '❌'} {task['task']}"
-                for i, task in enumerate(tasks)
-            ]
-
-            embed = discord.Embed(
-                title=f"Tasks in **{list_name}**",
-                description="\n".join(task_descriptions),
-                color=discord.Color.blue()
-            )
-            embed.set_footer(text="✅ Task statuses displayed.")
-            await send_basic_message(self.bot.logger, ctx, embed=embed, wait=60)
-            await delete_messages(self.bot.logger, checklist_message)
+            embed, view = self.task_pages(ctx.author, user_id, list_name, tasks)
+            await send_basic_message(self.bot, ctx, embed=embed, wait=60, view=view)
+            await delete_messages(self.bot, checklist_message)
             
 
         except asyncio.TimeoutError:
@@ -99,15 +132,35 @@ class View(Cog):
                 description="You took too long to respond. Task view canceled.",
                 color=discord.Color.orange()
             )
-            await send_basic_message(self.bot.logger, ctx, embed=timeout_embed)
-            await delete_messages(self.bot.logger, checklist_message)
+            await send_basic_message(self.bot, ctx, embed=timeout_embed)
+            await delete_messages(self.bot, checklist_message)
             self.bot.logger.error("Timeout during checklist selection for viewing tasks.")
 
-    @Cog.listener()
-    async def on_ready(self) -> None:
-        # Ready up the cog when the bot is ready.
-        if not self.bot.ready:
-            self.bot.cogs_ready.ready_up(__name__.split(".")[-1])
+    @app_commands.command(name="view", description="View the tasks in a checklist.")
+    @app_commands.describe(checklist="Checklist to view")
+    @app_commands.autocomplete(checklist=checklist_autocomplete)
+    @app_commands.guild_only()
+    async def view_tasks_slash(self, interaction: discord.Interaction, checklist: str) -> None:
+        user_id = str(interaction.user.id)
+        if not self.bot.storage.has_list(user_id, checklist):
+            await interaction.response.send_message(embed=checklist_not_found(checklist), ephemeral=True)
+            return
+
+        tasks = self.bot.storage.get_tasks(user_id, checklist)
+        if not tasks:
+            embed = discord.Embed(
+                title=f"No Tasks in **{checklist}** 📋",
+                description="This checklist has no tasks yet. Please add tasks using `/add`.",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        embed, view = self.task_pages(interaction.user, user_id, checklist, tasks)
+        if view is None:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
 async def setup(bot: BotBase) -> None:
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the bot's packages from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def scratch_directory(tmp_path, monkeypatch):
+    """
+    Run every test in its own directory, settings cache their values to data/ in it
+    """
+    monkeypatch.chdir(tmp_path)
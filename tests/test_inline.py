@@ -0,0 +1,41 @@
+import asyncio
+from collections import Counter
+
+from bench.e2e import BenchBot
+from bench.fakes import FakeContext, FakeGuild, FakeUser, snowflake
+from lib.cogs.check import Check
+from utils.inline import parse_check
+
+
+def test_parse_check_ranges():
+    assert parse_check("Groceries 1-3,8") == ("Groceries", [(0, 2), (7, 7)])
+    assert parse_check("Groceries 5-2") == ("Groceries", [(1, 4)])
+
+
+def test_parse_check_rejects_task_zero():
+    assert parse_check("Groceries 0") is None
+    assert parse_check("Groceries 0-3") is None
+
+
+def test_parse_check_leaves_huge_ranges_unexpanded():
+    assert parse_check("Groceries 1-20000000") == ("Groceries", [(0, 19999999)])
+
+
+def test_check_inline_out_of_range(tmp_path):
+    async def run() -> list:
+        guild = FakeGuild(Counter())
+        bot = BenchBot(str(tmp_path), "json", guild)
+        user = FakeUser(snowflake())
+        bot.storage.create_list(str(user.id), "Groceries")
+        bot.storage.add_tasks(str(user.id), "Groceries", ["milk", "eggs", "bread"])
+        check = Check(bot)
+        for args in ("Groceries 2-20000000", "Groceries 2-3"):
+            ctx = FakeContext(user, guild.channel, "check")
+            await check.check_inline(ctx, str(user.id), *parse_check(args))
+        tasks = list(bot.storage.get_tasks(str(user.id), "Groceries"))
+        await bot.deleter.close()
+        bot.storage.close()
+        return tasks
+
+    # The huge range is refused as a whole, the valid one applies
+    assert asyncio.run(run()) == [("milk", False), ("eggs", True), ("bread", True)]
@@ -0,0 +1,19 @@
+import asyncio
+from types import SimpleNamespace
+
+from lib.cogs.list import List
+from utils.metrics import Metrics
+from utils.paginator import PageView, Paginator
+
+
+def test_view_timeouts_are_counted_under_their_cog():
+    bot = SimpleNamespace()
+    bot.metrics = Metrics(bot)
+
+    async def run() -> None:
+        view = PageView(List(bot), SimpleNamespace(id=1), Paginator(["a", "b"], max_items=1), str)
+        # discord.py calls this from its own task, where no command's cog is set
+        await view.on_timeout()
+
+    asyncio.run(run())
+    assert bot.metrics.timeouts == {"List": 1}
@@ -0,0 +1,13 @@
+import asyncio
+from types import SimpleNamespace
+
+from utils.names import PrefixIndex, checklist_autocomplete
+
+
+def test_autocomplete_leaves_out_names_it_cannot_return():
+    long_name = "Groceries " + "x" * 100
+    storage = SimpleNamespace(list_names=lambda user_id: ["Groceries", long_name])
+    interaction = SimpleNamespace(client=SimpleNamespace(names=PrefixIndex(storage)), user=SimpleNamespace(id=1))
+    choices = asyncio.run(checklist_autocomplete(interaction, "groc"))
+    # Every value names an existing checklist
+    assert [(choice.name, choice.value) for choice in choices] == [("Groceries", "Groceries")]
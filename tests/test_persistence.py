@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import os
+
+from utils.persistence import Persistence
+from utils.storage import load_storage
+
+logger = logging.getLogger("tests")
+
+
+def failing_once(write):
+    """
+    Wrap a journal write so its first call raises like a full disk
+    """
+    calls = []
+
+    def wrapper(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OSError("No space left on device")
+        return write(*args)
+    return wrapper
+
+
+def run_with_failed_write(tmp_path, method: str, compact_every: int) -> list:
+    filename = os.path.join(tmp_path, "checklists.json")
+    storage = load_storage("json", filename, logger)
+    storage.journal.compact_every = compact_every
+    setattr(storage.journal, method, failing_once(getattr(storage.journal, method)))
+
+    async def run() -> None:
+        persistence = Persistence(storage.prepare_write, logger, window=0, write_failed=storage.write_failed)
+        storage.on_commit = persistence.mark_dirty
+        storage.create_list("1", "Groceries")
+        storage.add_tasks("1", "Groceries", ["milk", "eggs"])
+        # The first write fails, the retry scheduled after it succeeds
+        await persistence.flush()
+        storage.add_tasks("1", "Groceries", ["bread"])
+        await asyncio.sleep(0.05)
+        await persistence.flush()
+        assert not storage.journal.pending
+
+    asyncio.run(run())
+    storage.close()
+    reloaded = load_storage("json", filename, logger)
+    tasks = list(reloaded.get_tasks("1", "Groceries"))
+    reloaded.close()
+    return tasks
+
+
+def test_failed_log_append_is_retried(tmp_path):
+    assert run_with_failed_write(tmp_path, "write_records", 1000) == [("milk", False), ("eggs", False), ("bread", False)]
+
+
+def test_failed_compaction_is_retried(tmp_path):
+    assert run_with_failed_write(tmp_path, "write_snapshot", 1) == [("milk", False), ("eggs", False), ("bread", False)]
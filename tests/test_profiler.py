@@ -0,0 +1,24 @@
+import asyncio
+import logging
+import os
+
+from utils.profiler import Profiler
+
+
+def test_run_finishing_after_disarm_is_dropped(tmp_path):
+    profiler = Profiler(os.path.join(tmp_path, "profiles"), logging.getLogger("tests"))
+
+    async def run() -> None:
+        profiler.arm("check", 5)
+        release = asyncio.Event()
+        command = asyncio.create_task(profiler.run(release.wait()))
+        await asyncio.sleep(0)
+        # profile off while the command still runs
+        assert await profiler.disarm() is None
+        release.set()
+        await command
+        # A second profile off has nothing to write
+        assert await profiler.disarm() is None
+
+    asyncio.run(run())
+    assert not os.path.exists(os.path.join(tmp_path, "profiles"))
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+import os
+from types import SimpleNamespace
+
+from lib.cogs.view import View
+from utils.render import RenderCache
+from utils.storage import load_storage
+
+
+def wired_storage(tmp_path):
+    storage = load_storage("json", os.path.join(tmp_path, "checklists.json"), logging.getLogger("tests"))
+    renders = RenderCache()
+    storage.on_change = lambda op, list_id, index: renders.changed(op, list_id, index, storage.revisions[list_id])
+    storage.create_list("1", "Groceries")
+    return storage, renders
+
+
+def test_old_copy_does_not_fill_the_cache(tmp_path):
+    storage, renders = wired_storage(tmp_path)
+    storage.add_tasks("1", "Groceries", ["old A", "old B"])
+    list_id = storage.list_id("1", "Groceries")
+    old, old_revision = storage.get_tasks("1", "Groceries").copy(), storage.revisions[list_id]
+    assert renders.page(list_id, old, revision=old_revision) == "1. ❌ old A\n2. ❌ old B"
+
+    storage.clear_list("1", "Groceries")
+    # A view still open on the old copy turns a page
+    assert renders.page(list_id, old, revision=old_revision) == "1. ❌ old A\n2. ❌ old B"
+    storage.add_tasks("1", "Groceries", ["new X", "new Y", "new Z"])
+    tasks = storage.get_tasks("1", "Groceries")
+    assert renders.page(list_id, tasks, revision=storage.revisions[list_id]) == "1. ❌ new X\n2. ❌ new Y\n3. ❌ new Z"
+    storage.close()
+
+
+def test_page_view_shows_the_current_checklist(tmp_path):
+    storage, renders = wired_storage(tmp_path)
+    storage.add_tasks("1", "Groceries", [f"old task {index} " + "x" * 300 for index in range(30)])
+    cog = View(SimpleNamespace(storage=storage, renders=renders))
+
+    async def run() -> None:
+        embed, view = cog.task_pages(SimpleNamespace(id=1), "1", "Groceries", storage.get_tasks("1", "Groceries"))
+        assert view is not None
+        storage.clear_list("1", "Groceries")
+        storage.add_tasks("1", "Groceries", ["new task"])
+        embed = view.render(1)
+        assert embed.description == "1. ❌ new task"
+        assert view.page_index == 0
+
+    asyncio.run(run())
+    storage.close()
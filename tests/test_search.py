@@ -0,0 +1,42 @@
+import asyncio
+import logging
+import os
+
+import pytest
+
+from utils.search import SearchIndex
+from utils.storage import load_storage
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_index_follows_storage_without_rebuilding(tmp_path, backend):
+    storage = load_storage(backend, os.path.join(tmp_path, "checklists.json"), logging.getLogger("tests"))
+    index = SearchIndex(storage, chunk=2)
+    storage.create_list("1", "Chores")
+    storage.add_tasks("1", "Chores", ["wash car", "walk dog", "feed dog", "wash dishes", "dog food"])
+    storage.on_change, storage.on_list_added = index.changed, index.added
+
+    yields = 0
+
+    async def prepare() -> None:
+        nonlocal yields
+        task = asyncio.create_task(index.prepare("1"))
+        while not task.done():
+            yields += 1
+            await asyncio.sleep(0)
+
+    asyncio.run(prepare())
+    # Five tasks two at a time, handing the loop back in between
+    assert yields >= 3
+    assert index.search("1", "dog") == ([("Chores", 1, "walk dog"), ("Chores", 2, "feed dog"), ("Chores", 4, "dog food")], 3)
+
+    # From here the hooks keep the index current, searches never read storage
+    storage.create_list("1", "Errands")
+    storage.add_tasks("1", "Errands", ["buy dog food"])
+    storage.clear_list("1", "Chores")
+    storage.add_tasks("1", "Chores", ["dog walk"])
+    storage.task_texts = None
+    assert index.search("1", "dog food") == ([("Errands", 0, "buy dog food")], 1)
+    assert index.search("1", "dog") == ([("Chores", 0, "dog walk"), ("Errands", 0, "buy dog food")], 2)
+    del storage.task_texts
+    storage.close()
@@ -0,0 +1,44 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+from discord import InteractionType
+
+from utils.sessions import SessionManager
+
+
+def load_tree(monkeypatch):
+    """
+    The slash command tree; importing lib.bot creates the bot, which needs a token
+    """
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "fake")
+    return importlib.import_module("lib.bot").Tree
+
+
+def interaction(sessions: SessionManager, kind: InteractionType) -> SimpleNamespace:
+    command = SimpleNamespace(extras={"session": True}, binding=None, qualified_name="check")
+    return SimpleNamespace(
+        command=command,
+        type=kind,
+        extras={},
+        user=SimpleNamespace(id=1),
+        channel_id=2,
+        client=SimpleNamespace(sessions=sessions),
+    )
+
+
+def test_autocomplete_does_not_start_a_session(monkeypatch):
+    tree = load_tree(monkeypatch)
+    sessions = SessionManager()
+
+    async def run() -> None:
+        # The user has a /check board open in the channel
+        assert await tree.interaction_check(None, interaction(sessions, InteractionType.application_command))
+        board = dict(sessions.sessions)
+        # Typing in the checklist field of another /check
+        for _ in range(5):
+            assert await tree.interaction_check(None, interaction(sessions, InteractionType.autocomplete))
+        assert sessions.sessions == board
+        assert sessions.superseded == 0
+
+    asyncio.run(run())
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from utils.settings import Config, ConfigError
+
+TOKEN = "aaaabbbbccccddddeeeeffff0000"
+
+
+def test_token_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.delenv("DISCORD_BOT_TOKEN", raising=False)
+    config_file = os.path.join(tmp_path, "config.toml")
+    cache_file = os.path.join(tmp_path, "data", ".config.cache.json")
+    with open(config_file, "w") as file:
+        file.write(f'[General]\nDiscordBotToken = "{TOKEN}"\n\n[Settings]\nsave_window = 2.0\n')
+
+    config = Config(config_file=config_file, cache_file=cache_file)
+    assert config.get("General.DiscordBotToken") == TOKEN
+    with open(cache_file) as file:
+        cached = file.read()
+    assert TOKEN not in cached
+    assert "save_window" in cached
+
+    # Loaded from the cache, the token is read from config.toml again
+    config = Config(config_file=config_file, cache_file=cache_file)
+    assert config.get("Settings.save_window") == 2.0
+    assert config.get("General.DiscordBotToken") == TOKEN
+
+    # The environment still overrides it
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "environment" + TOKEN)
+    assert Config(config_file=config_file, cache_file=cache_file).get("General.DiscordBotToken") == "environment" + TOKEN
+    with open(cache_file) as file:
+        assert TOKEN not in file.read()
+
+
+def test_required_field_must_be_set(tmp_path, monkeypatch):
+    monkeypatch.delenv("DISCORD_BOT_TOKEN", raising=False)
+    config_file = os.path.join(tmp_path, "config.toml")
+    cache_file = os.path.join(tmp_path, "data", ".config.cache.json")
+    with open(config_file, "w") as file:
+        file.write("[Settings]\nsave_window = 2.0\n")
+
+    config = Config(config_file=config_file, cache_file=cache_file)
+    # Optional fields fall back to the default, the token is required
+    assert config.get("Settings.storage", "json") == "json"
+    with pytest.raises(ConfigError, match="General.DiscordBotToken .* not set"):
+        config.get("General.DiscordBotToken")
+
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", TOKEN)
+    assert config.get("General.DiscordBotToken") == TOKEN
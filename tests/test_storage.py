@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import os
+
+import pytest
+
+from utils.persistence import Persistence
+from utils.storage import load_storage
+
+logger = logging.getLogger("tests")
+
+
+@pytest.fixture(params=["json", "sqlite", "sharded"])
+def backend(request):
+    return request.param
+
+
+def test_backends_agree(tmp_path, backend):
+    filename = os.path.join(tmp_path, "checklists.json")
+    storage = load_storage(backend, filename, logger)
+    changes = []
+    storage.on_change = lambda op, list_id, index: changes.append((op, index))
+
+    async def run() -> None:
+        persistence = Persistence(storage.prepare_write, logger, window=0, write_failed=storage.write_failed)
+        storage.on_commit = persistence.mark_dirty
+        storage.create_list("1", "Groceries")
+        storage.add_tasks("1", "Groceries", ["milk", "eggs", "bread"])
+        storage.set_completed("1", "Groceries", 1, True)
+        storage.share_list("1", "Groceries", ["2"])
+        storage.create_list("2", "Work")
+        storage.add_tasks("2", "Work", ["report"], done=[0])
+        # Out of range positions fail without notifying anyone
+        for index in (3, -1):
+            with pytest.raises(IndexError):
+                storage.set_completed("2", "Groceries", index, True)
+        await persistence.flush()
+
+    asyncio.run(run())
+    assert changes == [("add", None), ("set", 1), ("add", None)]
+    assert storage.list_ids("2").keys() == {"Groceries", "Work"}
+    assert storage.task_texts(storage.list_id("2", "Groceries"), 1) == ["eggs", "bread"]
+    storage.close()
+
+    reloaded = load_storage(backend, filename, logger)
+    assert reloaded.list_names("2") == ["Groceries", "Work"]
+    assert list(reloaded.get_tasks("2", "Groceries")) == [("milk", False), ("eggs", True), ("bread", False)]
+    assert list(reloaded.get_tasks("2", "Work")) == [("report", True)]
+    assert reloaded.access(reloaded.list_id("1", "Groceries")) == {"owner": "1", "members": ["2"]}
+    reloaded.clear_list("2", "Groceries")
+    assert list(reloaded.get_tasks("1", "Groceries")) == []
+    reloaded.close()
+
+
+def test_sharded_counts_every_user(tmp_path):
+    storage = load_storage("sharded", os.path.join(tmp_path, "checklists.json"), logger)
+    storage.cache.capacity = 1
+    for user_id in ("1", "2", "3"):
+        storage.create_list(user_id, "Groceries")
+        storage.add_tasks(user_id, "Groceries", ["milk", "eggs"])
+    # Only the last user stays loaded, the user gauge still counts all of them
+    assert storage.counts() == {"users": 3, "resident_users": 1, "resident_tasks": 2}
+    storage.close()
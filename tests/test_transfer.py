@@ -0,0 +1,55 @@
+import asyncio
+import csv
+
+import pytest
+
+from utils.transfer import parse_stream
+
+
+async def chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def parse(text: str, size: int = 7) -> list:
+    return asyncio.run(parse_stream(chunks(text.encode(), size), "csv"))
+
+
+def test_csv_quoted_field_spanning_lines():
+    assert parse('task,completed\n"milk\nand eggs",true\nbread,false\n') == [("milk\nand eggs", True), ("bread", False)]
+
+
+def test_csv_stray_quote_in_unquoted_field():
+    # The quote is part of the text, later lines stay separate records
+    assert parse('12" pizza,true\nmilk,false\neggs\n') == [('12" pizza', True), ("milk", False), ("eggs", False)]
+
+
+def test_csv_unterminated_quote_is_an_error():
+    with pytest.raises(csv.Error):
+        parse('milk,true\n"eggs,false\nbread\n')
+
+
+def test_csv_malformed_quoting_is_an_error():
+    with pytest.raises(csv.Error):
+        parse('"milk"x,true\n')
+
+
+def parse_json(text: str, size: int = 5) -> list:
+    return asyncio.run(parse_stream(chunks(text.encode(), size), "json"))
+
+
+def test_json_elements_split_across_chunks():
+    text = '[{"task": "milk", "completed": true}, "eggs", {"task": "bread \\u00e9", "completed": false}, {"n": -1.5e3}]'
+    expected = [("milk", True), ("eggs", False), ("bread é", False)]
+    for size in (1, 2, 3, 7, 64):
+        assert parse_json(text, size) == expected
+
+
+def test_json_syntax_error_is_reported_where_it_is():
+    with pytest.raises(ValueError, match="Expecting value at character 10"):
+        parse_json('[{"task": bad}, "milk", "eggs", "bread", "butter"]')
+
+
+def test_json_element_size_is_capped():
+    with pytest.raises(ValueError, match="longer than"):
+        parse_json('["' + "x" * 100_000 + '"]', 4096)
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+class UserCache(MutableMapping):
+    """
+    Mapping of user id -> checklists that loads users on first access.
+
+    At most ``capacity`` users stay resident; the least recently used one
+    is handed to ``on_evict`` (so it can be written back) and dropped.
+    ``known`` is the collection of every user id that exists on disk and
+    is used for iteration and length without loading anything.
+    """
+    def __init__(self, load, known, capacity: int = 1000, on_evict=None) -> None:
+        # Loads a user's checklists from disk
+        self.load = load
+        # Every user id that can be loaded
+        self.known = known
+        # Maximum number of resident users
+        self.capacity = capacity
+        # Called with (user_id, checklists) before a user is dropped
+        self.on_evict = on_evict
+        # Resident users, least recently used first
+        self._data = OrderedDict()
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getitem__(self, user_id: str) -> dict:
+        if user_id in self._data:
+            self.hits += 1
+            self._data.move_to_end(user_id)
+            return self._data[user_id]
+        if user_id not in self.known:
+            raise KeyError(user_id)
+        self.misses += 1
+        value = self.load(user_id)
+        self._insert(user_id, value)
+        return value
+
+    def __setitem__(self, user_id: str, value: dict) -> None:
+        if user_id in self._data:
+            self._data[user_id] = value
+            self._data.move_to_end(user_id)
+        else:
+            self._insert(user_id, value)
+
+    def __delitem__(self, user_id: str) -> None:
+        del self._data[user_id]
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._data or user_id in self.known
+
+    def __iter__(self):
+        return iter(self.known)
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    def peek(self, user_id: str, default=None):
+        """
+        Return a resident user without loading it or touching the LRU order
+        """
+        return self._data.get(user_id, default)
+
+    def resident(self) -> list:
+        """
+        Values of the loaded users, without touching the LRU order
+        """
+        return list(self._data.values())
+
+    def stats(self) -> dict:
+        """
+        Cache counters for logging and metrics
+        """
+        return {
+            "resident": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _insert(self, user_id: str, value: dict) -> None:
+        self._data[user_id] = value
+        # Drop cold users once over capacity
+        while len(self._data) > self.capacity:
+            cold_id, cold_value = self._data.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(cold_id, cold_value)
@@ -0,0 +1,120 @@
+import base64
+import uuid
+
+
+class Checklist(object):
+    """
+    Compact task list: task texts in a list, completion state in a bitmap.
+
+    Iterating or indexing yields ``(text, completed)`` tuples. On disk a
+    checklist is stored column-wise as ``{"tasks": [...], "done": "<base64>"}``;
+    the legacy list of ``{"task": ..., "completed": ...}`` dicts is still read.
+    """
+    __slots__ = ("texts", "done")
+
+    def __init__(self, texts: list = None, done: bytearray = None) -> None:
+        # Task texts in checklist order
+        self.texts = texts if texts is not None else []
+        # One bit per task, least significant bit first
+        self.done = done if done is not None else bytearray((len(self.texts) + 7) >> 3)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self):
+        done = self.done
+        for index, text in enumerate(self.texts):
+            yield text, bool(done[index >> 3] & (1 << (index & 7)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [(self.texts[i], self.is_completed(i)) for i in range(*index.indices(len(self.texts)))]
+        if index < 0:
+            index += len(self.texts)
+        return self.texts[index], self.is_completed(index)
+
+    def is_completed(self, index: int) -> bool:
+        """
+        Completion state of one task
+        """
+        if not 0 <= index < len(self.texts):
+            raise IndexError(index)
+        return bool(self.done[index >> 3] & (1 << (index & 7)))
+
+    def set_completed(self, index: int, completed: bool) -> None:
+        """
+        Set the completion state of one task
+        """
+        if not 0 <= index < len(self.texts):
+            raise IndexError(index)
+        if completed:
+            self.done[index >> 3] |= 1 << (index & 7)
+        else:
+            self.done[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def extend(self, texts: list) -> None:
+        """
+        Append uncompleted tasks
+        """
+        self.texts.extend(texts)
+        # Grow the bitmap with zero (uncompleted) bits
+        missing = ((len(self.texts) + 7) >> 3) - len(self.done)
+        if missing > 0:
+            self.done.extend(bytes(missing))
+
+    def copy(self) -> "Checklist":
+        """
+        Independent copy, used to hand a consistent state to the writer
+        """
+        return Checklist(list(self.texts), bytearray(self.done))
+
+    def to_json(self) -> dict:
+        """
+        Columnar JSON form
+        """
+        return {"tasks": self.texts, "done": base64.b64encode(bytes(self.done)).decode("ascii")}
+
+    @classmethod
+    def from_json(cls, data) -> "Checklist":
+        """
+        Build a checklist from the columnar form or the legacy list of dicts
+        """
+        if isinstance(data, dict):
+            checklist = cls(list(data["tasks"]), bytearray(base64.b64decode(data["done"])))
+            # Tolerate a bitmap shorter than the task list
+            checklist.extend([])
+            return checklist
+        return cls.from_rows((task["task"], task["completed"]) for task in data)
+
+    @classmethod
+    def from_rows(cls, rows) -> "Checklist":
+        """
+        Build a checklist from ``(text, completed)`` pairs
+        """
+        checklist = cls()
+        for text, completed in rows:
+            checklist.extend([text])
+            if completed:
+                checklist.set_completed(len(checklist) - 1, True)
+        return checklist
+
+
+def new_list_id() -> str:
+    """
+    Stable id for a new checklist
+    """
+    return uuid.uuid4().hex
+
+
+def decode_lists(data: dict) -> dict:
+    """
+    Convert a ``{key: json}`` mapping into checklists
+    """
+    return {key: Checklist.from_json(tasks) for key, tasks in data.items()}
+
+
+def encode_lists(lists: dict) -> dict:
+    """
+    Convert a ``{key: Checklist}`` mapping into JSON data
+    """
+    return {key: checklist.copy().to_json() for key, checklist in lists.items()}
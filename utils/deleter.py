@@ -0,0 +1,174 @@
+import asyncio
+import math
+import os
+import time
+
+import discord
+
+from utils.funcs import load_json, save_checklists
+from utils.persistence import Persistence
+
+# Discord refuses to bulk delete messages older than 14 days
+BULK_DELETE_MAX_AGE = 14 * 24 * 60 * 60
+# Discord bulk deletes at most 100 messages per call
+BULK_DELETE_MAX_COUNT = 100
+
+
+class DeletionScheduler(object):
+    """
+    Bot-wide scheduler deleting messages once their deadline passes.
+
+    Commands register messages and return immediately instead of sleeping.
+    Deadlines sit in a hashed timer wheel of ``slots`` buckets, each
+    ``resolution`` seconds wide, so scheduling and expiring are O(1) per
+    message. Due messages are grouped per channel and removed with one
+    bulk delete where Discord allows it, falling back to single deletes.
+
+    Pending deletions are saved to ``filename`` so prompts left behind by
+    a restart are still removed.
+    """
+    def __init__(self, bot, filename: str, logger, resolution: float = 1.0, slots: int = 64) -> None:
+        self.bot = bot
+        self.filename = filename
+        self.logger = logger
+        # Seconds per wheel bucket
+        self.resolution = resolution
+        # Buckets of (channel id, message id) keys, indexed by tick modulo slots
+        self.wheel = [set() for _ in range(slots)]
+        # Next tick to expire
+        self.tick = math.floor(time.time() / resolution)
+        # (channel id, message id) -> deadline (epoch seconds)
+        self.pending = {}
+        # Number of delete requests sent, bulk or single
+        self.requests = 0
+        # Pending deletions are saved in the background like checklists
+        self.persistence = Persistence(self.prepare_write, logger, write_failed=self.write_failed)
+        self._dirty = False
+        self._task = None
+
+        # Restore deletions saved before the last shutdown
+        for channel_id, message_id, deadline in load_json(filename).get("pending", []):
+            self._add((channel_id, message_id), deadline)
+
+    def start(self) -> None:
+        """
+        Start expiring deadlines on the running loop
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self) -> None:
+        """
+        Stop the wheel and save what is still pending
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._dirty = True
+        await self.persistence.flush()
+
+    def schedule(self, *messages, wait: float = 1) -> None:
+        """
+        Delete messages ``wait`` seconds from now
+        """
+        deadline = time.time() + wait
+        for message in messages:
+            self._add((message.channel.id, message.id), deadline)
+        self._dirty = True
+        self.persistence.mark_dirty()
+
+    def prepare_write(self):
+        if not self._dirty:
+            return None
+        self._dirty = False
+        data = {"pending": [[channel_id, message_id, deadline] for (channel_id, message_id), deadline in self.pending.items()]}
+
+        def write() -> int:
+            save_checklists(self.filename, data)
+            return os.path.getsize(self.filename)
+        return write
+
+    def write_failed(self) -> None:
+        # The next write saves the whole pending set again
+        self._dirty = True
+
+    def expire(self, now: float) -> dict:
+        """
+        Advance the wheel to ``now`` and return due message ids grouped by channel
+        """
+        due = {}
+        current = math.floor(now / self.resolution)
+        while self.tick <= current:
+            bucket = self.wheel[self.tick % len(self.wheel)]
+            for key in list(bucket):
+                deadline = self.pending.get(key)
+                # A rescheduled message leaves a stale key in its old bucket
+                if deadline is None:
+                    bucket.discard(key)
+                # Keys further than one turn of the wheel stay for a later round
+                elif self._tick(deadline) <= self.tick:
+                    bucket.discard(key)
+                    del self.pending[key]
+                    due.setdefault(key[0], []).append(key[1])
+            self.tick += 1
+        if due:
+            self._dirty = True
+            self.persistence.mark_dirty()
+        return due
+
+    async def delete(self, channel_id: int, message_ids: list) -> None:
+        """
+        Delete messages of one channel, in bulk where possible
+        """
+        channel = self.bot.get_channel(channel_id)
+        oldest = time.time() - BULK_DELETE_MAX_AGE
+        # Only recent messages in guild channels can be bulk deleted
+        if hasattr(channel, "delete_messages"):
+            recent = [message_id for message_id in message_ids if discord.utils.snowflake_time(message_id).timestamp() > oldest]
+        else:
+            recent = []
+        bulk = set(recent)
+        single = [message_id for message_id in message_ids if message_id not in bulk]
+
+        for start in range(0, len(recent), BULK_DELETE_MAX_COUNT):
+            chunk = recent[start:start + BULK_DELETE_MAX_COUNT]
+            if len(chunk) == 1:
+                single.extend(chunk)
+                continue
+            try:
+                self.requests += 1
+                await channel.delete_messages([discord.Object(message_id) for message_id in chunk])
+            except discord.HTTPException as e:
+                self.logger.error(f"Bulk delete failed, deleting one by one: {e}")
+                single.extend(chunk)
+
+        if single:
+            partial = self.bot.get_partial_messageable(channel_id)
+            for message_id in single:
+                try:
+                    self.requests += 1
+                    await partial.get_partial_message(message_id).delete()
+                except discord.NotFound:
+                    self.logger.error("Message already deleted.")
+                except discord.Forbidden:
+                    self.logger.error("Bot does not have permission to delete the message.")
+                except Exception as e:
+                    self.logger.error(f"Error deleting message: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.resolution)
+            for channel_id, message_ids in self.expire(time.time()).items():
+                try:
+                    await self.delete(channel_id, message_ids)
+                except Exception as e:
+                    self.logger.error(f"Error deleting messages in channel {channel_id}: {e}", exc_info=True)
+
+    def _add(self, key: tuple, deadline: float) -> None:
+        # Overdue deadlines (restored after a restart) expire on the next tick
+        self.pending[key] = deadline
+        self.wheel[max(self._tick(deadline), self.tick) % len(self.wheel)].add(key)
+
+    def _tick(self, timestamp: float) -> int:
+        # A deadline belongs to the first tick at or after it
+        return math.ceil(timestamp / self.resolution)
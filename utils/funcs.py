@@ -1,5 +1,3 @@
-import asyncio
-import json
 import logging
 import os
 import platform
@@ -8,6 +6,9 @@ import coloredlogs
 import discord
 from discord.ext.commands import Bot as BotBase
 
+from utils.serializer import decode, get_serializer
+from utils.settings import ConfigError, get_config
+
 # Get the operating system name
 OS_NAME = platform.system().lower()
 
@@ -21,70 +22,64 @@ def convert_path_os(path: str) -> str:
 
 def load_json(filename: str) -> tuple:
 	"""
-	Load checklists from a JSON file
+	Load checklists from a file written by save_checklists, or a plain JSON file
 	"""
 	# Ensure the data directory exists
-	if not os.path.exists(filename.split('/')[0]):
-		os.makedirs(filename.split('/')[0])
+	directory = os.path.dirname(filename)
+	if directory and not os.path.exists(directory):
+		os.makedirs(directory)
 
 	# Load existing checklists from the file, or initialize an empty dictionary
 	if os.path.exists(filename):
-		with open(filename, "r") as file:
-			return json.load(file)
+		# The format header picks the decoder
+		with open(filename, "rb") as file:
+			return decode(file.read())
 	else:
 		return {}
 
 # Save checklists to the file
 def save_checklists(filename: str, checklists: tuple) -> None:
     """
-	Save checklists to a JSON file
+	Save checklists with the configured serializer
 	"""
-    with open(filename, "w") as filename:
-        json.dump(checklists, filename, indent=4)
+    data = get_serializer().encode(checklists)
+    # Write to a temporary file first so a crash never leaves a half-written snapshot
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "wb") as file:
+        file.write(data)
+    os.replace(tmp_filename, filename)
 
 
 """ ------------------------------------------ Message Handling Funcs ------------------------------------------------ """
 
-async def delete_messages(logger, *messages, wait: int = 1) -> None:
+async def delete_messages(bot, *messages, wait: int = 1) -> None:
     """
-    Deletes one or more messages after a specified delay.
+    Schedules one or more messages for deletion after a specified delay.
     """
+    # Skip messages that were never sent
+    messages = [message for message in messages if message is not None]
+
     # Check if the bot has the "Manage Messages" permission
     if messages and not messages[0].guild.me.guild_permissions.manage_messages:
-        logger.error("Bot does not have permission to delete messages.")
+        bot.logger.error("Bot does not have permission to delete messages.")
         return
 
-    # Wait for the specified delay
-    await asyncio.sleep(wait)
-
-    # Delete each message
-    for message in messages:
-        if message is None:
-            continue  # Skip if the message is None
-
-        try:
-            await message.delete()
-            # logger.info(f"Message deleted: {message.content}")
-        except discord.NotFound:
-            logger.error("Message already deleted.")
-        except discord.Forbidden:
-            logger.error("Bot does not have permission to delete the message.")
-        except Exception as e:
-            logger.error(f"Error deleting message: {e}")
+    # Hand the messages to the deletion scheduler instead of waiting here
+    bot.deleter.schedule(*messages, wait=wait)
             
-async def send_basic_message(logger, ctx, message_content = None, embed = None, wait: int = 15) -> None:
+async def send_basic_message(bot, ctx, message_content = None, embed = None, wait: int = 15, view = None) -> None:
 	"""
 	Sends a message and deletes the command and sent message after a specified delay.
 	"""
 	# Check if embed is provided
 	if embed:
-		# Send the embed
-		sent_message = await ctx.send(embed=embed)
+		# Send the embed, with its buttons if any
+		sent_message = await ctx.send(embed=embed, view=view) if view else await ctx.send(embed=embed)
 	else:
 		# Send the message
 		sent_message = await ctx.send(message_content)
 	# Delete the command and sent message after 15 seconds
-	await delete_messages(logger, ctx.message, sent_message, wait=wait)
+	await delete_messages(bot, ctx.message, sent_message, wait=wait)
 	# return the sent message
 	return sent_message
     
@@ -130,21 +125,24 @@ def load_logger() -> logging.Logger:
 	return logger
 
 
+def load_setting(name: str, default, cast=str):
+	"""
+	Load an optional setting from a TODOBOT_<NAME> environment variable, else the [Settings] table of config.toml
+	"""
+	return get_config().get(f"Settings.{name}", default, cast)
+
+
 def load_token(logger) -> str:
 	"""
 	Load discord bot token from environment variable or .toml file
 	"""
-	# Load bot token
-	DISCORD_TOKEN = os.getenv('DISCORD_BOT_TOKEN', None)
-
-	if DISCORD_TOKEN is None:
-		from utils import settings
-		try:
-			logger.info("Checking TOML configuration...")
-			DISCORD_TOKEN = settings.config["General"]["DiscordBotToken"]
-			logger.info(f"Bot token loaded: {DISCORD_TOKEN[:5]}...{DISCORD_TOKEN[-5:]}")
-		except (TypeError, AttributeError) as e:
-			logger.error("Failed to load bot token. Check your environment variable or .toml file.", exc_info=True)
-			raise
+	# Load bot token, DISCORD_BOT_TOKEN overrides config.toml; the template marks it required
+	try:
+		DISCORD_TOKEN = get_config().get("General.DiscordBotToken")
+	except ConfigError as e:
+		logger.error(f"Invalid configuration: {e}")
+		raise
+
+	logger.info(f"Bot token loaded: {DISCORD_TOKEN[:5]}...{DISCORD_TOKEN[-5:]}")
 
 	return DISCORD_TOKEN
\ No newline at end of file
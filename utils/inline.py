@@ -0,0 +1,56 @@
+import re
+
+# "<list name> <task numbers>", e.g. "Groceries 1-5,8"
+CHECK_SYNTAX = re.compile(r"(?P<name>.+?)\s+(?P<spec>\d+(?:\s*-\s*\d+)?(?:\s*,\s*\d+(?:\s*-\s*\d+)?)*)")
+# A user mention, "<@123>" or "<@!123>"
+MENTION = re.compile(r"<@!?(\d+)>")
+
+
+def split_tasks(text: str) -> list:
+    """
+    Comma-separated tasks, stripped and without empty entries
+    """
+    return [task.strip() for task in text.split(",") if task.strip()]
+
+
+def parse_add(args: str) -> tuple:
+    """
+    ``"<list>: task, task"`` -> (list name, tasks), or None without a colon
+    """
+    list_name, separator, tasks = args.partition(":")
+    if not separator or not list_name.strip():
+        return None
+    return list_name.strip(), split_tasks(tasks)
+
+
+def parse_check(args: str) -> tuple:
+    """
+    ``"<list> 1-5,8"`` -> (list name, sorted 0-based ``(first, last)`` ranges), or None
+
+    Ranges are left for the caller to clamp to the checklist, so a huge
+    one like ``1-20000000`` is never expanded. Task numbers start at 1.
+    """
+    match = CHECK_SYNTAX.fullmatch(args.strip())
+    if match is None:
+        return None
+    ranges = []
+    for part in match["spec"].split(","):
+        first, _, last = part.partition("-")
+        first = int(first)
+        last = int(last) if last.strip() else first
+        if min(first, last) < 1:
+            return None
+        # Accept reversed ranges such as 5-1
+        ranges.append((min(first, last) - 1, max(first, last) - 1))
+    return match["name"], sorted(ranges)
+
+
+def parse_share(args: str) -> tuple:
+    """
+    ``"<list> @a @b"`` -> (list name, recipient ids), or None without mentions
+    """
+    recipient_ids = list(dict.fromkeys(MENTION.findall(args)))
+    list_name = MENTION.sub("", args).strip()
+    if not recipient_ids or not list_name:
+        return None
+    return list_name, recipient_ids
@@ -0,0 +1,138 @@
+import json
+import os
+
+from utils.funcs import load_json, save_checklists
+
+
+class Journal(object):
+    """
+    Append-only write-ahead log in front of the checklist snapshot.
+
+    Every mutation is written as one small JSON line to ``<snapshot>.log``
+    instead of rewriting the whole snapshot. Once the log holds
+    ``compact_every`` records it is folded back into the snapshot.
+
+    The journal does not know the data model: ``load`` and ``prepare_write``
+    take a state object providing ``decode(data)``, ``apply(record)`` and
+    ``encode()``.
+    """
+    def __init__(self, filename: str, logger, compact_every: int = 1000, on_commit=None) -> None:
+        # Snapshot file
+        self.filename = filename
+        # Log file with one record per line
+        self.log_filename = f"{filename}.log"
+        self.logger = logger
+        # Number of records before the log is folded into the snapshot
+        self.compact_every = compact_every
+        # Called after every commit so the owner can schedule a write
+        self.on_commit = on_commit
+        # Records currently in the log (written or pending)
+        self.records = 0
+        # Records committed in memory but not yet written
+        self.pending = []
+        # Records taken by the write in flight and the count it reset, requeued if it fails
+        self._writing = None
+        # Open log handle
+        self._log = None
+
+    def load(self, state) -> None:
+        """
+        Load the snapshot into state and replay the log on top of it
+        """
+        state.decode(load_json(self.filename))
+
+        if os.path.exists(self.log_filename):
+            with open(self.log_filename, "r") as file:
+                for line_number, line in enumerate(file, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        state.apply(json.loads(line))
+                        self.records += 1
+                    except (ValueError, KeyError, IndexError) as e:
+                        # A torn last line is expected after a crash mid-write
+                        self.logger.error(f"Skipping journal record {line_number}: {e}")
+
+        # Start from a clean log if anything was replayed
+        if self.records:
+            self.logger.info(f"Replayed {self.records} journal records")
+            self.write_snapshot(state.encode())
+            self.records = 0
+
+    def commit(self, record: dict) -> None:
+        """
+        Queue an already applied record for the log
+        """
+        self.pending.append(record)
+        self.records += 1
+
+        if self.on_commit is not None:
+            self.on_commit()
+
+    def prepare_write(self, state):
+        """
+        Take the pending records and return a blocking write job, or None
+
+        Must be called on the event loop; the returned job is safe to run
+        in a worker thread because it only touches data captured here.
+        """
+        if not self.pending:
+            return None
+
+        records, self.pending = self.pending, []
+
+        # Fold the log into the snapshot once it grows large
+        if self.records >= self.compact_every:
+            # Encode the state now so the worker never sees a half-applied mutation
+            data = state.encode()
+            self._writing = (records, self.records)
+            self.records = 0
+            return lambda: self.write_snapshot(data)
+
+        self._writing = (records, 0)
+        return lambda: self.write_records(records)
+
+    def write_failed(self) -> None:
+        """
+        Put the records of a failed write back in front of the pending ones
+
+        Must be called on the event loop, before the next ``prepare_write``.
+        """
+        if self._writing is None:
+            return
+        records, reset = self._writing
+        self._writing = None
+        self.pending[:0] = records
+        # Records committed since a compaction reset the count are on top of it
+        self.records += reset
+
+    def write_records(self, records: list) -> int:
+        """
+        Append records to the log, returns the number of bytes written
+        """
+        # Lazily open the log in append mode
+        if self._log is None:
+            self._log = open(self.log_filename, "a")
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        self._log.write(data)
+        self._log.flush()
+        return len(data)
+
+    def write_snapshot(self, data: dict) -> int:
+        """
+        Write a fresh snapshot and truncate the log, returns the snapshot size
+        """
+        save_checklists(self.filename, data)
+        self.close()
+        open(self.log_filename, "w").close()
+        self.logger.info("Journal compacted")
+        return os.path.getsize(self.filename)
+
+    def close(self) -> None:
+        """
+        Close the log file handle
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
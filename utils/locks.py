@@ -0,0 +1,51 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class KeyedLocks(object):
+    """
+    One ``asyncio.Lock`` per key, created on first use.
+
+    A lock is dropped again once nobody holds or waits for it, so the
+    registry only grows with the sections currently running, not with
+    every checklist ever touched. Holding several keys takes them in
+    sorted order, which keeps two sections with overlapping keys from
+    deadlocking.
+    """
+    def __init__(self) -> None:
+        # Key -> [lock, sections holding or waiting for it]
+        self._entries = {}
+        # Acquisitions that had to wait for another section
+        self.contended = 0
+
+    @asynccontextmanager
+    async def hold(self, *keys):
+        keys = sorted(set(keys))
+        entries = []
+        for key in keys:
+            entry = self._entries.setdefault(key, [asyncio.Lock(), 0])
+            entry[1] += 1
+            entries.append((key, entry))
+        acquired = []
+        try:
+            for key, entry in entries:
+                # Another section holds the lock or is queued for it
+                if entry[1] > 1:
+                    self.contended += 1
+                await entry[0].acquire()
+                acquired.append(entry[0])
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            for key, entry in entries:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._entries[key]
+
+    def locked(self, key) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0].locked()
+
+    def __len__(self) -> int:
+        return len(self._entries)
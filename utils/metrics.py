@@ -0,0 +1,242 @@
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+import aiohttp
+from aiohttp import web
+
+# Upper bounds of the command latency buckets, in seconds
+COMMAND_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Upper bounds of the persistence write buckets, in seconds
+WRITE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Prometheus text exposition format
+# Storage gauges, keys of ``Storage.counts``; each backend reports the ones it counts cheaply
+STORAGE_GAUGES = {
+    "users": "Users with at least one checklist.",
+    "tasks": "Tasks held by the storage backend.",
+    "resident_users": "Users whose shard is loaded in memory.",
+    "resident_tasks": "Tasks of the users whose shard is loaded in memory.",
+}
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Cog of the command running in the current task, set when a command is invoked
+current_cog = ContextVar("current_cog", default="none")
+
+# Parts of a REST path that vary per request, replaced to keep the route label bounded
+_TOKEN = re.compile(r"/(interactions|webhooks)/\d+/[^/]+")
+_EMOJI = re.compile(r"/reactions/[^/]+")
+_ID = re.compile(r"/\d+")
+
+
+def route_name(path: str) -> str:
+    """
+    REST route of a request path: ``/api/v10/channels/1/messages/2`` -> ``/channels/:id/messages/:id``
+    """
+    path = path.split("/api/v", 1)[-1].partition("/")[2]
+    path = _TOKEN.sub(r"/\1/:id/:token", "/" + path)
+    path = _EMOJI.sub("/reactions/:emoji", path)
+    return _ID.sub("/:id", path)
+
+
+def escape(value: str) -> str:
+    """
+    Label value escaped for the text exposition format
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram(object):
+    """
+    Cumulative histogram over fixed bucket bounds
+    """
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple) -> None:
+        self.bounds = bounds
+        # One count per bound plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str = "") -> list:
+        """
+        ``_bucket``, ``_sum`` and ``_count`` samples; ``labels`` is a ``key="value"`` prefix or empty
+        """
+        separator = "," if labels else ""
+        lines, total = [], 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {total}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {total}")
+        return lines
+
+
+class Metrics(object):
+    """
+    Counters and histograms of the bot, served in the Prometheus text format.
+
+    Hot paths only increment counters or drop a value into a histogram
+    bucket. Gauges (waiting sessions, users and tasks) are read from the
+    bot when ``/metrics`` is scraped, so they cost nothing in between.
+    """
+    def __init__(self, bot) -> None:
+        self.bot = bot
+        # Command name -> latency histogram
+        self.commands = {}
+        # Cog name -> router waits that timed out
+        self.timeouts = Counter()
+        # (method, route, status) -> REST requests
+        self.rest = Counter()
+        # Background checklist writes
+        self.write_seconds = Histogram(WRITE_BUCKETS)
+        self.written_bytes = 0
+        self.started = time.time()
+        self._runner = None
+
+    def command_done(self, name: str, seconds: float) -> None:
+        """
+        Record the latency of one command invocation
+        """
+        histogram = self.commands.get(name)
+        if histogram is None:
+            histogram = self.commands[name] = Histogram(COMMAND_BUCKETS)
+        histogram.observe(seconds)
+
+    def timed_out(self, cog: str = None) -> None:
+        """
+        Record a wait that timed out, under ``cog`` or the cog of the running command
+
+        Views pass their cog: their callbacks run outside the command's context.
+        """
+        self.timeouts[cog or current_cog.get()] += 1
+
+    def written(self, seconds: float, size: int) -> None:
+        """
+        Record one background checklist write
+        """
+        self.write_seconds.observe(seconds)
+        self.written_bytes += size
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        aiohttp tracing that counts the REST requests of the Discord client
+        """
+        trace = aiohttp.TraceConfig()
+
+        async def request_end(session, context, params) -> None:
+            self.rest[(params.method, route_name(params.url.path), params.response.status)] += 1
+
+        trace.on_request_end.append(request_end)
+        return trace
+
+    def render(self) -> str:
+        """
+        Every metric in the text exposition format
+        """
+        lines = [
+            "# HELP todobot_command_seconds Command latency from invocation to return.",
+            "# TYPE todobot_command_seconds histogram",
+        ]
+        for name, histogram in sorted(self.commands.items()):
+            lines += histogram.lines("todobot_command_seconds", f'command="{escape(name)}"')
+
+        lines += [
+            "# HELP todobot_wait_timeouts_total Reactions and replies that were not given in time, per cog.",
+            "# TYPE todobot_wait_timeouts_total counter",
+        ]
+        lines += [f'todobot_wait_timeouts_total{{cog="{escape(cog)}"}} {count}' for cog, count in sorted(self.timeouts.items())]
+
+        lines += [
+            "# HELP todobot_rest_requests_total Discord REST requests by route and status.",
+            "# TYPE todobot_rest_requests_total counter",
+        ]
+        lines += [
+            f'todobot_rest_requests_total{{method="{method}",route="{escape(route)}",status="{status}"}} {count}'
+            for (method, route, status), count in sorted(self.rest.items())
+        ]
+
+        lines += [
+            "# HELP todobot_persist_write_seconds Duration of background checklist writes.",
+            "# TYPE todobot_persist_write_seconds histogram",
+        ]
+        lines += self.write_seconds.lines("todobot_persist_write_seconds")
+        lines += [
+            "# HELP todobot_persist_written_bytes_total Bytes written by background checklist writes.",
+            "# TYPE todobot_persist_written_bytes_total counter",
+            f"todobot_persist_written_bytes_total {self.written_bytes}",
+        ]
+
+        # Gauges are read at scrape time
+        counts = self.bot.storage.counts()
+        sessions = self.bot.sessions.counts()
+        lines += [
+            "# HELP todobot_interactive_sessions Sessions waiting for a reaction or reply.",
+            "# TYPE todobot_interactive_sessions gauge",
+            f"todobot_interactive_sessions {self.bot.router.pending}",
+            "# HELP todobot_live_sessions Interactive commands running, one at most per user and channel.",
+            "# TYPE todobot_live_sessions gauge",
+            f"todobot_live_sessions {sessions['sessions']}",
+            "# HELP todobot_session_users Users with at least one interactive command running.",
+            "# TYPE todobot_session_users gauge",
+            f"todobot_session_users {sessions['users']}",
+            "# HELP todobot_sessions_superseded_total Interactive commands cancelled by a newer one of the same user.",
+            "# TYPE todobot_sessions_superseded_total counter",
+            f"todobot_sessions_superseded_total {self.bot.sessions.superseded}",
+            "# HELP todobot_sessions_rejected_total Interactive commands refused at the session cap.",
+            "# TYPE todobot_sessions_rejected_total counter",
+            f"todobot_sessions_rejected_total {self.bot.sessions.rejected}",
+        ]
+        for name, value in counts.items():
+            lines += [
+                f"# HELP todobot_{name} {STORAGE_GAUGES[name]}",
+                f"# TYPE todobot_{name} gauge",
+                f"todobot_{name} {value}",
+            ]
+        lines += [
+            "# HELP todobot_checklist_locks Checklists with a transaction running or waiting.",
+            "# TYPE todobot_checklist_locks gauge",
+            f"todobot_checklist_locks {len(self.bot.storage.locks)}",
+            "# HELP todobot_checklist_lock_waits_total Transactions that waited for another one on the same checklist.",
+            "# TYPE todobot_checklist_lock_waits_total counter",
+            f"todobot_checklist_lock_waits_total {self.bot.storage.locks.contended}",
+            "# HELP todobot_startup_seconds Seconds from creating the bot to the end of each startup phase.",
+            "# TYPE todobot_startup_seconds gauge",
+        ]
+        lines += [f'todobot_startup_seconds{{phase="{phase}"}} {seconds}' for phase, seconds in self.bot.startup.items()]
+        lines += [
+            "# HELP todobot_start_time_seconds Start time of the bot since the epoch.",
+            "# TYPE todobot_start_time_seconds gauge",
+            f"todobot_start_time_seconds {self.started}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def start(self, host: str, port: int) -> None:
+        """
+        Serve ``/metrics`` on ``host:port`` unless already serving
+        """
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE, "Cache-Control": "no-store"})
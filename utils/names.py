@@ -0,0 +1,88 @@
+from bisect import bisect_left
+from collections import OrderedDict
+
+from discord import Color, Embed, Interaction, app_commands
+
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+# Longest name and value of a choice
+MAX_CHOICE_LENGTH = 100
+
+
+class PrefixIndex(object):
+    """
+    Per-user sorted array of checklist names for prefix lookups.
+
+    Names are kept sorted by their casefolded form, so completing a prefix
+    is a binary search plus a scan over the matches: O(log n + k) however
+    many checklists the user has. A user's names are loaded from storage
+    on first lookup and at most ``capacity`` users stay resident.
+    """
+    def __init__(self, storage, capacity: int = 10000) -> None:
+        self.storage = storage
+        self.capacity = capacity
+        # user id -> ([casefolded names], [names]), both in the same order
+        self._users = OrderedDict()
+
+    def complete(self, user_id: str, prefix: str, limit: int = MAX_CHOICES) -> list:
+        """
+        Up to ``limit`` of the user's checklist names starting with ``prefix``, ignoring case
+        """
+        keys, names = self._entry(user_id)
+        prefix = prefix.casefold()
+        matches = []
+        for position in range(bisect_left(keys, prefix), len(keys)):
+            if len(matches) == limit or not keys[position].startswith(prefix):
+                break
+            matches.append(names[position])
+        return matches
+
+    def added(self, user_id: str, list_name: str) -> None:
+        """
+        Record a checklist name the user gained (created or shared with them)
+        """
+        entry = self._users.get(user_id)
+        # Users not resident will read the new name from storage
+        if entry is None:
+            return
+        keys, names = entry
+        key = list_name.casefold()
+        position = bisect_left(keys, key)
+        # Names differing only in case share a key, keep every one of them
+        while position < len(keys) and keys[position] == key:
+            if names[position] == list_name:
+                return
+            position += 1
+        keys.insert(position, key)
+        names.insert(position, list_name)
+
+    def _entry(self, user_id: str) -> tuple:
+        entry = self._users.get(user_id)
+        if entry is not None:
+            self._users.move_to_end(user_id)
+            return entry
+        names = sorted(self.storage.list_names(user_id), key=str.casefold)
+        entry = self._users[user_id] = ([name.casefold() for name in names], names)
+        if len(self._users) > self.capacity:
+            self._users.popitem(last=False)
+        return entry
+
+
+async def checklist_autocomplete(interaction: Interaction, current: str) -> list:
+    """
+    Autocomplete for ``checklist`` parameters of the slash commands
+    """
+    names = interaction.client.names.complete(str(interaction.user.id), current)
+    # Choice values are capped at 100 characters, a truncated one would name no checklist
+    return [app_commands.Choice(name=name, value=name) for name in names if len(name) <= MAX_CHOICE_LENGTH]
+
+
+def checklist_not_found(list_name: str) -> Embed:
+    """
+    Error embed for a slash command naming a checklist the user doesn't have
+    """
+    return Embed(
+        title="Checklist Not Found 🛑",
+        description=f"You don't have a checklist named **{list_name}**. Create one first using `/create`.",
+        color=Color.red()
+    )
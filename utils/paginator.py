@@ -0,0 +1,128 @@
+import discord
+
+# Discord embed limits
+MAX_DESCRIPTION = 4096
+MAX_FIELDS = 25
+MAX_EMBED = 6000
+
+# Marks that no item is waiting for the next page
+_NOTHING = object()
+
+
+class Paginator(object):
+    """
+    Splits items into pages by their rendered size, one page at a time.
+
+    ``items`` is any iterable and ``size(item)`` its rendered length. A page
+    holds as many items as fit in ``max_size`` characters (counting
+    ``separator`` characters between items) and at most ``max_items``.
+    Pages are only cut when they are asked for, so paging through the
+    start of a 50k-task list never touches the rest of it. An item larger
+    than ``max_size`` gets a page of its own.
+    """
+    def __init__(self, items, size=len, max_size: int = MAX_DESCRIPTION, max_items: int = None, separator: int = 1) -> None:
+        self._items = iter(items)
+        self.size = size
+        self.max_size = max_size
+        self.max_items = max_items
+        self.separator = separator
+        # Items of every page cut so far
+        self.pages = []
+        # Whether every item has been placed on a page
+        self.exhausted = False
+        # Item that did not fit on the previous page
+        self._carry = _NOTHING
+
+    def page(self, index: int) -> list:
+        """
+        Items of a page, raises IndexError past the last page
+        """
+        if not self.has_page(index):
+            raise IndexError(index)
+        return self.pages[index]
+
+    def has_page(self, index: int) -> bool:
+        """
+        Whether page ``index`` exists, cutting pages up to it if needed
+        """
+        while len(self.pages) <= index and self._cut():
+            pass
+        return 0 <= index < len(self.pages)
+
+    def label(self, index: int) -> str:
+        """
+        Page position for footers; the total is shown once it is known
+        """
+        self.has_page(index + 1)
+        if self.exhausted:
+            return f"Page {index + 1}/{len(self.pages)}"
+        return f"Page {index + 1}"
+
+    def _cut(self) -> bool:
+        if self.exhausted:
+            return False
+        items, used = [], 0
+        while True:
+            if self._carry is not _NOTHING:
+                item, self._carry = self._carry, _NOTHING
+            else:
+                item = next(self._items, _NOTHING)
+                if item is _NOTHING:
+                    self.exhausted = True
+                    break
+            item_size = self.size(item) + (self.separator if items else 0)
+            # Leave the item for the next page once this one is full
+            if items and (used + item_size > self.max_size or len(items) == self.max_items):
+                self._carry = item
+                break
+            items.append(item)
+            used += item_size
+        if items:
+            self.pages.append(items)
+        return bool(items)
+
+
+class PageView(discord.ui.View):
+    """
+    Previous/next buttons flipping through the pages of a paginator.
+
+    ``render(page_index)`` builds the embed of a page. It may replace
+    ``paginator`` when the content changed, the buttons follow it. Only
+    ``author`` can flip pages. Timeouts are counted under ``cog``.
+    """
+    def __init__(self, cog, author, paginator: Paginator, render, timeout: float = 60.0) -> None:
+        super().__init__(timeout=timeout)
+        self.cog = cog
+        self.author = author
+        self.paginator = paginator
+        self.render = render
+        self.page_index = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Enable the buttons that lead to an existing page
+        """
+        self.previous_page.disabled = self.page_index == 0
+        self.next_page.disabled = not self.paginator.has_page(self.page_index + 1)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    async def on_timeout(self) -> None:
+        self.cog.bot.metrics.timed_out(self.cog.qualified_name)
+
+    @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.primary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self.turn_page(interaction, -1)
+
+    @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self.turn_page(interaction, 1)
+
+    async def turn_page(self, interaction: discord.Interaction, step: int) -> None:
+        if self.paginator.has_page(self.page_index + step):
+            self.page_index += step
+        embed = self.render(self.page_index)
+        self.refresh()
+        await interaction.response.edit_message(embed=embed, view=self)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+
+class Persistence(object):
+    """
+    Background writer that keeps disk I/O off the event loop.
+
+    Mutations only mark the state dirty. The first mark in a quiet period
+    schedules a write ``window`` seconds later, so a burst of mutations is
+    coalesced into a single write. The write itself runs in a thread executor.
+    A job that raises is handed back through ``write_failed`` so its state
+    can be requeued, and another write is scheduled to retry it.
+    """
+    def __init__(self, prepare_write, logger, window: float = 1.0, write_failed=None) -> None:
+        # Called on the loop, returns a blocking write job or None
+        self.prepare_write = prepare_write
+        # Called on the loop after a job raised, requeues what it took
+        self.write_failed = write_failed
+        self.logger = logger
+        # Seconds to wait for more mutations before writing
+        self.window = window
+        # Pending delayed write
+        self._timer = None
+        # Serializes writes so jobs never overlap
+        self._lock = asyncio.Lock()
+        # Number of completed disk writes
+        self.writes = 0
+        # Bytes and seconds spent by the last write
+        self.last_write_bytes = 0
+        self.last_write_seconds = 0.0
+        # Called on the loop with (seconds, bytes) after each background write
+        self.on_write = None
+
+    def mark_dirty(self) -> None:
+        """
+        Schedule a write unless one is already pending
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (scripts, startup), write immediately
+            self._run(self.prepare_write())
+            return
+
+        if self._timer is None or self._timer.done():
+            self._timer = loop.create_task(self._delayed_write())
+
+    async def flush(self) -> None:
+        """
+        Write all pending state now, used on shutdown and in tests
+        """
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        await self._write()
+
+    async def _delayed_write(self) -> None:
+        await asyncio.sleep(self.window)
+        # Let new mutations schedule another write while this one runs
+        self._timer = None
+        await self._write()
+
+    async def _write(self) -> None:
+        async with self._lock:
+            job = self.prepare_write()
+            if job is None:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._run, job)
+            except Exception as e:
+                self.logger.error(f"Failed to persist checklists: {e}", exc_info=True)
+                if self.write_failed is not None:
+                    self.write_failed()
+                    # Try again after the next window
+                    self.mark_dirty()
+                return
+            if self.on_write is not None:
+                self.on_write(self.last_write_seconds, self.last_write_bytes)
+
+    def _run(self, job) -> None:
+        if job is None:
+            return
+        start = time.perf_counter()
+        self.last_write_bytes = job() or 0
+        self.last_write_seconds = time.perf_counter() - start
+        self.writes += 1
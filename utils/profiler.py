@@ -0,0 +1,112 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import time
+
+# Functions listed in the text summary written next to each profile
+SUMMARY_LINES = 40
+
+
+class Profiler(object):
+    """
+    Profiles the next runs of one command and writes the aggregated profile.
+
+    ``Bot.invoke`` only compares the command name with ``command``, which is
+    None unless the owner armed the profiler, so nothing is paid otherwise.
+    cProfile follows the thread rather than the task: while a profiled
+    command awaits, whatever else the loop runs is recorded too. Runs are
+    profiled one at a time, a run overlapping another goes unprofiled.
+
+    Once ``runs`` invocations completed, the stats are written to
+    ``directory`` as ``<command>-<time>.prof`` (for ``pstats`` or snakeviz)
+    and a ``.txt`` summary sorted by cumulative time.
+    """
+    def __init__(self, directory: str, logger) -> None:
+        self.directory = directory
+        self.logger = logger
+        # Qualified name of the armed command, None when disabled
+        self.command = None
+        # Invocations left to profile
+        self.remaining = 0
+        # Invocations aggregated so far
+        self.runs = 0
+        self._stats = None
+        self._running = False
+        # Bumped by arm and disarm, so a run that outlives its profile is dropped
+        self._generation = 0
+
+    def arm(self, command: str, runs: int) -> None:
+        """
+        Profile the next ``runs`` invocations of ``command``, dropping any unfinished profile
+        """
+        self.command = command
+        self.remaining = runs
+        self.runs = 0
+        self._stats = None
+        self._generation += 1
+
+    async def disarm(self) -> str:
+        """
+        Stop profiling; returns the path of the partial profile, or None when nothing ran
+        """
+        self._generation += 1
+        path = await self._write() if self._stats is not None else None
+        self.command = None
+        self.remaining = 0
+        return path
+
+    async def run(self, coro) -> None:
+        """
+        Await a command invocation under the profiler
+        """
+        if self._running:
+            await coro
+            return
+
+        generation = self._generation
+        profile = cProfile.Profile()
+        self._running = True
+        profile.enable()
+        try:
+            await coro
+        finally:
+            profile.disable()
+            self._running = False
+            # The profile was stopped or re-armed while the command ran
+            if self._generation == generation:
+                self._add(profile)
+
+        if self.command is not None and self.remaining <= 0:
+            path = await self._write()
+            self.command = None
+            self.logger.info(f"Profile written to {path}")
+
+    def _add(self, profile: cProfile.Profile) -> None:
+        if self._stats is None:
+            self._stats = pstats.Stats(profile)
+        else:
+            self._stats.add(profile)
+        self.runs += 1
+        self.remaining -= 1
+
+    async def _write(self) -> str:
+        stats, command, runs = self._stats, self.command, self.runs
+        self._stats = None
+        name = f"{command.replace(' ', '_')}-{time.strftime('%Y%m%d-%H%M%S')}"
+        path = os.path.join(self.directory, f"{name}.prof")
+        # Stats files can be large, keep the dump off the loop
+        await asyncio.get_running_loop().run_in_executor(None, self._dump, stats, path, command, runs)
+        return path
+
+    def _dump(self, stats: pstats.Stats, path: str, command: str, runs: int) -> None:
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        stats.dump_stats(path)
+        summary = io.StringIO()
+        summary.write(f"{runs} run(s) of {command}\n\n")
+        stats.stream = summary
+        stats.sort_stats("cumulative").print_stats(SUMMARY_LINES)
+        with open(f"{path[:-5]}.txt", "w") as file:
+            file.write(summary.getvalue())
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+
+
+def render_task(index: int, text: str, completed: bool) -> str:
+    """
+    One numbered task line as shown in checklist embeds
+    """
+    return f"{index + 1}. {'✅' if completed else '❌'} {text}"
+
+
+def task_size(index: int, text: str) -> int:
+    """
+    Length of a rendered task line, without rendering it
+    """
+    # Number, ". ", status emoji and a space
+    return len(str(index + 1)) + 4 + len(text)
+
+
+class RenderCache(object):
+    """
+    Rendered task lines and page descriptions, per checklist id.
+
+    Lines are rendered once and joined into page descriptions on demand.
+    Storage mutations invalidate through ``changed``: toggling a task only
+    re-renders that line and drops the pages containing it, adding tasks
+    keeps every existing line and clearing drops the checklist. At most
+    ``capacity`` checklists are kept, least recently rendered first out.
+
+    Entries are tagged with the storage revision (``Storage.revisions``)
+    their lines show. Callers pass the revision their ``tasks`` were read
+    at, so a copy read before a change is rendered without touching the
+    cache instead of filling it with old lines.
+    """
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = capacity
+        # list id -> {"revision": int, "lines": [str], "stale": {index}, "pages": {(start, stop): str}}
+        self._lists = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def page(self, list_id: str, tasks, start: int = 0, stop: int = None, revision: int = 0) -> str:
+        """
+        Description for tasks ``start`` to ``stop`` of a checklist read at ``revision``
+        """
+        stop = len(tasks) if stop is None else min(stop, len(tasks))
+        entry = self._entry(list_id, revision)
+        if entry is None:
+            # A copy older than the cached lines
+            self.misses += 1
+            return "\n".join(render_task(index, *tasks[index]) for index in range(start, stop))
+        description = entry["pages"].get((start, stop))
+        if description is not None:
+            self.hits += 1
+            return description
+
+        self.misses += 1
+        lines = entry["lines"]
+        # Re-render toggled lines of the page
+        for index in [index for index in entry["stale"] if start <= index < min(stop, len(lines))]:
+            text, completed = tasks[index]
+            lines[index] = render_task(index, text, completed)
+            entry["stale"].discard(index)
+        # Render tasks not rendered yet
+        for index in range(len(lines), stop):
+            text, completed = tasks[index]
+            lines.append(render_task(index, text, completed))
+        description = "\n".join(lines[start:stop])
+        entry["pages"][(start, stop)] = description
+        return description
+
+    def changed(self, op: str, list_id: str, index: int = None, revision: int = None) -> None:
+        """
+        Invalidate after a storage mutation (``add``, ``set`` or ``clear``) that made ``revision``
+        """
+        entry = self._lists.get(list_id)
+        if entry is None:
+            return
+        # Lines only carry over from the revision right before the change
+        if op == "clear" or entry["revision"] + 1 != revision:
+            del self._lists[list_id]
+            return
+        entry["revision"] = revision
+        if op == "set":
+            if index < len(entry["lines"]):
+                entry["stale"].add(index)
+            # Only the pages showing the task are stale
+            for key in [key for key in entry["pages"] if key[0] <= index < key[1]]:
+                del entry["pages"][key]
+        else:
+            # Existing lines stay valid, pages ending at the old last task do not
+            entry["pages"].clear()
+
+    def _entry(self, list_id: str, revision: int) -> dict:
+        """
+        Entry of a checklist at ``revision``, or None when the cached one is newer
+        """
+        entry = self._lists.get(list_id)
+        if entry is not None and entry["revision"] > revision:
+            return None
+        if entry is None or entry["revision"] != revision:
+            entry = self._lists[list_id] = {"revision": revision, "lines": [], "stale": set(), "pages": {}}
+            if len(self._lists) > self.capacity:
+                self._lists.popitem(last=False)
+        self._lists.move_to_end(list_id)
+        return entry
@@ -0,0 +1,94 @@
+import asyncio
+
+from utils.sessions import current_session
+
+
+class Router(object):
+    """
+    Routes reactions and messages to the sessions waiting for them.
+
+    ``bot.wait_for`` runs every pending predicate on every event, so each
+    event costs O(open sessions). The router indexes waiters instead:
+    reactions by message id and messages by ``(channel_id, author_id)``,
+    so an event only looks at the sessions it can belong to.
+
+    A wait made by a superseded session raises ``asyncio.CancelledError``,
+    which ends its command quietly.
+    """
+    def __init__(self) -> None:
+        # message id -> [(user id, emojis, future)]
+        self._reactions = {}
+        # (channel id, author id) -> [(user id, None, future)]
+        self._messages = {}
+        # Called when a wait times out
+        self.on_timeout = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of sessions currently waiting
+        """
+        return sum(map(len, self._reactions.values())) + sum(map(len, self._messages.values()))
+
+    async def reaction(self, message, user, emojis: list, timeout: float = 60.0):
+        """
+        Wait for ``user`` to react to ``message`` with one of ``emojis``
+
+        Returns the reaction, raises ``asyncio.TimeoutError`` like ``wait_for``.
+        """
+        return await self._wait(self._reactions, message.id, user.id, frozenset(emojis), timeout)
+
+    async def message(self, channel, user, timeout: float = 60.0):
+        """
+        Wait for the next message ``user`` sends in ``channel``
+
+        Returns the message, raises ``asyncio.TimeoutError`` like ``wait_for``.
+        """
+        return await self._wait(self._messages, (channel.id, user.id), user.id, None, timeout)
+
+    def dispatch_reaction(self, reaction, user) -> None:
+        """
+        Hand a reaction to the session waiting on its message
+        """
+        waiters = self._reactions.get(reaction.message.id)
+        if waiters:
+            self._resolve(waiters, user.id, reaction.emoji, reaction)
+
+    def dispatch_message(self, message) -> None:
+        """
+        Hand a message to the sessions waiting on its author in its channel
+        """
+        waiters = self._messages.get((message.channel.id, message.author.id))
+        if waiters:
+            self._resolve(waiters, message.author.id, None, message)
+
+    @staticmethod
+    def _resolve(waiters: list, user_id: int, emoji, result) -> None:
+        for waiter_id, emojis, future in waiters:
+            if waiter_id == user_id and (emojis is None or emoji in emojis) and not future.done():
+                future.set_result(result)
+
+    async def _wait(self, index: dict, key, user_id: int, emojis, timeout: float):
+        session = current_session.get()
+        if session is not None and session.closed:
+            raise asyncio.CancelledError()
+        future = asyncio.get_running_loop().create_future()
+        waiter = (user_id, emojis, future)
+        index.setdefault(key, []).append(waiter)
+        if session is not None:
+            # Superseding the session cancels the future
+            session.waiting = future
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if self.on_timeout is not None:
+                self.on_timeout()
+            raise
+        finally:
+            if session is not None:
+                session.waiting = None
+            # Drop the waiter whether it was resolved, timed out or cancelled
+            waiters = index[key]
+            waiters.remove(waiter)
+            if not waiters:
+                del index[key]
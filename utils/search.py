@@ -0,0 +1,135 @@
+import asyncio
+import re
+from collections import OrderedDict
+from heapq import nsmallest
+from itertools import islice
+
+# Words of a task, letters and digits in any script
+TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> set:
+    """
+    Distinct casefolded words of a text
+    """
+    return set(TOKEN.findall(text.casefold()))
+
+
+class SearchIndex(object):
+    """
+    Inverted token index over task texts, one per checklist.
+
+    Each checklist id maps every token to the positions of the tasks
+    containing it, kept as dict keys in ascending order. Shared checklists
+    are indexed once and found through each member's name -> id map, so
+    sharing never copies postings. A query intersects the postings of its
+    tokens, smallest first, in each checklist the user can access.
+
+    Indexed checklists are kept current by the storage hooks: added tasks
+    are indexed as they are added, clearing empties the entry and new
+    checklists start empty. Checklists not resident yet (after a restart,
+    or evicted beyond ``capacity``) are filled by ``prepare`` a chunk at a
+    time, yielding to the event loop in between, so a first search over
+    100k tasks never stalls other commands.
+    """
+    def __init__(self, storage, capacity: int = 10000, chunk: int = 1000) -> None:
+        self.storage = storage
+        self.capacity = capacity
+        # Tasks indexed per step, a few milliseconds of work
+        self.chunk = chunk
+        # list id -> {"postings": {token: {position: None}}, "texts": [text], "complete": bool}
+        self._lists = OrderedDict()
+
+    async def prepare(self, user_id: str) -> None:
+        """
+        Index every checklist the user can access, yielding after each chunk
+        """
+        for list_id in self.storage.list_ids(user_id).values():
+            entry = self._entry(list_id)
+            # A clear resets the entry in place, so indexing just goes on from position 0
+            while not entry["complete"] and self._lists.get(list_id) is entry:
+                self._index(list_id, entry, self.chunk)
+                await asyncio.sleep(0)
+
+    def search(self, user_id: str, query: str, limit: int = None) -> tuple:
+        """
+        ``([(list name, position, text)], total)`` of the tasks containing every word of ``query``
+
+        Matches are ordered by checklist, then position; at most ``limit``
+        are returned but all of them are counted. Checklists ``prepare``
+        has not indexed yet are indexed here, in one go.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return [], 0
+        matches, total = [], 0
+        for list_name, list_id in self.storage.list_ids(user_id).items():
+            entry = self._entry(list_id)
+            if not entry["complete"]:
+                self._index(list_id, entry)
+            postings = [entry["postings"].get(token) for token in tokens]
+            if not all(postings):
+                continue
+            remaining = None if limit is None else limit - len(matches)
+            if len(postings) == 1:
+                # Postings are already in order, take the first ones
+                positions = postings[0]
+                first = islice(positions, remaining)
+            else:
+                postings.sort(key=len)
+                positions = postings[0].keys() & postings[1].keys()
+                for other in postings[2:]:
+                    positions &= other.keys()
+                # Only order as many positions as can still be returned
+                first = sorted(positions) if remaining is None else nsmallest(remaining, positions)
+            total += len(positions)
+            if remaining is None or remaining > 0:
+                texts = entry["texts"]
+                matches.extend((list_name, position, texts[position]) for position in first)
+        return matches, total
+
+    def changed(self, op: str, list_id: str, index: int = None) -> None:
+        """
+        Storage hook: index added tasks, empty cleared checklists
+        """
+        entry = self._lists.get(list_id)
+        if entry is None:
+            return
+        if op == "add":
+            # Large imports are left to the next ``prepare``
+            if entry["complete"]:
+                self._index(list_id, entry, self.chunk)
+        elif op == "clear":
+            entry["postings"].clear()
+            entry["texts"].clear()
+            entry["complete"] = True
+
+    def added(self, user_id: str, list_name: str) -> None:
+        """
+        Storage hook: start an entry for a checklist the user gained
+        """
+        list_id = self.storage.list_id(user_id, list_name)
+        if list_id not in self._lists:
+            # A new checklist is empty; one shared with the user is indexed on the next ``prepare``
+            self._index(list_id, self._entry(list_id), self.chunk)
+
+    def _entry(self, list_id: str) -> dict:
+        entry = self._lists.get(list_id)
+        if entry is None:
+            entry = self._lists[list_id] = {"postings": {}, "texts": [], "complete": False}
+            if len(self._lists) > self.capacity:
+                self._lists.popitem(last=False)
+        else:
+            self._lists.move_to_end(list_id)
+        return entry
+
+    def _index(self, list_id: str, entry: dict, count: int = None) -> None:
+        postings, texts = entry["postings"], entry["texts"]
+        # Tasks are only ever appended, index the ones after the last indexed position
+        start = len(texts)
+        added = self.storage.task_texts(list_id, start, None if count is None else start + count)
+        for position, text in enumerate(added, start):
+            for token in tokenize(text):
+                postings.setdefault(token, {})[position] = None
+        texts.extend(added)
+        entry["complete"] = count is None or len(added) < count
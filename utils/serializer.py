@@ -0,0 +1,104 @@
+import json
+
+from utils.settings import get_config
+
+# Optional: faster JSON encoding and decoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files written by a serializer start with this prefix, the format name and a newline
+HEADER = b"#todobot:"
+
+
+class Serializer(object):
+    """
+    Encodes data for one on-disk format, behind the format header
+    """
+    def __init__(self, name: str, file_format: str, dumps) -> None:
+        # Backend name, as selected in the settings
+        self.name = name
+        # Format recorded in the header, which picks the decoder
+        self.file_format = file_format
+        self.dumps = dumps
+        self._header = HEADER + file_format.encode() + b"\n"
+
+    def encode(self, data) -> bytes:
+        return self._header + self.dumps(data)
+
+
+def _json() -> Serializer:
+    # Compact stdlib JSON: no indentation, no spaces after separators
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    return Serializer("json", "json", lambda data: encoder.encode(data).encode())
+
+
+def _orjson() -> Serializer:
+    if orjson is None:
+        raise ImportError("orjson")
+    return Serializer("orjson", "json", orjson.dumps)
+
+
+def _msgpack() -> Serializer:
+    import msgpack
+    return Serializer("msgpack", "msgpack", lambda data: msgpack.packb(data, use_bin_type=True))
+
+
+# Backend name -> factory; orjson and msgpack are optional dependencies
+BACKENDS = {"json": _json, "orjson": _orjson, "msgpack": _msgpack}
+
+
+def load_serializer(name: str = "auto") -> Serializer:
+    """
+    Serializer for a backend name; ``auto`` picks orjson when installed, else compact JSON
+    """
+    if name == "auto":
+        return _json() if orjson is None else _orjson()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown serializer: {name}")
+    try:
+        return BACKENDS[name]()
+    except ImportError:
+        raise ValueError(f"The {name} serializer needs the {name} package: pip install {name}") from None
+
+
+def _loads_json(raw: bytes):
+    return json.loads(raw) if orjson is None else orjson.loads(raw)
+
+
+def _loads_msgpack(raw: bytes):
+    try:
+        import msgpack
+    except ImportError:
+        raise ValueError("This file was written with msgpack: pip install msgpack") from None
+    return msgpack.unpackb(raw, raw=False)
+
+
+# Header format -> decoder
+DECODERS = {b"json": _loads_json, b"msgpack": _loads_msgpack}
+
+
+def decode(raw: bytes):
+    """
+    Data of a file written by any serializer, or a plain JSON file written before the header existed
+    """
+    if raw.startswith(HEADER):
+        file_format, _, body = raw[len(HEADER):].partition(b"\n")
+        if file_format not in DECODERS:
+            raise ValueError(f"Unknown file format: {file_format.decode(errors='replace')}")
+        return DECODERS[file_format](body)
+    return _loads_json(raw)
+
+
+_serializer = None
+
+
+def get_serializer() -> Serializer:
+    """
+    The serializer selected in the settings, resolved on first use
+    """
+    global _serializer
+    if _serializer is None:
+        _serializer = load_serializer(get_config().get("Settings.serializer", "auto"))
+    return _serializer
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+from discord import Color, Embed
+
+# Session of the command running in the current task, for the router's waits
+current_session = ContextVar("current_session", default=None)
+
+
+class Session(object):
+    """
+    One live interactive command: the task running it and what it sent
+    """
+    __slots__ = ("user_id", "channel_id", "command", "task", "started", "message", "messages", "views", "interaction",
+                 "waiting", "closed")
+
+    def __init__(self, user_id: int, channel_id: int, command: str, task: asyncio.Task) -> None:
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.command = command
+        self.task = task
+        self.started = time.monotonic()
+        # Command message of a prefix command
+        self.message = None
+        # Prompts sent by the session, deleted if it is superseded
+        self.messages = []
+        # Component views of those prompts, stopped with it
+        self.views = []
+        # Interaction of a slash command
+        self.interaction = None
+        # Router future the session is waiting on, if any
+        self.waiting = None
+        # Set once a newer session superseded this one
+        self.closed = False
+
+
+class SessionManager(object):
+    """
+    Tracks the live interactive sessions by ``(user, channel)``.
+
+    A user has at most one session per channel: starting a command there
+    closes the one already running, whose prompts would otherwise wait
+    out their timeouts. Closing doesn't cancel the task outright, which
+    could interrupt it halfway through a request to Discord: its views
+    are stopped and its wait for a reply is cancelled, now or as soon
+    as it starts one. A user also has at most ``max_per_user`` sessions
+    across channels, the oldest giving way, and the bot runs at most
+    ``max_sessions`` in total; past that new sessions are refused rather
+    than closing other users' work. ``on_superseded`` is called with
+    each closed session so the bot can clean up its messages.
+    """
+    def __init__(self, max_sessions: int = 1000, max_per_user: int = 3) -> None:
+        self.max_sessions = max_sessions
+        self.max_per_user = max_per_user
+        # (user id, channel id) -> Session
+        self.sessions = {}
+        # User id -> {channel id: Session}, oldest first
+        self.users = {}
+        # Sessions closed by a newer one, and sessions refused at the cap
+        self.superseded = 0
+        self.rejected = 0
+        # Called with each superseded session once it was closed
+        self.on_superseded = None
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def start(self, user_id: int, channel_id: int, command: str) -> Session:
+        """
+        Register the current task as the user's session in the channel, or return None at the cap
+        """
+        previous = self.sessions.get((user_id, channel_id))
+        if previous is not None:
+            self.supersede(previous)
+        # Make room among the user's sessions in other channels
+        channels = self.users.get(user_id, {})
+        while len(channels) >= self.max_per_user:
+            self.supersede(next(iter(channels.values())))
+        if len(self.sessions) >= self.max_sessions:
+            self.rejected += 1
+            return None
+
+        session = Session(user_id, channel_id, command, asyncio.current_task())
+        self.sessions[(user_id, channel_id)] = session
+        self.users.setdefault(user_id, {})[channel_id] = session
+        return session
+
+    def end(self, session: Session) -> None:
+        """
+        Forget a session that finished, unless a newer one already replaced it
+        """
+        if self.sessions.get((session.user_id, session.channel_id)) is not session:
+            return
+        del self.sessions[(session.user_id, session.channel_id)]
+        channels = self.users[session.user_id]
+        del channels[session.channel_id]
+        if not channels:
+            del self.users[session.user_id]
+
+    def supersede(self, session: Session) -> None:
+        """
+        Close a session and hand it to ``on_superseded``
+        """
+        self.end(session)
+        self.superseded += 1
+        session.closed = True
+        if session.waiting is not None:
+            session.waiting.cancel()
+        for view in session.views:
+            view.stop()
+        if self.on_superseded is not None:
+            self.on_superseded(session)
+
+    def counts(self) -> dict:
+        """
+        Live sessions and the users they belong to, for metrics
+        """
+        return {"sessions": len(self.sessions), "users": len(self.users)}
+
+
+def sessions_full() -> Embed:
+    """
+    Error embed for a session refused because the bot runs as many as it allows
+    """
+    return Embed(
+        title="Too Many Sessions ⚠️",
+        description="I'm handling as many interactive commands as I can right now. Please try again in a minute, "
+                    "or use the one-line form of the command.",
+        color=Color.orange()
+    )
+
+
+def superseded() -> Embed:
+    """
+    Embed replacing the prompt of a slash command session closed by a newer one
+    """
+    return Embed(
+        title="Session Closed",
+        description="You started another command, so this one was closed.",
+        color=Color.light_grey()
+    )
@@ -1,255 +1,256 @@
+import json
+import os
 import re
-from pathlib import Path
-from typing import Dict, Tuple
 
-import toml
+# Keys of config.toml and the checks their values must pass
+TEMPLATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".config.template.toml")
+CONFIG_FILE = "config.toml"
+# Validated config.toml values, reused while neither file changes
+CACHE_FILE = "data/.config.cache.json"
+# Bumped when the cache layout changes
+CACHE_VERSION = 2
 
-config = dict  # autocomplete
 
+def parse_bool(value) -> bool:
+    """
+    Boolean from a TOML boolean or an environment string such as "1", "true" or "off"
+    """
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "on"):
+        return True
+    if text in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
 
-def crawl(obj: dict, func=lambda x, y: print(x, y, end="\n"), path=None):
-    if path is None:  # path Default argument value is mutable
-        path = []
-    for key in obj.keys():
-        if type(obj[key]) is dict:
-            crawl(obj[key], func, path + [key])
-            continue
-        func(path + [key], obj[key])
 
+# Type names allowed in the template
+TYPES = {"str": str, "int": int, "float": float, "bool": parse_bool}
+
+
+class ConfigError(ValueError):
+    """
+    A configuration value is missing or fails the checks of the template
+    """
+
+
+class Field(object):
+    """
+    Checks of one template key, compiled once: type, options, regex and bounds
+    """
+    __slots__ = ("path", "env", "cast", "optional", "secret", "options", "regex", "nmin", "nmax", "example", "explanation")
+
+    def __init__(self, path: str, checks: dict) -> None:
+        # Dotted path such as "General.DiscordBotToken"
+        self.path = path
+        section, _, key = path.partition(".")
+        self.env = checks.get("env") or f"TODOBOT_{key.upper()}"
+        self.cast = TYPES[checks.get("type", "str")]
+        # Required fields raise ``ConfigError`` when read while set nowhere
+        self.optional = checks.get("optional", False)
+        # Secrets are never written to the cache
+        self.secret = checks.get("secret", False)
+        self.options = checks.get("options")
+        self.regex = re.compile(checks["regex"]) if "regex" in checks else None
+        self.nmin = checks.get("nmin")
+        self.nmax = checks.get("nmax")
+        self.example = checks.get("example")
+        self.explanation = checks.get("explanation", "")
+
+    def check(self, value, source: str):
+        """
+        Cast and validate a value, raising ``ConfigError`` naming where it came from
+        """
+        try:
+            value = self.cast(value)
+        except (TypeError, ValueError):
+            raise ConfigError(self.problem(source, f"expected {self.cast.__name__}, got {value!r}")) from None
+        if self.options is not None and value not in self.options:
+            raise ConfigError(self.problem(source, f"must be one of {', '.join(map(str, self.options))}"))
+        if self.regex is not None and self.regex.match(value) is None:
+            raise ConfigError(self.problem(source, f"does not match {self.regex.pattern}"))
+        # Bounds apply to the length of strings and the value of numbers
+        size = len(value) if isinstance(value, str) else value
+        if (self.nmin is not None and size < self.nmin) or (self.nmax is not None and size > self.nmax):
+            raise ConfigError(self.problem(source, f"out of bounds ({self.nmin} to {self.nmax})"))
+        return value
+
+    def problem(self, source: str, message: str) -> str:
+        example = f" Example: {self.example}" if self.example is not None else ""
+        explanation = f" ({self.explanation})" if self.explanation else ""
+        return f"{self.path}{explanation} from {source}: {message}.{example}"
+
+
+class Config(object):
+    """
+    Settings layered from environment variables over config.toml.
+
+    The template is compiled into ``Field`` checks and config.toml is
+    parsed and validated once per process. The validated values are kept
+    in ``CACHE_FILE`` with the sizes and modification times of both files,
+    so later boots skip the TOML parser until one of them changes. Keys
+    marked ``secret`` in the template, such as the bot token, are left out
+    of the cache and read from config.toml again only when their
+    environment variable isn't set. Nothing
+    prompts on stdin and config.toml is never written: a missing file is an
+    empty layer, an invalid value raises ``ConfigError``, and so does reading
+    a field the template doesn't mark ``optional`` when neither layer sets it.
+    """
+    def __init__(self, config_file: str = CONFIG_FILE, template_file: str = TEMPLATE_FILE, cache_file: str = CACHE_FILE) -> None:
+        self.config_file = config_file
+        self.template_file = template_file
+        self.cache_file = cache_file
+        key = [os.path.abspath(template_file), file_stamp(template_file), os.path.abspath(config_file), file_stamp(config_file)]
+        cached = self._read_cache(key)
+        # Whether the secrets of config.toml are in ``values``
+        self._secrets_loaded = cached is None
+        if cached is None:
+            cached = {"version": CACHE_VERSION, "key": key, **self._parse()}
+            self._write_cache(cached)
+        # Dotted path -> compiled checks
+        self.fields = {path: Field(path, checks) for path, checks in cached["template"].items()}
+        # Dotted path -> validated config.toml value
+        self.values = cached["values"]
+
+    def get(self, path: str, default=None, cast=str):
+        """
+        Value of a dotted path: its environment variable, else config.toml, else ``default``
 
-def check(value, checks, name):
+        Required fields have no default, reading one that is not set raises ``ConfigError``.
+        """
+        field = self.fields.get(path)
+        env = field.env if field is not None else f"TODOBOT_{path.rpartition('.')[2].upper()}"
+        value = os.getenv(env)
+        if value is not None:
+            return field.check(value, env) if field is not None else cast(value)
+        if field is not None and field.secret and not self._secrets_loaded:
+            self._load_secrets()
+        if path not in self.values and field is not None and not field.optional:
+            raise ConfigError(field.problem(f"{env} or {self.config_file}", "not set"))
+        return self.values.get(path, default)
 
-    def get_check_value(key, default_result):
-        return checks[key] if key in checks else default_result
+    def _parse(self) -> dict:
+        template = flatten(read_toml(self.template_file))
+        fields = {path: Field(path, checks) for path, checks in template.items()}
+        values = {}
+        if os.path.exists(self.config_file):
+            for path, value in flatten(read_toml(self.config_file), leaves=True).items():
+                field = fields.get(path)
+                values[path] = field.check(value, self.config_file) if field is not None else value
+        return {"template": template, "values": values}
 
-    incorrect = False
-    if value == {}:
-        incorrect = True
-    if not incorrect and "type" in checks:
+    def _load_secrets(self) -> None:
+        values = self._parse()["values"]
+        self.values.update((path, values[path]) for path, field in self.fields.items() if field.secret and path in values)
+        self._secrets_loaded = True
+
+    def _read_cache(self, key: list):
+        try:
+            with open(self.cache_file, "r") as file:
+                cached = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if cached.get("version") != CACHE_VERSION or cached.get("key") != key:
+            return None
+        return cached
+
+    def _write_cache(self, cached: dict) -> None:
+        secrets = {path for path, checks in cached["template"].items() if checks.get("secret", False)}
+        cached = {**cached, "values": {path: value for path, value in cached["values"].items() if path not in secrets}}
+        # A read-only data directory only costs the TOML parse on every boot
         try:
-            value = eval(checks["type"])(value)
-        except:
-            incorrect = True
-    # FAILSTATE Value is not one of the options
-    if not incorrect and "options" in checks and value not in checks["options"]:
-        incorrect = True
-    # FAILSTATE Value doesn't match regex, or has regex but is not a string.
-    if (
-        not incorrect
-        and "regex" in checks
-        and (
-            (isinstance(value, str) and re.match(checks["regex"], value) is None)
-            or not isinstance(value, str)
-        )
-    ):
-        incorrect = True
-
-    if (
-        not incorrect
-        and not hasattr(value, "__iter__")
-        and (
-            ("nmin" in checks and checks["nmin"] is not None and value < checks["nmin"])
-            or (
-                "nmax" in checks
-                and checks["nmax"] is not None
-                and value > checks["nmax"]
-            )
-        )
-    ):
-        incorrect = True
-    if (
-        not incorrect
-        and hasattr(value, "__iter__")
-        and (
-            (
-                "nmin" in checks
-                and checks["nmin"] is not None
-                and len(value) < checks["nmin"]
-            )
-            or (
-                "nmax" in checks
-                and checks["nmax"] is not None
-                and len(value) > checks["nmax"]
-            )
-        )
-    ):
-        incorrect = True
-
-    if incorrect:
-        value = handle_input(
-            message=(
-                (
-                    ("\nExample: " + str(checks["example"]) + "\n")
-                    if "example" in checks
-                    else ""
-                )
-                + ("Non-optional ", "Optional ")[
-                    "optional" in checks and checks["optional"] is True
-                ]
-            )
-            + str(name),
-            extra_info=get_check_value("explanation", ""),
-            check_type=eval(get_check_value("type", "False")),
-            default=get_check_value("default", NotImplemented),
-            match=get_check_value("regex", ""),
-            err_message=get_check_value("input_error", "Incorrect input"),
-            nmin=get_check_value("nmin", None),
-            nmax=get_check_value("nmax", None),
-            oob_error=get_check_value(
-                "oob_error", "Input out of bounds(Value too high/low/long/short)"
-            ),
-            options=get_check_value("options", None),
-            optional=get_check_value("optional", False),
-        )
-    return value
-
-
-def handle_input(
-    message: str = "",
-    check_type=False,
-    match: str = "",
-    err_message: str = "",
-    nmin=None,
-    nmax=None,
-    oob_error="",
-    extra_info="",
-    options: list = None,
-    default=NotImplemented,
-    optional=False,
-):
-    if optional:
-        print(message + "\nThis is an optional value. Do you want to skip it? (y/n)")
-        if input().casefold().startswith("y"):
-            return default if default is not NotImplemented else ""
-    if default is not NotImplemented:
-        print(
-            message
-            + '\nThe default value is "'
-            + str(default)
-            + '"\nDo you want to use it?(y/n)'
-        )
-        if input().casefold().startswith("y"):
-            return default
-    if options is None:
-        match = re.compile(match)
-        print(extra_info)
-        while True:
-            print(message + "=", end="")
-            user_input = input("").strip()
-            if check_type is not False:
-                try:
-                    user_input = check_type(user_input)
-                    if (nmin is not None and user_input < nmin) or (
-                        nmax is not None and user_input > nmax
-                    ):
-                        # FAILSTATE Input out of bounds
-                        print(oob_error)
-                        continue
-                    break  # Successful type conversion and number in bounds
-                except ValueError:
-                    # Type conversion failed
-                    print(err_message)
-                    continue
-            elif match != "" and re.match(match, user_input) is None:
-                print(+err_message + "\nAre you absolutely sure it's correct?(y/n)")
-                if input().casefold().startswith("y"):
-                    break
-                continue
-            else:
-                # FAILSTATE Input STRING out of bounds
-                if (nmin is not None and len(user_input) < nmin) or (
-                    nmax is not None and len(user_input) > nmax
-                ):
-                    print(oob_error)
-                    continue
-                break  # SUCCESS Input STRING in bounds
-        return user_input
-    print(extra_info)
-    while True:
-        print(message, end="")
-        user_input = input("").strip()
-        if check_type is not False:
-            try:
-                isinstance(eval(user_input), check_type)
-                return check_type(user_input)
-            except:
-                print(
-                    err_message
-                    + "\nValid options are: "
-                    + ", ".join(map(str, options))
-                    + "."
-                )
-                continue
-        if user_input in options:
-            return user_input
-        print(
-            err_message + "\nValid options are: " + ", ".join(map(str, options)) + "."
-        )
-
-
-def crawl_and_check(obj: dict, path: list, checks: dict = {}, name=""):
-    if len(path) == 0:
-        return check(obj, checks, name)
-    if path[0] not in obj.keys():
-        obj[path[0]] = {}
-    obj[path[0]] = crawl_and_check(obj[path[0]], path[1:], checks, path[0])
-    return obj
-
-
-def check_vars(path, checks):
-    global config
-    crawl_and_check(config, path, checks)
-
-
-def check_toml(template_file, config_file) -> Tuple[bool, Dict]:
-    global config, check_vars
-    config = None
-
-    # attempt to load template file
+            directory = os.path.dirname(self.cache_file)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            tmp_filename = f"{self.cache_file}.tmp"
+            with open(tmp_filename, "w") as file:
+                json.dump(cached, file)
+            os.replace(tmp_filename, self.cache_file)
+        except OSError:
+            pass
+
+
+def file_stamp(filename: str) -> list:
+    """
+    Size and modification time of a file, or None when it doesn't exist
+    """
     try:
-        template = toml.load(template_file)
-    except Exception as error:
-        print(f"Encountered error when trying to to load {template_file}: {error}")
-        print(error)
-        return False
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
 
-    # attempt to config template file
+def read_toml(filename: str) -> dict:
+    """
+    Parse a TOML file with tomllib where available (3.11+), else the toml package
+    """
     try:
-        config = toml.load(config_file)
-    # if file can't be read
-    except toml.TomlDecodeError:
-        print(f"""Couldn't read {config_file}.Overwrite it?(y/n)""")
-        # attempt to overwrite config file
-        if not input().startswith("y"):
-            print("Unable to read config, and not allowed to overwrite it. Giving up.")
-            return False
+        import tomllib
+    except ImportError:
+        import toml
+        try:
+            return toml.load(filename)
+        except toml.TomlDecodeError as e:
+            raise ConfigError(f"Couldn't read {filename}: {e}") from None
+    with open(filename, "rb") as file:
+        try:
+            return tomllib.load(file)
+        except tomllib.TOMLDecodeError as e:
+            raise ConfigError(f"Couldn't read {filename}: {e}") from None
+
+
+def flatten(data: dict, leaves: bool = False, prefix: str = "") -> dict:
+    """
+    Dotted paths of a TOML document: ``{"General": {"Key": x}}`` -> ``{"General.Key": x}``
+
+    Template entries are tables of checks, so without ``leaves`` the
+    flattening stops at the second level.
+    """
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and (leaves or not prefix):
+            flat.update(flatten(value, leaves, f"{path}."))
         else:
-            try:
-                with open(config_file, "w") as f:
-                    f.write("")
-            except:
-                print(
-                    f"Failed to overwrite {config_file}. Giving up.\nSuggestion: check {config_file} permissions for the user."
-                )
-                return False
-    # if file isn't found
-    except FileNotFoundError:
-        print(f"""Couldn't find {config_file} Creating it now.""")
+            flat[path] = value
+    return flat
+
+
+_config = None
+
+
+def get_config() -> Config:
+    """
+    The process-wide configuration, loaded on first use
+    """
+    global _config
+    if _config is None:
+        _config = Config()
+    return _config
+
+
+def reset() -> None:
+    """
+    Forget the loaded configuration, for scripts that change the environment or files
+    """
+    global _config
+    _config = None
+
+
+if __name__ == "__main__":
+    # Validate config.toml and the environment, and show the effective values
+    config = get_config()
+    problems = []
+    for path, field in config.fields.items():
         try:
-            with open(config_file, "x") as f:
-                f.write("")
-            config = {}
-        except:
-            print(
-                f"Failed to write to {config_file}. Giving up.\nSuggestion: check the folder's permissions for the user."
-            )
-            return False
-
-    crawl(template, check_vars)
-    with open(config_file, "w") as f:
-        toml.dump(config, f)
-    return config
-
-
-directory = Path().absolute()
-check_toml(f"{directory}/utils/.config.template.toml", "config.toml")
+            value = config.get(path)
+        except ConfigError as e:
+            problems.append(str(e))
+            continue
+        if value is not None and field.path == "General.DiscordBotToken":
+            value = f"{value[:5]}...{value[-5:]}"
+        print(f"{path:<28} {field.env:<24} {value!r}")
+    if problems:
+        raise SystemExit("\n".join(problems))
@@ -0,0 +1,301 @@
+import os
+import sys
+from collections.abc import MutableMapping
+
+from utils.cache import UserCache
+from utils.checklist import decode_lists, encode_lists
+from utils.funcs import load_json, save_checklists
+from utils.journal import Journal
+from utils.storage import JsonStorage, MemoryStorage, encode_acl, upgrade_legacy
+
+
+class ShardedStorage(MemoryStorage):
+    """
+    Checklists persisted as one JSON file per user.
+
+    A shard holds the user's name -> id map and the checklists the user
+    owns: ``{"lists": {...}, "owned": {list_id: checklist}}``. ``index.json``
+    maps user ids to their shard file, so users are found without listing
+    the directory, and ``acl.json`` holds the access-control index.
+
+    Shards are loaded on first access into an LRU of at most ``cache_size``
+    users. A write only serializes the shards touched since the previous
+    write.
+    """
+    def __init__(self, directory: str, logger, json_filename: str = None, cache_size: int = 1000) -> None:
+        super().__init__(logger)
+        self.directory = directory
+        self.index_filename = os.path.join(directory, "index.json")
+        self.acl_filename = os.path.join(directory, "acl.json")
+        # Ensure the shard directory exists
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Split the monolithic file the first time the sharded layout is used
+        if not os.path.exists(self.index_filename) and json_filename:
+            count = split_shards(json_filename, directory, logger)
+            if count:
+                logger.info(f"Split {json_filename} into {count} user shards")
+        # Shards written before checklists had ids have no access-control index
+        elif os.path.exists(self.index_filename) and not os.path.exists(self.acl_filename):
+            upgrade_shards(directory, logger)
+
+        # Shard index: user id -> shard file name
+        self.index = load_json(self.index_filename)
+        # Access-control index, small enough to keep resident
+        self.acl = load_json(self.acl_filename)
+        # Users are loaded lazily and evicted when cold
+        self.cache = UserCache(self._load_shard, self.index, cache_size, on_evict=self._evicted_user)
+        self.users = ShardUsers(self.cache)
+        self.lists = ShardLists(self.cache, self.acl)
+        # Users changed since the last write
+        self._dirty = set()
+        # Dirty users evicted before their shard was written
+        self._evicted = {}
+        # Whether the index or access-control index changed since the last write
+        self._index_dirty = False
+        self._acl_dirty = False
+        # Encoded users and indexes of the write in flight, requeued if it fails
+        self._writing = None
+
+    def counts(self) -> dict:
+        # Every user has an index entry; tasks are only counted in the resident
+        # shards, counting them all would load every shard
+        shards = self.cache.resident()
+        return {
+            "users": len(self.index),
+            "resident_users": len(shards),
+            "resident_tasks": sum(len(checklist) for shard in shards for checklist in shard["owned"].values()),
+        }
+
+    def prepare_write(self):
+        if not self._dirty and not self._acl_dirty:
+            return None
+
+        dirty, self._dirty = self._dirty, set()
+        # Encode the touched users on the loop, the worker only sees the copies
+        encoded = {}
+        for user_id in dirty:
+            if user_id in self._evicted:
+                shard = self._evicted.pop(user_id)
+            else:
+                shard = self.cache.peek(user_id)
+            encoded[user_id] = encode_shard(shard)
+        shards = {self.index[user_id]: data for user_id, data in encoded.items()}
+        index = dict(self.index) if self._index_dirty else None
+        acl = encode_acl(self.acl) if self._acl_dirty else None
+        self._index_dirty = self._acl_dirty = False
+        self._writing = (encoded, index is not None, acl is not None)
+        return lambda: self._write_shards(shards, index, acl)
+
+    def write_failed(self) -> None:
+        if self._writing is None:
+            return
+        encoded, index, acl = self._writing
+        self._writing = None
+        for user_id, data in encoded.items():
+            # A user evicted since keeps its unwritten shard like any dirty user
+            if self.cache.peek(user_id) is None and user_id not in self._evicted:
+                self._evicted[user_id] = decode_shard(data)
+            self._dirty.add(user_id)
+        self._index_dirty |= index
+        self._acl_dirty |= acl
+
+    def _commit(self, op: str, user_id: str, list_name: str, **fields) -> None:
+        record = {"op": op, "user": user_id, "list": list_name, **fields}
+        if op == "create":
+            touched = [user_id]
+            self._acl_dirty = True
+        elif op == "share":
+            touched = record["recipients"]
+            self._acl_dirty = True
+        else:
+            # Task changes only touch the shard of the owner
+            touched = [self.acl[self.users[user_id][list_name]]["owner"]]
+
+        # Mark shards dirty before applying, so a user evicted while the
+        # record is applied keeps its change until the next write
+        for touched_id in touched:
+            if touched_id not in self.index:
+                # New users load as an empty shard
+                self.index[touched_id] = shard_filename(touched_id)
+                self._index_dirty = True
+            self._dirty.add(touched_id)
+
+        self.apply(record)
+        self._committed()
+
+    def _load_shard(self, user_id: str) -> dict:
+        # A dirty user that was evicted is newer than its shard on disk
+        if user_id in self._evicted:
+            return self._evicted.pop(user_id)
+        return decode_shard(load_json(os.path.join(self.directory, self.index[user_id])))
+
+    def _evicted_user(self, user_id: str, shard: dict) -> None:
+        # Keep unwritten changes until the next write picks them up
+        if user_id in self._dirty:
+            self._evicted[user_id] = shard
+
+    def _write_shards(self, shards: dict, index: dict, acl: dict) -> int:
+        written = 0
+        for shard, data in shards.items():
+            path = os.path.join(self.directory, shard)
+            save_checklists(path, data)
+            written += os.path.getsize(path)
+        # Indexes are written last so they never point at a missing shard
+        for filename, data in ((self.acl_filename, acl), (self.index_filename, index)):
+            if data is not None:
+                save_checklists(filename, data)
+                written += os.path.getsize(filename)
+        return written
+
+
+class ShardUsers(MutableMapping):
+    """
+    User id -> {list name -> list id}, backed by the shard cache
+    """
+    def __init__(self, cache: UserCache) -> None:
+        self.cache = cache
+
+    def __getitem__(self, user_id: str) -> dict:
+        return self.cache[user_id]["lists"]
+
+    def __setitem__(self, user_id: str, lists: dict) -> None:
+        # Only used for new users, who own nothing yet
+        self.cache[user_id] = {"lists": lists, "owned": {}}
+
+    def __delitem__(self, user_id: str) -> None:
+        del self.cache[user_id]
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self.cache
+
+    def __iter__(self):
+        return iter(self.cache)
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+class ShardLists(MutableMapping):
+    """
+    List id -> Checklist, stored in the shard of the list owner
+    """
+    def __init__(self, cache: UserCache, acl: dict) -> None:
+        self.cache = cache
+        self.acl = acl
+
+    def __getitem__(self, list_id: str):
+        return self.cache[self.acl[list_id]["owner"]]["owned"][list_id]
+
+    def __setitem__(self, list_id: str, checklist) -> None:
+        self.cache[self.acl[list_id]["owner"]]["owned"][list_id] = checklist
+
+    def __delitem__(self, list_id: str) -> None:
+        del self.cache[self.acl[list_id]["owner"]]["owned"][list_id]
+
+    def __iter__(self):
+        return iter(self.acl)
+
+    def __len__(self) -> int:
+        return len(self.acl)
+
+
+def encode_shard(shard: dict) -> dict:
+    """
+    JSON data for a user shard
+    """
+    return {"lists": dict(shard["lists"]), "owned": encode_lists(shard["owned"])}
+
+
+def decode_shard(data: dict) -> dict:
+    """
+    User shard from JSON data
+    """
+    return {"lists": data.get("lists", {}), "owned": decode_lists(data.get("owned", {}))}
+
+
+def shard_filename(user_id: str) -> str:
+    """
+    Shard file name for a user id
+    """
+    return f"{os.path.basename(user_id)}.json"
+
+
+def write_shards(data: dict, directory: str) -> int:
+    """
+    Write version 2 checklist data as user shards plus both indexes
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    # Group every checklist under its owner
+    owned = {}
+    for list_id, entry in data["acl"].items():
+        owned.setdefault(entry["owner"], {})[list_id] = data["lists"][list_id]
+
+    index = {}
+    for user_id in data["users"].keys() | owned.keys():
+        index[user_id] = shard_filename(user_id)
+        shard = {"lists": data["users"].get(user_id, {}), "owned": owned.get(user_id, {})}
+        save_checklists(os.path.join(directory, index[user_id]), shard)
+    save_checklists(os.path.join(directory, "acl.json"), data["acl"])
+    save_checklists(os.path.join(directory, "index.json"), index)
+    return len(index)
+
+
+def read_shards(directory: str) -> dict:
+    """
+    Read user shards back into version 2 checklist data
+    """
+    index = load_json(os.path.join(directory, "index.json"))
+    data = {"version": 2, "users": {}, "lists": {}, "acl": load_json(os.path.join(directory, "acl.json"))}
+    for user_id, shard in index.items():
+        shard = load_json(os.path.join(directory, shard))
+        data["users"][user_id] = shard["lists"]
+        data["lists"].update(shard["owned"])
+    return data
+
+
+def split_shards(json_filename: str, directory: str, logger) -> int:
+    """
+    Split a monolithic checklists file (and its journal) into user shards
+    """
+    storage = JsonStorage(json_filename, logger)
+    storage.close()
+    return write_shards(storage.encode(), directory)
+
+
+def merge_shards(directory: str, json_filename: str, logger) -> int:
+    """
+    Merge user shards back into a monolithic checklists file
+    """
+    data = read_shards(directory)
+    # Writing through the journal also truncates any stale log
+    Journal(json_filename, logger).write_snapshot(data)
+    return len(data["users"])
+
+
+def upgrade_shards(directory: str, logger) -> None:
+    """
+    Rewrite shards from the per-user ``{list_name: tasks}`` layout with list ids
+    """
+    index = load_json(os.path.join(directory, "index.json"))
+    legacy = {user_id: load_json(os.path.join(directory, shard)) for user_id, shard in index.items()}
+    count = write_shards(upgrade_legacy(legacy), directory)
+    logger.info(f"Upgraded {count} user shards")
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.sharded_storage split data/checklists.json data/users
+    #        python -m utils.sharded_storage merge data/users data/checklists.json
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger("shards")
+    action, source, target = sys.argv[1], sys.argv[2], sys.argv[3]
+    if action == "split":
+        logger.info(f"Split {split_shards(source, target, logger)} users into {target}")
+    elif action == "merge":
+        logger.info(f"Merged {merge_shards(source, target, logger)} users into {target}")
+    else:
+        sys.exit(f"Unknown action: {action}")
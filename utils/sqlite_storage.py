@@ -0,0 +1,240 @@
+import os
+import sqlite3
+import sys
+import threading
+
+from utils.checklist import Checklist, new_list_id
+from utils.storage import JsonStorage, Storage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checklists (
+    id TEXT PRIMARY KEY,
+    owner_id TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_lists (
+    user_id TEXT NOT NULL,
+    list_name TEXT NOT NULL,
+    list_id TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS user_lists_user_list ON user_lists (user_id, list_name);
+CREATE INDEX IF NOT EXISTS user_lists_list ON user_lists (list_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    list_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (list_id, position)
+) WITHOUT ROWID;
+"""
+
+# Resolves a user's checklist name to its id
+LIST_ID = "(SELECT list_id FROM user_lists WHERE user_id = ? AND list_name = ?)"
+
+
+class SqliteStorage(Storage):
+    """
+    Checklists stored in SQLite, one row per checklist and per task.
+
+    ``user_lists`` maps ``(user_id, list_name)`` to a checklist id and
+    doubles as the access-control index together with ``checklists.owner_id``.
+    Every lookup and single-task update is an indexed point operation, so
+    nothing but the current request is held in memory. Statements run on
+    the event loop (they are sub-millisecond); the commit is deferred to
+    the background writer.
+    """
+    def __init__(self, filename: str, logger, json_filename: str = None) -> None:
+        super().__init__(logger)
+        self.filename = filename
+        # Ensure the data directory exists
+        directory = os.path.dirname(filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        new_database = not os.path.exists(filename)
+        # The connection is shared with the writer thread, guarded by a lock
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Uncommitted changes waiting for the writer
+        self._dirty = False
+
+        # Import the JSON checklists the first time the database is created
+        if new_database and json_filename:
+            count = migrate_json(json_filename, self, logger)
+            if count:
+                logger.info(f"Imported {count} checklists from {json_filename}")
+
+    def list_names(self, user_id: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT list_name FROM user_lists WHERE user_id = ? ORDER BY rowid", (user_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def list_ids(self, user_id: str) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT list_name, list_id FROM user_lists WHERE user_id = ? ORDER BY rowid", (user_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def has_list(self, user_id: str, list_name: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM user_lists WHERE user_id = ? AND list_name = ?", (user_id, list_name)
+            ).fetchone()
+        return row is not None
+
+    def list_id(self, user_id: str, list_name: str) -> str:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT list_id FROM user_lists WHERE user_id = ? AND list_name = ?", (user_id, list_name)
+            ).fetchone()
+        if row is None:
+            raise KeyError(list_name)
+        return row[0]
+
+    def access(self, list_id: str) -> dict:
+        with self._lock:
+            owner = self._conn.execute("SELECT owner_id FROM checklists WHERE id = ?", (list_id,)).fetchone()
+            if owner is None:
+                raise KeyError(list_id)
+            rows = self._conn.execute(
+                "SELECT user_id FROM user_lists WHERE list_id = ? AND user_id != ? ORDER BY rowid",
+                (list_id, owner[0])
+            ).fetchall()
+        return {"owner": owner[0], "members": [row[0] for row in rows]}
+
+    def get_tasks(self, user_id: str, list_name: str) -> Checklist:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT task, completed FROM tasks WHERE list_id = {LIST_ID} ORDER BY position",
+                (user_id, list_name)
+            ).fetchall()
+        return Checklist.from_rows(rows)
+
+    def task_texts(self, list_id: str, start: int, stop: int = None) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task FROM tasks WHERE list_id = ? AND position >= ? ORDER BY position LIMIT ?",
+                (list_id, start, -1 if stop is None else max(stop - start, 0))
+            ).fetchall()
+        return [task for task, in rows]
+
+    def create_list(self, user_id: str, list_name: str) -> None:
+        list_id = new_list_id()
+        with self._lock:
+            self._conn.execute("INSERT INTO checklists (id, owner_id) VALUES (?, ?)", (list_id, user_id))
+            self._conn.execute(
+                "INSERT INTO user_lists (user_id, list_name, list_id) VALUES (?, ?, ?)", (user_id, list_name, list_id)
+            )
+        self._mark_dirty()
+        self._list_added([user_id], list_name)
+
+    def add_tasks(self, user_id: str, list_name: str, tasks: list, done: list = None) -> None:
+        done = set(done or ())
+        with self._lock:
+            list_id = self._conn.execute(
+                "SELECT list_id FROM user_lists WHERE user_id = ? AND list_name = ?", (user_id, list_name)
+            ).fetchone()[0]
+            start = self._conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM tasks WHERE list_id = ?", (list_id,)
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO tasks (list_id, position, task, completed) VALUES (?, ?, ?, ?)",
+                [(list_id, start + i, task, int(i in done)) for i, task in enumerate(tasks)]
+            )
+        self._mark_dirty()
+        self._changed("add", list_id)
+
+    def set_completed(self, user_id: str, list_name: str, index: int, completed: bool) -> None:
+        changed = self._execute(
+            f"UPDATE tasks SET completed = ? WHERE list_id = {LIST_ID} AND position = ?",
+            (int(completed), user_id, list_name, index)
+        )
+        # No row at that position, fail like the in-memory checklist instead of notifying
+        if not changed:
+            raise IndexError(index)
+        self._changed("set", self.list_id(user_id, list_name), index)
+
+    def clear_list(self, user_id: str, list_name: str) -> None:
+        self._execute(f"DELETE FROM tasks WHERE list_id = {LIST_ID}", (user_id, list_name))
+        self._changed("clear", self.list_id(user_id, list_name))
+
+    def share_list(self, user_id: str, list_name: str, recipient_ids: list) -> None:
+        # Sharing only adds index rows, the tasks are not copied
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO user_lists (user_id, list_name, list_id) SELECT ?, ?, {LIST_ID}",
+                [(recipient_id, list_name, user_id, list_name) for recipient_id in recipient_ids]
+            )
+        self._mark_dirty()
+        self._list_added(recipient_ids, list_name)
+
+    def counts(self) -> dict:
+        with self._lock:
+            users = self._conn.execute("SELECT COUNT(DISTINCT user_id) FROM user_lists").fetchone()[0]
+            tasks = self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        return {"users": users, "tasks": tasks}
+
+    def prepare_write(self):
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return self._commit
+
+    def write_failed(self) -> None:
+        # The changes stay in the open transaction, the next commit takes them
+        self._dirty = True
+
+    def close(self) -> None:
+        self._commit()
+        self._conn.close()
+
+    def _commit(self) -> int:
+        with self._lock:
+            self._conn.commit()
+        return 0
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        with self._lock:
+            rowcount = self._conn.execute(sql, params).rowcount
+        self._mark_dirty()
+        return rowcount
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        self._committed()
+
+
+def migrate_json(json_filename: str, storage: SqliteStorage, logger) -> int:
+    """
+    Import a JSON checklist snapshot (and its journal) into SQLite
+    """
+    source = JsonStorage(json_filename, logger)
+    source.close()
+
+    with storage._lock:
+        for list_id, entry in source.acl.items():
+            storage._conn.execute("INSERT INTO checklists (id, owner_id) VALUES (?, ?)", (list_id, entry["owner"]))
+            storage._conn.executemany(
+                "INSERT INTO tasks (list_id, position, task, completed) VALUES (?, ?, ?, ?)",
+                [(list_id, i, text, int(completed)) for i, (text, completed) in enumerate(source.lists[list_id])]
+            )
+        for user_id, lists in source.users.items():
+            storage._conn.executemany(
+                "INSERT INTO user_lists (user_id, list_name, list_id) VALUES (?, ?, ?)",
+                [(user_id, list_name, list_id) for list_name, list_id in lists.items()]
+            )
+    storage._commit()
+    return len(source.acl)
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.sqlite_storage data/checklists.json data/checklists.db
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    source, target = sys.argv[1], sys.argv[2]
+    SqliteStorage(target, logging.getLogger("migrate"), json_filename=source).close()
@@ -0,0 +1,411 @@
+import os
+from contextlib import asynccontextmanager
+
+from utils.checklist import Checklist, decode_lists, encode_lists, new_list_id
+from utils.funcs import load_setting
+from utils.journal import Journal
+from utils.locks import KeyedLocks
+
+
+class Storage(object):
+    """
+    Interface shared by the checklist storage backends.
+
+    Cogs only talk to this interface. Tasks are returned as a
+    ``Checklist`` yielding ``(text, completed)`` pairs in order.
+    Mutations call ``on_commit`` so the owner can schedule a write.
+
+    Every checklist is stored once under a stable id. Users map their
+    checklist names to ids, and the access-control index records the
+    owner and the members each checklist is shared with.
+
+    Sessions that read a checklist and change it after awaiting go through
+    ``transaction``, which serializes them per checklist id. Each mutation
+    is atomic on its own; the lock keeps a read and the mutations based on
+    it together.
+    """
+    def __init__(self, logger) -> None:
+        self.logger = logger
+        # Checklist id -> lock of the transactions on it
+        self.locks = KeyedLocks()
+        # Checklist id -> number of task changes, so sessions can tell their copy is current
+        self.revisions = {}
+        # Called after every mutation
+        self.on_commit = None
+        # Called with (op, list id, task index) when tasks change
+        self.on_change = None
+        # Called with (user id, list name) when a user gains a checklist
+        self.on_list_added = None
+
+    def list_names(self, user_id: str) -> list:
+        """
+        Names of the user's checklists in creation order
+        """
+        raise NotImplementedError
+
+    def list_ids(self, user_id: str) -> dict:
+        """
+        The user's checklist names mapped to their ids, in creation order
+        """
+        raise NotImplementedError
+
+    def has_list(self, user_id: str, list_name: str) -> bool:
+        """
+        Whether the user has a checklist with this name
+        """
+        raise NotImplementedError
+
+    def list_id(self, user_id: str, list_name: str) -> str:
+        """
+        Stable id of one of the user's checklists
+        """
+        raise NotImplementedError
+
+    def access(self, list_id: str) -> dict:
+        """
+        Access-control entry of a checklist: ``{"owner": id, "members": [ids]}``
+        """
+        raise NotImplementedError
+
+    def get_tasks(self, user_id: str, list_name: str) -> Checklist:
+        """
+        Tasks of a checklist
+        """
+        raise NotImplementedError
+
+    def task_texts(self, list_id: str, start: int, stop: int = None) -> list:
+        """
+        Texts of the tasks of a checklist from position ``start`` up to ``stop``
+        """
+        raise NotImplementedError
+
+    def create_list(self, user_id: str, list_name: str) -> None:
+        """
+        Create an empty checklist
+        """
+        raise NotImplementedError
+
+    def add_tasks(self, user_id: str, list_name: str, tasks: list, done: list = None) -> None:
+        """
+        Append tasks to a checklist; ``done`` lists the positions in ``tasks`` that are already completed
+        """
+        raise NotImplementedError
+
+    def set_completed(self, user_id: str, list_name: str, index: int, completed: bool) -> None:
+        """
+        Set the completion state of a single task
+        """
+        raise NotImplementedError
+
+    def clear_list(self, user_id: str, list_name: str) -> None:
+        """
+        Remove all tasks from a checklist, for everyone it is shared with
+        """
+        raise NotImplementedError
+
+    def share_list(self, user_id: str, list_name: str, recipient_ids: list) -> None:
+        """
+        Give each recipient access to the checklist under the same name
+        """
+        raise NotImplementedError
+
+    def counts(self) -> dict:
+        """
+        Gauges for metrics: ``users`` and ``tasks``, or whatever the backend counts without loading everything
+        """
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def transaction(self, user_id: str, list_name: str):
+        """
+        Lock one of the user's checklists and yield a ``Transaction`` on it
+
+        Raises ``KeyError`` when the user has no checklist by that name.
+        Sessions on other checklists, including every other user's, don't wait.
+        """
+        list_id = self.list_id(user_id, list_name)
+        async with self.locks.hold(list_id):
+            yield Transaction(self, user_id, list_name, list_id)
+
+    def prepare_write(self):
+        """
+        Return a blocking job that persists pending changes, or None
+        """
+        raise NotImplementedError
+
+    def write_failed(self) -> None:
+        """
+        Requeue the changes taken by the last ``prepare_write`` after its job raised
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Release file handles and connections
+        """
+
+    def _committed(self) -> None:
+        if self.on_commit is not None:
+            self.on_commit()
+
+    def _changed(self, op: str, list_id: str, index: int = None) -> None:
+        self.revisions[list_id] = self.revisions.get(list_id, 0) + 1
+        if self.on_change is not None:
+            self.on_change(op, list_id, index)
+
+    def _list_added(self, user_ids: list, list_name: str) -> None:
+        if self.on_list_added is not None:
+            for user_id in user_ids:
+                self.on_list_added(user_id, list_name)
+
+
+class Transaction(object):
+    """
+    Load-modify-persist section on one checklist, from ``Storage.transaction``.
+
+    ``tasks`` is read when first used, under the lock, so it reflects every
+    transaction that finished before. A session holding a copy from an
+    earlier transaction hands it to ``reuse`` to skip the read when nothing
+    changed since. Mutations are applied and journaled at once like the
+    ``Storage`` methods they call.
+    """
+    def __init__(self, storage: Storage, user_id: str, list_name: str, list_id: str) -> None:
+        self.storage = storage
+        self.user_id = user_id
+        self.list_name = list_name
+        self.list_id = list_id
+        self._tasks = None
+
+    @property
+    def tasks(self) -> Checklist:
+        if self._tasks is None:
+            self._tasks = self.storage.get_tasks(self.user_id, self.list_name)
+        return self._tasks
+
+    @property
+    def revision(self) -> int:
+        return self.storage.revisions.get(self.list_id, 0)
+
+    def reuse(self, tasks: Checklist, revision: int) -> None:
+        """
+        Use a copy read at ``revision`` as ``tasks`` if the checklist hasn't changed since
+        """
+        if tasks is not None and revision == self.revision:
+            self._tasks = tasks
+
+    def add_tasks(self, tasks: list, done: list = None) -> None:
+        self.storage.add_tasks(self.user_id, self.list_name, tasks, done=done)
+        self._tasks = None
+
+    def set_completed(self, index: int, completed: bool) -> None:
+        self.storage.set_completed(self.user_id, self.list_name, index, completed)
+        # Keep the local copy in sync for backends that return fresh rows
+        if self._tasks is not None:
+            self._tasks.set_completed(index, completed)
+
+    def clear(self) -> None:
+        self.storage.clear_list(self.user_id, self.list_name)
+        self._tasks = None
+
+    def share(self, recipient_ids: list) -> list:
+        """
+        Share with the recipients that have no checklist by this name yet, returns them
+        """
+        recipients = [recipient_id for recipient_id in recipient_ids if not self.storage.has_list(recipient_id, self.list_name)]
+        if recipients:
+            self.storage.share_list(self.user_id, self.list_name, recipients)
+        return recipients
+
+
+class MemoryStorage(Storage):
+    """
+    Checklists held in memory.
+
+    ``users`` maps user id -> {list name -> list id}, ``lists`` maps
+    list id -> Checklist and ``acl`` maps list id -> access entry. Every
+    mutation is expressed as a journal record, applied with ``apply`` and
+    handed to ``_persist``; subclasses decide how it reaches the disk.
+    """
+    def __init__(self, logger) -> None:
+        super().__init__(logger)
+        self.users = {}
+        self.lists = {}
+        self.acl = {}
+
+    def list_names(self, user_id: str) -> list:
+        return list(self.users.get(user_id, {}))
+
+    def list_ids(self, user_id: str) -> dict:
+        return dict(self.users.get(user_id, {}))
+
+    def has_list(self, user_id: str, list_name: str) -> bool:
+        return list_name in self.users.get(user_id, {})
+
+    def list_id(self, user_id: str, list_name: str) -> str:
+        return self.users[user_id][list_name]
+
+    def access(self, list_id: str) -> dict:
+        return self.acl[list_id]
+
+    def get_tasks(self, user_id: str, list_name: str) -> Checklist:
+        return self.lists[self.users[user_id][list_name]]
+
+    def task_texts(self, list_id: str, start: int, stop: int = None) -> list:
+        return self.lists[list_id].texts[start:stop]
+
+    def create_list(self, user_id: str, list_name: str) -> None:
+        self._commit("create", user_id, list_name, id=new_list_id())
+
+    def add_tasks(self, user_id: str, list_name: str, tasks: list, done: list = None) -> None:
+        # Completed positions travel in the same record, so an import is one mutation
+        if done:
+            self._commit("add", user_id, list_name, tasks=tasks, done=done)
+        else:
+            self._commit("add", user_id, list_name, tasks=tasks)
+
+    def set_completed(self, user_id: str, list_name: str, index: int, completed: bool) -> None:
+        self._commit("set", user_id, list_name, index=index, completed=completed)
+
+    def clear_list(self, user_id: str, list_name: str) -> None:
+        self._commit("clear", user_id, list_name)
+
+    def share_list(self, user_id: str, list_name: str, recipient_ids: list) -> None:
+        self._commit("share", user_id, list_name, recipients=recipient_ids)
+
+    def counts(self) -> dict:
+        return {"users": len(self.users), "tasks": sum(map(len, self.lists.values()))}
+
+    def apply(self, record: dict) -> None:
+        """
+        Apply a single journal record to the in-memory state
+        """
+        op = record["op"]
+        user_lists = self.users.setdefault(record["user"], {})
+        list_name = record["list"]
+
+        if op == "create":
+            list_id = record.get("id") or new_list_id()
+            # The access entry comes first, sharded storage locates lists through it
+            self.acl[list_id] = {"owner": record["user"], "members": []}
+            self.lists[list_id] = Checklist()
+            user_lists[list_name] = list_id
+            self._list_added([record["user"]], list_name)
+        elif op == "add":
+            checklist = self.lists[user_lists[list_name]]
+            start = len(checklist)
+            checklist.extend(record["tasks"])
+            for position in record.get("done", ()):
+                checklist.set_completed(start + position, True)
+            self._changed(op, user_lists[list_name])
+        elif op == "set":
+            self.lists[user_lists[list_name]].set_completed(record["index"], record["completed"])
+            self._changed(op, user_lists[list_name], record["index"])
+        elif op == "clear":
+            self.lists[user_lists[list_name]] = Checklist()
+            self._changed(op, user_lists[list_name])
+        elif op == "share":
+            # Sharing only adds index entries, the checklist itself is not copied
+            list_id = user_lists[list_name]
+            members = self.acl[list_id]["members"]
+            for recipient_id in record["recipients"]:
+                self.users.setdefault(recipient_id, {})[list_name] = list_id
+                if recipient_id not in members:
+                    members.append(recipient_id)
+            self._list_added(record["recipients"], list_name)
+        else:
+            raise KeyError(f"unknown journal op {op!r}")
+
+    def decode(self, data: dict) -> None:
+        """
+        Load a snapshot, upgrading the legacy per-user layout
+        """
+        if "version" not in data:
+            data = upgrade_legacy(data)
+        self.users = data["users"]
+        self.lists = decode_lists(data["lists"])
+        self.acl = data["acl"]
+
+    def encode(self) -> dict:
+        """
+        JSON data for the current state
+        """
+        return {
+            "version": 2,
+            "users": {user_id: dict(lists) for user_id, lists in self.users.items()},
+            "lists": encode_lists(self.lists),
+            "acl": encode_acl(self.acl),
+        }
+
+    def _commit(self, op: str, user_id: str, list_name: str, **fields) -> None:
+        record = {"op": op, "user": user_id, "list": list_name, **fields}
+        self.apply(record)
+        self._persist(record)
+
+    def _persist(self, record: dict) -> None:
+        raise NotImplementedError
+
+
+class JsonStorage(MemoryStorage):
+    """
+    In-memory checklists persisted as a JSON snapshot plus journal
+    """
+    def __init__(self, filename: str, logger) -> None:
+        super().__init__(logger)
+        self.journal = Journal(filename, logger, on_commit=self._committed)
+        self.journal.load(self)
+
+    def prepare_write(self):
+        return self.journal.prepare_write(self)
+
+    def write_failed(self) -> None:
+        self.journal.write_failed()
+
+    def _persist(self, record: dict) -> None:
+        self.journal.commit(record)
+
+    def close(self) -> None:
+        self.journal.close()
+
+
+def encode_acl(acl: dict) -> dict:
+    """
+    Copy of the access-control index safe to hand to the writer
+    """
+    return {list_id: {"owner": entry["owner"], "members": list(entry["members"])} for list_id, entry in acl.items()}
+
+
+def upgrade_legacy(data: dict) -> dict:
+    """
+    Convert the legacy ``{user_id: {list_name: tasks}}`` layout to version 2
+
+    Each legacy checklist gets its own id; lists that were shared before
+    had already been copied on disk, so they stay independent.
+    """
+    users, lists, acl = {}, {}, {}
+    for user_id, user_lists in data.items():
+        users[user_id] = {}
+        for list_name, tasks in user_lists.items():
+            list_id = new_list_id()
+            users[user_id][list_name] = list_id
+            lists[list_id] = tasks
+            acl[list_id] = {"owner": user_id, "members": []}
+    return {"version": 2, "users": users, "lists": lists, "acl": acl}
+
+
+def load_storage(backend: str, filename: str, logger) -> Storage:
+    """
+    Create the storage backend selected in the settings
+    """
+    if backend == "json":
+        return JsonStorage(filename, logger)
+    # Other backends are imported lazily so only the selected one is loaded
+    if backend == "sqlite":
+        from utils.sqlite_storage import SqliteStorage
+        return SqliteStorage(filename.rsplit(".", 1)[0] + ".db", logger, json_filename=filename)
+    if backend == "sharded":
+        from utils.sharded_storage import ShardedStorage
+        return ShardedStorage(
+            os.path.join(os.path.dirname(filename), "users"), logger,
+            json_filename=filename, cache_size=load_setting("cache_users", 1000, int)
+        )
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,248 @@
+import codecs
+import csv
+import io
+import json
+import os
+import re
+
+# File extension -> import/export format
+FORMATS = {".csv": "csv", ".md": "markdown", ".markdown": "markdown", ".txt": "markdown", ".json": "json"}
+# Extension written for each export format
+EXTENSIONS = {"csv": ".csv", "markdown": ".md", "json": ".json"}
+# Cell values read as a completed task
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "done", "✅"}
+# Upper bound on tasks taken from one file
+MAX_IMPORT_TASKS = 10000
+# Longest CSV record kept waiting for the end of a quoted field, in characters and lines
+MAX_CSV_RECORD = 8192
+MAX_CSV_RECORD_LINES = 100
+# Error of a strict csv.reader whose input ends inside a quoted field
+CSV_UNTERMINATED = "unexpected end of data"
+# Longest JSON array element kept waiting for the rest of it
+MAX_JSON_ELEMENT = 8192
+# What a chunk may cut off at a JSON decode error: part of a number, literal or \uXXXX escape
+JSON_PARTIAL = re.compile(r"-?\d*\.?\d*(?:[eE][+-]?\d*)?|t|tr|tru|f|fa|fal|fals|n|nu|nul|u[0-9a-fA-F]{0,4}")
+
+
+def detect_format(filename: str) -> str:
+    """
+    Import format for a file name, or None if unsupported
+    """
+    return FORMATS.get(os.path.splitext(filename)[1].lower())
+
+
+class CsvParser(object):
+    """
+    ``task,completed`` rows; the header and the completed column are optional
+
+    Lines are read by ``csv.reader``. A quoted field may span lines: while
+    the reader runs out of input inside one, the lines are kept and read
+    again with the next, up to ``MAX_CSV_RECORD`` characters over
+    ``MAX_CSV_RECORD_LINES`` lines. Malformed
+    quoting raises ``csv.Error``.
+    """
+    # Fed one line at a time
+    by_line = True
+
+    def __init__(self) -> None:
+        # Lines of the record being read
+        self._lines = []
+        self._size = 0
+        self._first = True
+
+    def feed(self, line: str) -> list:
+        self._lines.append(line)
+        self._size += len(line)
+        try:
+            rows = list(csv.reader(self._lines, strict=True))
+        except csv.Error as e:
+            if str(e) != CSV_UNTERMINATED:
+                raise
+            if self._size > MAX_CSV_RECORD or len(self._lines) > MAX_CSV_RECORD_LINES:
+                raise csv.Error(f"quoted field longer than {MAX_CSV_RECORD} characters or {MAX_CSV_RECORD_LINES} lines") from None
+            return []
+        self._lines, self._size = [], 0
+        tasks = []
+        for row in rows:
+            if not row or not row[0].strip():
+                continue
+            if self._first:
+                self._first = False
+                if row[0].strip().lower() == "task":
+                    continue
+            completed = len(row) > 1 and row[1].strip().casefold() in TRUE_VALUES
+            tasks.append((row[0].strip(), completed))
+        return tasks
+
+    def close(self) -> list:
+        if not self._lines:
+            return []
+        # Raises if the file ended inside a quoted field
+        lines, self._lines = self._lines, []
+        list(csv.reader(lines, strict=True))
+        return []
+
+
+class MarkdownParser(object):
+    """
+    ``- [x] task`` / ``- [ ] task`` items; plain bullets are uncompleted tasks
+    """
+    by_line = True
+
+    def feed(self, line: str) -> list:
+        line = line.strip()
+        if line[:2] not in ("- ", "* ", "+ "):
+            return []
+        text = line[2:].strip()
+        completed = False
+        if text[:3].lower() in ("[x]", "[ ]"):
+            completed = text[1].lower() == "x"
+            text = text[3:].strip()
+        return [(text, completed)] if text else []
+
+    def close(self) -> list:
+        return []
+
+
+class JsonParser(object):
+    """
+    Array of ``{"task": ..., "completed": ...}`` objects or plain strings,
+    decoded one element at a time
+
+    An element cut by the end of a chunk waits for the next one, up to
+    ``MAX_JSON_ELEMENT`` characters; any other decode error is raised
+    with its position in the file.
+    """
+    # Fed raw text, a minified array is a single line
+    by_line = False
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        # Position of the next element in the buffer
+        self._offset = 0
+        # Characters of the file dropped from the front of the buffer
+        self._consumed = 0
+        self._started = False
+
+    def feed(self, text: str) -> list:
+        # Drop what was decoded once per chunk rather than once per element
+        self._consumed += self._offset
+        self._buffer = self._buffer[self._offset:] + text
+        self._offset = 0
+        buffer = self._buffer
+        tasks = []
+        while True:
+            position = self._skip(" \r\n\t")
+            if not self._started:
+                if position == len(buffer):
+                    break
+                if buffer[position] != "[":
+                    raise ValueError("expected a JSON array")
+                self._started = True
+                self._offset = position + 1
+                continue
+            position = self._skip(", \r\n\t")
+            if position == len(buffer) or buffer[position] == "]":
+                break
+            try:
+                element, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if not self._partial(e):
+                    raise ValueError(f"{e.msg} at character {self._consumed + e.pos}") from None
+                if len(buffer) - position > MAX_JSON_ELEMENT:
+                    raise ValueError(f"array element longer than {MAX_JSON_ELEMENT} characters") from None
+                # The element continues in the next chunk
+                break
+            self._offset = end
+            if isinstance(element, str):
+                tasks.append((element, False))
+            elif isinstance(element, dict) and "task" in element:
+                tasks.append((str(element["task"]), bool(element.get("completed", False))))
+        return tasks
+
+    def close(self) -> list:
+        if self._buffer[self._offset:].strip() not in ("", "]"):
+            raise ValueError("truncated JSON array")
+        return []
+
+    def _skip(self, characters: str) -> int:
+        """
+        Move the offset past ``characters`` and return it
+        """
+        buffer, position = self._buffer, self._offset
+        while position < len(buffer) and buffer[position] in characters:
+            position += 1
+        self._offset = position
+        return position
+
+    def _partial(self, error: json.JSONDecodeError) -> bool:
+        """
+        Whether a decode error only means the element goes on past the buffer
+        """
+        if error.msg.startswith("Unterminated string"):
+            return True
+        return JSON_PARTIAL.fullmatch(self._buffer[error.pos:]) is not None
+
+
+PARSERS = {"csv": CsvParser, "markdown": MarkdownParser, "json": JsonParser}
+
+
+async def parse_stream(chunks, fmt: str, limit: int = MAX_IMPORT_TASKS) -> list:
+    """
+    Parse ``(text, completed)`` tasks from an async iterator of byte chunks
+
+    Chunks are decoded incrementally and split into lines as they arrive,
+    so the file is never held in memory as a whole. Raises ValueError past
+    ``limit`` tasks or on malformed JSON, ``csv.Error`` on malformed CSV.
+    """
+    parser = PARSERS[fmt]()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    tasks = []
+    pending = ""
+
+    def take(parsed: list) -> None:
+        tasks.extend(parsed)
+        if len(tasks) > limit:
+            raise ValueError(f"more than {limit} tasks")
+
+    async for chunk in chunks:
+        if not parser.by_line:
+            take(parser.feed(decoder.decode(chunk)))
+            continue
+        pending += decoder.decode(chunk)
+        # Hand over complete lines, keep the partial last one for the next chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            take(parser.feed(line + "\n"))
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        take(parser.feed(pending))
+    take(parser.close())
+    return tasks
+
+
+def export_lines(tasks, fmt: str):
+    """
+    Lines of an export file, produced one task at a time
+    """
+    if fmt == "csv":
+        row = io.StringIO()
+        writer = csv.writer(row, lineterminator="\n")
+        yield "task,completed\n"
+        for text, completed in tasks:
+            row.seek(0)
+            row.truncate()
+            writer.writerow([text, "true" if completed else "false"])
+            yield row.getvalue()
+    elif fmt == "markdown":
+        for text, completed in tasks:
+            # Markdown items are single lines
+            yield f"- [{'x' if completed else ' '}] {' '.join(text.splitlines())}\n"
+    elif fmt == "json":
+        yield "["
+        for index, (text, completed) in enumerate(tasks):
+            yield ("," if index else "") + "\n  " + json.dumps({"task": text, "completed": completed})
+        yield "\n]\n"
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")